@@ -1,16 +1,17 @@
 import discord
+import aiohttp
 from discord.ext import commands, tasks
 from discord import app_commands
 import os
 from dotenv import load_dotenv
 import database as db
 import io
-import matplotlib
+import asyncio
+import functools
+import threading
 import datetime
-import pytz
 import config  # Import server configuration
-matplotlib.use('Agg')  # Non-GUI backend
-import matplotlib.pyplot as plt
+from cache import TTLCache
 
 # Load environment variables
 load_dotenv()
@@ -21,18 +22,74 @@ intents = discord.Intents.default()
 intents.message_content = True
 intents.members = True
 
-bot = commands.Bot(command_prefix='!', intents=intents)
+class ObedienceBot(commands.Bot):
+    """Bot that does its one-time startup work in setup_hook instead of on_ready."""
+    
+    async def login(self, token: str):
+        """Give discord.py's HTTP session a connector that keeps connections alive between DM bursts."""
+        # Created here because the connector needs the running loop; static_login only makes one if unset
+        self.http.connector = aiohttp.TCPConnector(limit=0, keepalive_timeout=75, ttl_dns_cache=300)
+        await super().login(token)
+    
+    async def setup_hook(self):
+        """Initialize the database, start background loops and sync commands (runs once)."""
+        # Run new tasks eagerly up to their first real await (Python 3.12+)
+        if hasattr(asyncio, 'eager_task_factory'):
+            asyncio.get_running_loop().set_task_factory(asyncio.eager_task_factory)
+        await db.init_db()
+        periodic_tick.start()  # Start deadline and recurring task reset checker
+        send_reminders.start()  # Start reminder sender
+        try:
+            synced = await self.tree.sync()
+            print(f"Synced {len(synced)} command(s)")
+        except Exception as e:
+            print(f"Failed to sync commands: {e}")
+    
+    async def close(self):
+        """Close the shared database connection on shutdown."""
+        await super().close()
+        await db.close_db()
+
+bot = ObedienceBot(command_prefix='!', intents=intents)
+
+# Shared reply text
+NOT_REGISTERED = "❌ You need to register first! Use `/register`"
+
+# Weekday names <-> numbers as stored in tasks.days_of_week (Monday = 0)
+DAY_MAP = {'mon': 0, 'tue': 1, 'wed': 2, 'thu': 3, 'fri': 4, 'sat': 5, 'sun': 6}
+DAY_NAMES = ('Mon', 'Tue', 'Wed', 'Thu', 'Fri', 'Sat', 'Sun')
+
+DEADLINE_FORMAT = "%Y-%m-%d %H:%M"
+ONE_HOUR = datetime.timedelta(hours=1)
+HOURS_24 = datetime.timedelta(hours=24)
+
+def parse_deadline(value: str) -> datetime.datetime:
+    """Parse a 'YYYY-MM-DD HH:MM' deadline, returning None if it is invalid."""
+    # Slice the zero-padded form directly and fall back to strptime for anything else
+    try:
+        if len(value) == 16 and value[4] == '-' and value[7] == '-' and value[10] == ' ' and value[13] == ':':
+            return datetime.datetime(
+                int(value[0:4]), int(value[5:7]), int(value[8:10]),
+                int(value[11:13]), int(value[14:16])
+            )
+        return datetime.datetime.strptime(value, DEADLINE_FORMAT)
+    except ValueError:
+        return None
 
 # Server access check function
+# Server access settings resolved once at import (None = global mode, all servers allowed)
+ALLOWED_SERVER_IDS = frozenset(config.ALLOWED_SERVERS) if config.SERVER_MODE == "whitelist" else None
+ALLOW_DMS = bool(config.ALLOW_DMS)
+
 def is_server_allowed(guild_id: int = None) -> bool:
     """Check if command can be executed in this server/DM."""
     # Handle DMs
     if guild_id is None:
-        return config.ALLOW_DMS
+        return ALLOW_DMS
     
     # Handle server whitelist
-    if config.SERVER_MODE == "whitelist":
-        return guild_id in config.ALLOWED_SERVERS
+    if ALLOWED_SERVER_IDS is not None:
+        return guild_id in ALLOWED_SERVER_IDS
     
     # Global mode - all servers allowed
     return True
@@ -50,20 +107,60 @@ async def interaction_check(interaction: discord.Interaction) -> bool:
         return False
     return True
 
+# Resolved channel/role IDs keyed by (guild_id, name); entries are dropped by the update/delete events below
+_channel_ids = {}
+_role_ids = {}
+
+def find_text_channel(guild: discord.Guild, name: str) -> discord.TextChannel:
+    """Find a guild text channel by exact name, remembering its ID."""
+    key = (guild.id, name)
+    channel = guild.get_channel(_channel_ids[key]) if key in _channel_ids else None
+    if channel is None:
+        channel = discord.utils.get(guild.text_channels, name=name)
+        if channel:
+            _channel_ids[key] = channel.id
+    return channel
+
+def find_role(guild: discord.Guild, name: str) -> discord.Role:
+    """Find a guild role by exact name, remembering its ID."""
+    key = (guild.id, name)
+    role = guild.get_role(_role_ids[key]) if key in _role_ids else None
+    if role is None:
+        role = discord.utils.get(guild.roles, name=name)
+        if role:
+            _role_ids[key] = role.id
+    return role
+
+@bot.event
+async def on_guild_channel_update(before: discord.abc.GuildChannel, after: discord.abc.GuildChannel):
+    _channel_ids.pop((before.guild.id, before.name), None)
+
+@bot.event
+async def on_guild_channel_delete(channel: discord.abc.GuildChannel):
+    _channel_ids.pop((channel.guild.id, channel.name), None)
+
+@bot.event
+async def on_guild_role_update(before: discord.Role, after: discord.Role):
+    _role_ids.pop((before.guild.id, before.name), None)
+
+@bot.event
+async def on_guild_role_delete(role: discord.Role):
+    _role_ids.pop((role.guild.id, role.name), None)
+
 # Helper function to post notifications to designated channels
-async def post_to_channel(guild: discord.Guild, channel_name: str, embed: discord.Embed) -> bool:
-    """Post an embed to a designated notification channel."""
+async def post_to_channel(guild: discord.Guild, channel_name: str, *embeds: discord.Embed) -> bool:
+    """Post one or more embeds (up to 10) to a designated notification channel in a single message."""
     if not channel_name or not guild:
         print(f"[CHANNEL] Skipped: channel_name={channel_name}, guild={guild}")
         return False
     
     # Search for channel by name (case-insensitive)
-    channel = discord.utils.get(guild.text_channels, name=channel_name.lower())
+    channel = find_text_channel(guild, channel_name.lower())
     
     if channel:
         try:
-            await channel.send(embed=embed)
-            print(f"[CHANNEL] Posted to #{channel_name} in {guild.name}")
+            await channel.send(embeds=list(embeds))
+            print(f"[CHANNEL] Posted {len(embeds)} embed(s) to #{channel_name} in {guild.name}")
             return True
         except discord.Forbidden:
             print(f"[CHANNEL] Missing permissions to post in #{channel_name}")
@@ -74,11 +171,170 @@ async def post_to_channel(guild: discord.Guild, channel_name: str, embed: discor
     
     return False
 
+# Channel posts queued within this window are combined; Discord allows 10 embeds per message
+CHANNEL_BATCH_SECONDS = 0.5
+CHANNEL_BATCH_SIZE = 10
+_pending_channel_posts = {}
+
+def queue_channel_post(guild: discord.Guild, channel_name: str, embed: discord.Embed):
+    """Queue an embed for a notification channel; queued embeds are posted together shortly after."""
+    key = (guild.id, channel_name)
+    pending = _pending_channel_posts.get(key)
+    if pending is None:
+        pending = _pending_channel_posts[key] = []
+        asyncio.get_running_loop().call_later(
+            CHANNEL_BATCH_SECONDS,
+            lambda: run_in_background(flush_channel_posts(guild, channel_name))
+        )
+    pending.append(embed)
+
+async def flush_channel_posts(guild: discord.Guild, channel_name: str):
+    """Post every embed queued for a channel, CHANNEL_BATCH_SIZE per message."""
+    embeds = _pending_channel_posts.pop((guild.id, channel_name), [])
+    for start in range(0, len(embeds), CHANNEL_BATCH_SIZE):
+        await post_to_channel(guild, channel_name, *embeds[start:start + CHANNEL_BATCH_SIZE])
+
+def require_role(role: str, denial: str):
+    """Only run the command handler when the caller is registered with the given role."""
+    def decorator(func):
+        @functools.wraps(func)
+        async def wrapper(interaction: discord.Interaction, *args, **kwargs):
+            if await db.get_role(interaction.user.id) != role:
+                await interaction.response.send_message(denial, ephemeral=True)
+                return
+            return await func(interaction, *args, **kwargs)
+        return wrapper
+    return decorator
+
+# Build list embeds as one description instead of one field per item
+EMBED_DESCRIPTION_LIMIT = 4096
+
+def build_list_description(entries: list) -> str:
+    """Join list entries into an embed description, trimming entries that don't fit."""
+    parts = []
+    length = 0
+    for entry in entries:
+        # Leave room for the "...and N more" line
+        if length + len(entry) + 2 > EMBED_DESCRIPTION_LIMIT - 32:
+            parts.append(f"*...and {len(entries) - len(parts)} more*")
+            break
+        parts.append(entry)
+        length += len(entry) + 2
+    return "\n\n".join(parts)
+
+async def send_result(interaction: discord.Interaction, title: str, description: str, color: discord.Color):
+    """Reply with a result embed that has only a title and description."""
+    await interaction.response.send_message(
+        embed=discord.Embed(title=title, description=description, color=color)
+    )
+
+# Read-only commands run recently, used to drop rapid identical repeats
+DEDUPE_WINDOW_SECONDS = 2.0
+_recent_invocations = TTLCache(maxsize=5_000, ttl=DEDUPE_WINDOW_SECONDS)
+
+def dedupe(func):
+    """Ignore a read-only command repeated with the same arguments within the dedupe window."""
+    @functools.wraps(func)
+    async def wrapper(interaction: discord.Interaction, *args, **kwargs):
+        key = (
+            interaction.user.id,
+            interaction.command.qualified_name if interaction.command else func.__name__,
+            tuple(sorted((name, getattr(value, 'id', value)) for name, value in interaction.namespace))
+        )
+        if key in _recent_invocations:
+            await interaction.response.send_message(
+                "⏳ You just ran this command, see the reply above!",
+                ephemeral=True
+            )
+            return
+        _recent_invocations.set(key, True)
+        try:
+            return await func(interaction, *args, **kwargs)
+        except BaseException:
+            # No reply was sent, so let the user retry right away
+            _recent_invocations.pop(key)
+            raise
+    return wrapper
+
+# Resolve a user from the gateway cache before falling back to the REST API
+# Users fetched over REST, kept so background loops don't refetch the same IDs every pass
+_fetched_users = TTLCache(maxsize=2_000, ttl=3600)
+
+async def get_or_fetch_user(user_id: int, guild: discord.Guild = None) -> discord.abc.User:
+    """Get a user or member from cache, fetching it only on a cache miss."""
+    if guild:
+        member = guild.get_member(user_id)
+        if member:
+            return member
+    user = bot.get_user(user_id) or _fetched_users.get(user_id)
+    if user is None:
+        user = await bot.fetch_user(user_id)
+        _fetched_users.set(user_id, user)
+    return user
+
+# Limit concurrent DM sends so notification bursts stay clear of Discord's rate limits
+DM_SEM = asyncio.Semaphore(5)
+
+async def send_dm(user: discord.abc.Messageable, *args, **kwargs) -> discord.Message:
+    """Send a direct message while holding a slot of DM_SEM."""
+    async with DM_SEM:
+        return await user.send(*args, **kwargs)
+
+async def dm_user(user_id: int, embed: discord.Embed) -> discord.Message:
+    """DM a user by ID without fetching their profile over REST."""
+    # Opening the DM channel only needs the ID; the channel is cached for later sends
+    user = bot.get_user(user_id) or _fetched_users.get(user_id) or discord.Object(id=user_id)
+    channel = await bot.create_dm(user)
+    return await send_dm(channel, embed=embed)
+
+# Notifications sent after the reply; references are kept so pending tasks aren't garbage collected
+_background_tasks = set()
+
+def run_in_background(coro) -> asyncio.Task:
+    """Schedule a notification coroutine without waiting for it to finish."""
+    task = asyncio.create_task(coro)
+    _background_tasks.add(task)
+    task.add_done_callback(_finish_background_task)
+    return task
+
+def _finish_background_task(task: asyncio.Task):
+    _background_tasks.discard(task)
+    if task.cancelled():
+        return
+    error = task.exception()
+    if error and not isinstance(error, discord.HTTPException):
+        print(f"[NOTIFY] Background notification failed: {error!r}")
+
+# Per-user cooldown for commands that write and send notifications
+def user_cooldown():
+    """Allow a user 3 uses of the command every 10 seconds."""
+    return app_commands.checks.cooldown(3, 10.0, key=lambda interaction: interaction.user.id)
+
+# Discord expires interactions that are not acknowledged within 3 seconds
+ACK_BUDGET_SECONDS = 2.5
+
+async def defer_response(interaction: discord.Interaction, ephemeral: bool = False) -> bool:
+    """Defer the interaction response, giving up once the acknowledgement budget is spent."""
+    elapsed = (discord.utils.utcnow() - interaction.created_at).total_seconds()
+    try:
+        await asyncio.wait_for(
+            interaction.response.defer(ephemeral=ephemeral),
+            timeout=max(ACK_BUDGET_SECONDS - elapsed, 0.1)
+        )
+        return True
+    except (asyncio.TimeoutError, discord.NotFound):
+        command_name = interaction.command.name if interaction.command else 'unknown'
+        print(f"[ACK] /{command_name} expired before it could be acknowledged ({elapsed:.2f}s)")
+        return False
+
+# Cap how many heavy commands do their database work or chart rendering at once; handlers take a
+# slot only after acknowledging and release it before sending replies, DMs or channel posts
+INTERACTION_SEM = asyncio.Semaphore(4)
+
 # Autocomplete callback functions
 async def punishment_autocomplete(interaction: discord.Interaction, current: str) -> list[app_commands.Choice[str]]:
     """Autocomplete for punishment names."""
-    user = await db.get_user(interaction.user.id)
-    if not user or user['role'] != 'dominant':
+    if await db.get_role(interaction.user.id) != 'dominant':
         return []
     
     punishments = await db.get_punishments(interaction.user.id)
@@ -89,8 +345,7 @@ async def punishment_autocomplete(interaction: discord.Interaction, current: str
 
 async def reward_autocomplete(interaction: discord.Interaction, current: str) -> list[app_commands.Choice[str]]:
     """Autocomplete for reward names (for dominants)."""
-    user = await db.get_user(interaction.user.id)
-    if not user or user['role'] != 'dominant':
+    if await db.get_role(interaction.user.id) != 'dominant':
         return []
     
     rewards = await db.get_rewards(interaction.user.id)
@@ -101,8 +356,7 @@ async def reward_autocomplete(interaction: discord.Interaction, current: str) ->
 
 async def reward_claim_autocomplete(interaction: discord.Interaction, current: str) -> list[app_commands.Choice[str]]:
     """Autocomplete for reward names (for submissives claiming rewards)."""
-    user = await db.get_user(interaction.user.id)
-    if not user or user['role'] != 'submissive':
+    if await db.get_role(interaction.user.id) != 'submissive':
         return []
     
     # Get all dominants
@@ -127,15 +381,14 @@ async def reward_claim_autocomplete(interaction: discord.Interaction, current: s
 
 async def task_autocomplete(interaction: discord.Interaction, current: str) -> list[app_commands.Choice[str]]:
     """Autocomplete for task names (requires submissive to be selected first)."""
-    user = await db.get_user(interaction.user.id)
-    if not user or user['role'] != 'dominant':
+    if await db.get_role(interaction.user.id) != 'dominant':
         return []
     
     # Get submissive from the current interaction namespace
     # This only works if submissive parameter comes before task in command definition
     try:
         submissive = interaction.namespace.submissive
-        if not submissive:
+        if not submissive or submissive.id not in await db.get_submissive_ids(interaction.user.id):
             return []
         
         tasks = await db.get_tasks(submissive.id, active_only=True)
@@ -143,13 +396,12 @@ async def task_autocomplete(interaction: discord.Interaction, current: str) -> l
             app_commands.Choice(name=t['title'], value=t['title'])
             for t in tasks if current.lower() in t['title'].lower()
         ][:25]
-    except:
+    except Exception:
         return []
 
 async def pending_task_completion_autocomplete(interaction: discord.Interaction, current: str) -> list[app_commands.Choice[str]]:
     """Autocomplete for pending task completions."""
-    user = await db.get_user(interaction.user.id)
-    if not user or user['role'] != 'dominant':
+    if await db.get_role(interaction.user.id) != 'dominant':
         return []
     
     pending_items = await db.get_pending_task_completions_for_autocomplete(interaction.user.id)
@@ -163,13 +415,13 @@ async def pending_task_completion_autocomplete(interaction: discord.Interaction,
 
 async def pending_punishment_assignment_autocomplete(interaction: discord.Interaction, current: str) -> list[app_commands.Choice[str]]:
     """Autocomplete for pending punishment assignments."""
-    user = await db.get_user(interaction.user.id)
-    if not user or user['role'] != 'dominant':
-        print(f"[AUTOCOMPLETE] User {interaction.user.id} not dominant or doesn't exist")
+    user_id = interaction.user.id
+    if await db.get_role(user_id) != 'dominant':
+        print(f"[AUTOCOMPLETE] User {user_id} not dominant or doesn't exist")
         return []
     
-    pending_items = await db.get_pending_punishment_assignments_for_autocomplete(interaction.user.id)
-    print(f"[AUTOCOMPLETE] Found {len(pending_items)} pending punishment assignments for dominant {interaction.user.id}")
+    pending_items = await db.get_pending_punishment_assignments_for_autocomplete(user_id)
+    print(f"[AUTOCOMPLETE] Found {len(pending_items)} pending punishment assignments for dominant {user_id}")
     print(f"[AUTOCOMPLETE] Items: {pending_items}")
     return [
         app_commands.Choice(
@@ -179,168 +431,198 @@ async def pending_punishment_assignment_autocomplete(interaction: discord.Intera
         for item in pending_items if current.lower() in item['title'].lower() or current in str(item['id'])
     ][:25]
 
-@tasks.loop(minutes=5)
-async def check_deadlines():
-    """Check for expired tasks and punishments, deduct points."""
-    # Check expired tasks
-    expired_tasks = await db.get_expired_tasks()
+async def assign_auto_punishment(task: dict, deadline: datetime.datetime) -> tuple:
+    """Assign a missed task's linked (or random) punishment; returns (assignment_id, title)."""
+    punishment_id = task.get('auto_punishment_id')
+    punishment_title = None
+    if not punishment_id:
+        return None, None
+    
+    # If punishment_id is -1, assign a random punishment
+    if punishment_id == -1:
+        random_punishment = await db.get_random_punishment(task['dominant_id'])
+        if not random_punishment:
+            return None, None  # No punishments available
+        punishment_id = random_punishment['id']
+        punishment_title = random_punishment['title']
+    
+    assignment_id = await db.assign_punishment(
+        task['submissive_id'], 
+        task['dominant_id'], 
+        punishment_id, 
+        f"Auto-assigned for missing task: {task['title']}", 
+        deadline, 
+        10
+    )
+    return assignment_id, punishment_title
+
+# Deadline notification styling, built once
+MISSED_COLOR = discord.Color.red()
+EXPIRED_COLOR = discord.Color.orange()
+MISSED_PUNISHMENT_COLOR = discord.Color.dark_red()
+MISSED_PUNISHMENT_FOOTER = "You can still submit proof - approval will refund the penalty"
+
+def missed_task_embeds(task: dict, points_deducted: int, new_total: int,
+                       assignment_id: int = None, punishment_title: str = None) -> tuple:
+    """Build the (submissive, dominant) embeds for a missed task deadline."""
+    sub_embed = discord.Embed(
+        title="⏰ Task Deadline Missed",
+        description=f"You missed the deadline for: **{task['title']}**",
+        color=MISSED_COLOR
+    )
+    sub_embed.add_field(name="Points Deducted", value=str(points_deducted), inline=True)
+    sub_embed.add_field(name="New Total", value=str(new_total), inline=True)
+    
+    dom_embed = discord.Embed(
+        title="⏰ Task Deadline Expired",
+        description=f"Task **{task['title']}** expired without completion.",
+        color=EXPIRED_COLOR
+    )
+    dom_embed.add_field(name="Submissive ID", value=str(task['submissive_id']), inline=True)
+    dom_embed.add_field(name="Points Deducted", value=str(points_deducted), inline=True)
+    
+    if assignment_id is not None:
+        punish_text = f"Assignment ID: {assignment_id}\nDeadline: 24 hours"
+        if punishment_title:
+            punish_text = f"**{punishment_title}**\n" + punish_text
+        sub_embed.add_field(name="⚠️ Punishment Auto-Assigned", value=punish_text, inline=False)
+        dom_embed.add_field(name="Punishment Auto-Assigned", value=f"Assignment ID: {assignment_id}", inline=True)
+    return sub_embed, dom_embed
+
+def missed_punishment_embeds(punishment: dict, doubled_penalty: int, new_total: int) -> tuple:
+    """Build the (submissive, dominant) embeds for a missed punishment deadline."""
+    sub_embed = discord.Embed(
+        title="⏰ Punishment Deadline Missed",
+        description=f"You missed the deadline for punishment assignment #{punishment['id']}",
+        color=MISSED_PUNISHMENT_COLOR
+    )
+    sub_embed.add_field(name="Penalty Doubled", value=f"-{doubled_penalty} points (was -{punishment['point_penalty']})", inline=True)
+    sub_embed.add_field(name="New Total", value=str(new_total), inline=True)
+    sub_embed.set_footer(text=MISSED_PUNISHMENT_FOOTER)
+    
+    dom_embed = discord.Embed(
+        title="⏰ Punishment Deadline Expired",
+        description=f"Punishment assignment #{punishment['id']} expired without proof.",
+        color=EXPIRED_COLOR
+    )
+    dom_embed.add_field(name="Submissive ID", value=str(punishment['submissive_id']), inline=True)
+    dom_embed.add_field(name="Penalty Doubled", value=f"-{doubled_penalty} points", inline=True)
+    return sub_embed, dom_embed
+
+async def process_expired_task(task: dict, deadline: datetime.datetime):
+    """Deduct points, auto-assign punishments and notify both users for one missed task."""
+    # Deduct points and assign the linked punishment together
+    points_to_deduct = task['point_value']
+    new_total, (assignment_id, punishment_title) = await asyncio.gather(
+        db.update_points(task['submissive_id'], -points_to_deduct),
+        assign_auto_punishment(task, deadline)
+    )
     
+    # Assign punishments for any point thresholds crossed
+    await db.trigger_point_thresholds(task['submissive_id'], new_total, deadline)
+    
+    # Notify both users; failed DMs (closed DMs, unknown users) are ignored
+    sub_embed, dom_embed = missed_task_embeds(task, points_to_deduct, new_total, assignment_id, punishment_title)
+    await asyncio.gather(
+        dm_user(task['submissive_id'], sub_embed),
+        dm_user(task['dominant_id'], dom_embed),
+        return_exceptions=True
+    )
+
+async def process_expired_tasks_in_order(expired_tasks: list, deadline: datetime.datetime):
+    """Process one submissive's missed tasks in order so point totals and thresholds stay consistent."""
     for task in expired_tasks:
-        # Deduct points
-        points_to_deduct = task['point_value']
-        new_total = await db.update_points(task['submissive_id'], -points_to_deduct)
-        
-        # Check if task has linked punishment and auto-assign it
-        punishment_id = task.get('auto_punishment_id')
-        punishment_assigned = False
-        assignment_id = None
-        punishment_title = None
-        if punishment_id:
-            # If punishment_id is -1, assign a random punishment
-            if punishment_id == -1:
-                random_punishment = await db.get_random_punishment(task['dominant_id'])
-                if random_punishment:
-                    punishment_id = random_punishment['id']
-                    punishment_title = random_punishment['title']
-                else:
-                    punishment_id = None  # No punishments available
-            
-            if punishment_id and punishment_id != -1:
-                deadline = datetime.datetime.now() + datetime.timedelta(hours=24)
-                assignment_id = await db.assign_punishment(
-                    task['submissive_id'], 
-                    task['dominant_id'], 
-                    punishment_id, 
-                    f"Auto-assigned for missing task: {task['title']}", 
-                    deadline, 
-                    10
-                )
-                punishment_assigned = True
-        
-        # Check point thresholds
-        thresholds = await db.check_point_thresholds(task['submissive_id'], new_total)
-        for threshold in thresholds:
-            deadline = datetime.datetime.now() + datetime.timedelta(hours=24)
-            await db.assign_punishment(
-                task['submissive_id'],
-                threshold['dominant_id'],
-                threshold['punishment_id'],
-                f"Auto-assigned for dropping below {threshold['threshold_points']} points",
-                deadline,
-                10
-            )
-            await db.mark_threshold_triggered(threshold['id'])
+        await process_expired_task(task, deadline)
+
+async def process_expired_punishment(punishment: dict):
+    """Expire one missed punishment, deduct its doubled penalty and notify both users."""
+    # Expiry and deduction commit together, so a failure leaves the punishment pending for the next tick
+    result = await db.expire_punishment(punishment['id'])
+    if result is None:
+        return
+    
+    # Notify both users; failed DMs (closed DMs, unknown users) are ignored
+    sub_embed, dom_embed = missed_punishment_embeds(punishment, result['penalty'], result['new_total'])
+    await asyncio.gather(
+        dm_user(punishment['submissive_id'], sub_embed),
+        dm_user(punishment['dominant_id'], dom_embed),
+        return_exceptions=True
+    )
+
+def log_failures(label: str, results: list):
+    """Print any exceptions returned by asyncio.gather(..., return_exceptions=True)."""
+    for result in results:
+        if isinstance(result, Exception):
+            print(f"[DEADLINES] Failed to process {label}: {result!r}")
+
+async def check_deadlines(expired_punishments: list):
+    """Handle expired tasks and punishments, deduct points."""
+    # Punishments assigned during this pass all get the same 24-hour deadline
+    deadline_24h = datetime.datetime.now() + HOURS_24
+    
+    # Check expired tasks a batch at a time, one submissive per coroutine
+    async for expired_tasks in db.iter_expired_tasks(batch_size=100):
+        tasks_by_submissive = {}
+        for task in expired_tasks:
+            tasks_by_submissive.setdefault(task['submissive_id'], []).append(task)
+        results = await asyncio.gather(
+            *(process_expired_tasks_in_order(sub_tasks, deadline_24h) for sub_tasks in tasks_by_submissive.values()),
+            return_exceptions=True
+        )
+        log_failures("expired task", results)
         
         # Only deactivate one-time tasks (not daily/weekly/custom)
         # Recurring tasks stay active and will reset when completion is approved
-        frequency = task.get('frequency', 'daily')
-        if frequency not in ('daily', 'weekly', 'custom'):
-            await db.deactivate_expired_task(task['id'])
-        
-        # Notify submissive
-        try:
-            sub_user = await bot.fetch_user(task['submissive_id'])
-            embed = discord.Embed(
-                title="⏰ Task Deadline Missed",
-                description=f"You missed the deadline for: **{task['title']}**",
-                color=discord.Color.red()
-            )
-            embed.add_field(name="Points Deducted", value=str(points_to_deduct), inline=True)
-            embed.add_field(name="New Total", value=str(new_total), inline=True)
-            if punishment_assigned:
-                punish_text = f"Assignment ID: {assignment_id}\nDeadline: 24 hours"
-                if punishment_title:
-                    punish_text = f"**{punishment_title}**\n" + punish_text
-                embed.add_field(name="⚠️ Punishment Auto-Assigned", value=punish_text, inline=False)
-            await sub_user.send(embed=embed)
-        except:
-            pass
-        
-        # Notify dominant
-        try:
-            dom_user = await bot.fetch_user(task['dominant_id'])
-            embed = discord.Embed(
-                title="⏰ Task Deadline Expired",
-                description=f"Task **{task['title']}** expired without completion.",
-                color=discord.Color.orange()
-            )
-            embed.add_field(name="Submissive ID", value=str(task['submissive_id']), inline=True)
-            embed.add_field(name="Points Deducted", value=str(points_to_deduct), inline=True)
-            if punishment_assigned:
-                embed.add_field(name="Punishment Auto-Assigned", value=f"Assignment ID: {assignment_id}", inline=True)
-            await dom_user.send(embed=embed)
-        except:
-            pass
+        await db.deactivate_expired_tasks([
+            task['id'] for task in expired_tasks
+            if task.get('frequency', 'daily') not in ('daily', 'weekly', 'custom')
+        ])
     
     # Check expired punishments
-    expired_punishments = await db.get_expired_punishments()
-    
-    for punishment in expired_punishments:
-        # Double the penalty and deduct points
-        penalty = punishment['point_penalty']
-        doubled_penalty = penalty * 2
-        new_total = await db.update_points(punishment['submissive_id'], -doubled_penalty)
-        
-        # Mark as expired and double penalty
-        await db.expire_punishment(punishment['id'], double_penalty=True)
-        
-        # Notify submissive
-        try:
-            sub_user = await bot.fetch_user(punishment['submissive_id'])
-            embed = discord.Embed(
-                title="⏰ Punishment Deadline Missed",
-                description=f"You missed the deadline for punishment assignment #{punishment['id']}",
-                color=discord.Color.dark_red()
-            )
-            embed.add_field(name="Penalty Doubled", value=f"-{doubled_penalty} points (was -{penalty})", inline=True)
-            embed.add_field(name="New Total", value=str(new_total), inline=True)
-            embed.set_footer(text="You can still submit proof - approval will refund the penalty")
-            await sub_user.send(embed=embed)
-        except:
-            pass
-        
-        # Notify dominant
-        try:
-            dom_user = await bot.fetch_user(punishment['dominant_id'])
-            embed = discord.Embed(
-                title="⏰ Punishment Deadline Expired",
-                description=f"Punishment assignment #{punishment['id']} expired without proof.",
-                color=discord.Color.orange()
-            )
-            embed.add_field(name="Submissive ID", value=str(punishment['submissive_id']), inline=True)
-            embed.add_field(name="Penalty Doubled", value=f"-{doubled_penalty} points", inline=True)
-            await dom_user.send(embed=embed)
-        except:
-            pass
+    results = await asyncio.gather(
+        *(process_expired_punishment(punishment) for punishment in expired_punishments),
+        return_exceptions=True
+    )
+    log_failures("expired punishment", results)
 
-@tasks.loop(minutes=5)
-async def check_recurring_tasks():
-    """Check for completed recurring tasks that need to be reset."""
-    tasks_to_reset = await db.get_tasks_to_reset()
+async def check_recurring_tasks(tasks_to_reset: list):
+    """Reset completed recurring tasks and notify their submissives."""
+    notifications = []
     
     for task in tasks_to_reset:
         await db.reset_recurring_task(task['id'])
         
         # Notify submissive about reset task
-        try:
-            sub_user = await bot.fetch_user(task['submissive_id'])
-            embed = discord.Embed(
-                title="🔄 Task Reset",
-                description=f"Your recurring task **{task['title']}** has been reset and is ready again!",
-                color=discord.Color.blue()
-            )
-            embed.add_field(name="Frequency", value=task['frequency'].capitalize(), inline=True)
-            embed.add_field(name="Points", value=str(task['point_value']), inline=True)
-            
-            # Show next occurrence if available
-            next_occur = task.get('next_occurrence')
-            if next_occur:
-                next_dt = datetime.datetime.fromisoformat(next_occur)
-                embed.add_field(name="Available Until", value=f"<t:{int(next_dt.timestamp())}:R>", inline=False)
-            
-            await sub_user.send(embed=embed)
-        except:
-            pass
+        embed = discord.Embed(
+            title="🔄 Task Reset",
+            description=f"Your recurring task **{task['title']}** has been reset and is ready again!",
+            color=discord.Color.blue()
+        )
+        embed.add_field(name="Frequency", value=task['frequency'].capitalize(), inline=True)
+        embed.add_field(name="Points", value=str(task['point_value']), inline=True)
+        
+        # Show next occurrence if available
+        if task['next_occurrence_ts'] is not None:
+            embed.add_field(name="Available Until", value=f"<t:{task['next_occurrence_ts']}:R>", inline=False)
+        
+        notifications.append(dm_user(task['submissive_id'], embed))
+    
+    # Send all reset notices once the resets are written; failed DMs are ignored
+    await asyncio.gather(*notifications, return_exceptions=True)
+
+@tasks.loop(minutes=5)
+async def periodic_tick():
+    """Run the deadline and recurring-reset checks together."""
+    expired_punishments, tasks_to_reset = await asyncio.gather(
+        db.get_expired_punishments(),
+        db.get_tasks_to_reset()
+    )
+    results = await asyncio.gather(
+        check_deadlines(expired_punishments),
+        check_recurring_tasks(tasks_to_reset),
+        return_exceptions=True
+    )
+    log_failures("periodic check", results)
 
 @tasks.loop(minutes=15)
 async def send_reminders():
@@ -350,7 +632,6 @@ async def send_reminders():
     
     for task in tasks_to_remind:
         try:
-            sub_user = await bot.fetch_user(task['submissive_id'])
             deadline_dt = datetime.datetime.fromisoformat(task['deadline'])
             time_remaining = deadline_dt - datetime.datetime.now()
             hours_remaining = int(time_remaining.total_seconds() / 3600)
@@ -366,7 +647,7 @@ async def send_reminders():
             embed.add_field(name="Deadline", value=f"<t:{int(deadline_dt.timestamp())}:R>", inline=False)
             embed.set_footer(text=f"Task ID: {task['id']} | Reminders every {task['reminder_interval_hours']}h")
             
-            await sub_user.send(embed=embed)
+            await dm_user(task['submissive_id'], embed)
             await db.update_task_reminder_sent(task['id'])
         except Exception as e:
             print(f"[REMINDER] Failed to send task reminder for task {task['id']}: {e}")
@@ -376,7 +657,6 @@ async def send_reminders():
     
     for punishment in punishments_to_remind:
         try:
-            sub_user = await bot.fetch_user(punishment['submissive_id'])
             deadline_dt = datetime.datetime.fromisoformat(punishment['deadline'])
             time_remaining = deadline_dt - datetime.datetime.now()
             hours_remaining = int(time_remaining.total_seconds() / 3600)
@@ -394,23 +674,20 @@ async def send_reminders():
                 embed.add_field(name="Reason", value=punishment['reason'], inline=False)
             embed.set_footer(text=f"Assignment ID: {punishment['id']} | Reminders every {punishment['reminder_interval_hours']}h")
             
-            await sub_user.send(embed=embed)
+            await dm_user(punishment['submissive_id'], embed)
             await db.update_punishment_reminder_sent(punishment['id'])
         except Exception as e:
             print(f"[REMINDER] Failed to send punishment reminder for assignment {punishment['id']}: {e}")
 
+@periodic_tick.before_loop
+@send_reminders.before_loop
+async def wait_for_ready():
+    """Hold background loops until the bot's caches are ready."""
+    await bot.wait_until_ready()
+
 @bot.event
 async def on_ready():
-    """Initialize bot when ready."""
-    await db.init_db()
-    check_deadlines.start()  # Start deadline checker
-    check_recurring_tasks.start()  # Start recurring task reset checker
-    send_reminders.start()  # Start reminder sender
-    try:
-        synced = await bot.tree.sync()
-        print(f"Synced {len(synced)} command(s)")
-    except Exception as e:
-        print(f"Failed to sync commands: {e}")
+    """Log status when connected (fires again on every reconnect)."""
     print(f'{bot.user} is now online!')
     
     # Print server configuration status
@@ -433,7 +710,7 @@ async def on_app_command_error(interaction: discord.Interaction, error: app_comm
                 "❌ This bot is not configured to work in this server or in DMs.",
                 ephemeral=True
             )
-        except:
+        except (discord.HTTPException, discord.InteractionResponded):
             pass
         return
     
@@ -472,10 +749,7 @@ async def register(interaction: discord.Interaction, role: app_commands.Choice[s
         if interaction.guild:  # Only works if command is used in a server
             try:
                 # Look for a role named "Dominant" or "Submissive" (case-insensitive)
-                discord_role = discord.utils.get(
-                    interaction.guild.roles,
-                    name=role.value.capitalize()
-                )
+                discord_role = find_role(interaction.guild, role.value.capitalize())
                 
                 # Only assign if role exists and user doesn't already have it
                 if discord_role and discord_role not in interaction.user.roles:
@@ -504,20 +778,11 @@ async def register(interaction: discord.Interaction, role: app_commands.Choice[s
 
 @bot.tree.command(name="link", description="Link a dominant with a submissive")
 @app_commands.describe(submissive="The submissive user to link")
+@require_role('dominant', "❌ Only dominants can link with submissives!")
 async def link(interaction: discord.Interaction, submissive: discord.Member):
     """Create a relationship between dominant and submissive."""
-    # Verify dominant role
-    user = await db.get_user(interaction.user.id)
-    if not user or user['role'] != 'dominant':
-        await interaction.response.send_message(
-            "❌ Only dominants can link with submissives!",
-            ephemeral=True
-        )
-        return
-    
     # Verify submissive role
-    sub_user = await db.get_user(submissive.id)
-    if not sub_user or sub_user['role'] != 'submissive':
+    if await db.get_role(submissive.id) != 'submissive':
         await interaction.response.send_message(
             f"❌ {submissive.mention} is not registered as a submissive!",
             ephemeral=True
@@ -561,6 +826,8 @@ async def link(interaction: discord.Interaction, submissive: discord.Member):
     app_commands.Choice(name="Weekly", value="weekly"),
     app_commands.Choice(name="Custom Interval", value="custom")
 ])
+@user_cooldown()
+@require_role('dominant', "❌ Only dominants can create tasks!")
 async def task_add(
     interaction: discord.Interaction,
     submissive: discord.Member,
@@ -579,18 +846,10 @@ async def task_add(
     reminder_hours: int = None
 ):
     """Add a new task (dominant only)."""
-    # Verify dominant
-    user = await db.get_user(interaction.user.id)
-    if not user or user['role'] != 'dominant':
-        await interaction.response.send_message(
-            "❌ Only dominants can create tasks!",
-            ephemeral=True
-        )
-        return
-    
+    user_id = interaction.user.id
+    submissive_id = submissive.id
     # Verify relationship
-    submissives = await db.get_submissives(interaction.user.id)
-    if not any(s['user_id'] == submissive.id for s in submissives):
+    if not await db.is_linked(user_id, submissive_id):
         await interaction.response.send_message(
             f"❌ {submissive.mention} is not linked to you!",
             ephemeral=True
@@ -600,34 +859,33 @@ async def task_add(
     # Process days of week if provided
     days_of_week_str = None
     if days_of_week and frequency.value == 'weekly':
-        # Convert day names to weekday numbers
-        day_map = {'mon': 0, 'tue': 1, 'wed': 2, 'thu': 3, 'fri': 4, 'sat': 5, 'sun': 6}
-        day_list = [d.strip().lower()[:3] for d in days_of_week.split(',')]
-        day_numbers = [str(day_map[d]) for d in day_list if d in day_map]
-        if day_numbers:
-            days_of_week_str = ','.join(day_numbers)
+        # Convert day names to weekday numbers in one pass, skipping unknown names
+        day_numbers = [
+            str(day) for day in (DAY_MAP.get(d.strip()[:3]) for d in days_of_week.lower().split(','))
+            if day is not None
+        ]
+        days_of_week_str = ','.join(day_numbers) or None
     
     # Get both timezones
-    dom_timezone = await db.get_user_timezone(interaction.user.id)
-    sub_timezone = await db.get_user_timezone(submissive.id)
-    dom_tz = pytz.timezone(dom_timezone)
-    sub_tz = pytz.timezone(sub_timezone)
+    dom_timezone = await db.get_user_timezone(user_id)
+    sub_timezone = await db.get_user_timezone(submissive_id)
+    dom_tz = db.get_zoneinfo(dom_timezone)
+    sub_tz = db.get_zoneinfo(sub_timezone)
     
     # Calculate deadline - prioritize specific datetime > time-only > hours
     deadline = None
     if deadline_datetime:
-        try:
-            # Parse datetime and localize to DOMINANT's timezone, then convert to submissive's
-            naive_dt = datetime.datetime.strptime(deadline_datetime, "%Y-%m-%d %H:%M")
-            deadline = dom_tz.localize(naive_dt)
-            # Convert to submissive's timezone (keeps the same absolute moment in time)
-            deadline = deadline.astimezone(sub_tz)
-        except ValueError:
+        # Parse datetime and localize to DOMINANT's timezone, then convert to submissive's
+        naive_dt = parse_deadline(deadline_datetime)
+        if naive_dt is None:
             await interaction.response.send_message(
                 f"❌ Invalid datetime format! Use: YYYY-MM-DD HH:MM (e.g., 2026-02-05 15:30)\nYour timezone: {dom_timezone}",
                 ephemeral=True
             )
             return
+        deadline = naive_dt.replace(tzinfo=dom_tz)
+        # Convert to submissive's timezone (keeps the same absolute moment in time)
+        deadline = deadline.astimezone(sub_tz)
     elif deadline_time:
         # Parse time in DOMINANT's timezone and convert to submissive's
         try:
@@ -654,13 +912,13 @@ async def task_add(
     elif deadline_hours:
         # Calculate based on current time (timezone-independent for relative deadlines)
         now = datetime.datetime.now(sub_tz)
-        deadline = now + datetime.timedelta(hours=deadline_hours)
+        deadline = now + ONE_HOUR * deadline_hours
     
     # Handle auto-punishment setup
     auto_punishment_id = None
     if auto_punish and deadline:
         # Check if dominant has any punishments
-        punishments = await db.get_punishments(interaction.user.id)
+        punishments = await db.get_punishments(user_id)
         if not punishments:
             await interaction.response.send_message(
                 "❌ Auto-punish enabled but you have no punishments created! Create one first with /punishment_create",
@@ -670,23 +928,27 @@ async def task_add(
         # We'll store a flag to assign random punishment on deadline miss
         auto_punishment_id = -1  # Special flag for random punishment
     
+    if not await defer_response(interaction):
+        return
+    
     # Create task
-    task_id = await db.create_task(
-        submissive.id,
-        interaction.user.id,
-        title,
-        description,
-        frequency.value,
-        points,
-        deadline,
-        recurring,
-        interval_hours,
-        days_of_week_str,
-        time_of_day,
-        auto_punishment_id,
-        deadline_time,  # Store the deadline_time for automatic reset on approval
-        reminder_hours  # Reminder interval in hours
-    )
+    async with INTERACTION_SEM:
+        task_id = await db.create_task(
+            submissive_id,
+            user_id,
+            title,
+            description,
+            frequency.value,
+            points,
+            deadline,
+            recurring,
+            interval_hours,
+            days_of_week_str,
+            time_of_day,
+            auto_punishment_id,
+            deadline_time,  # Store the deadline_time for automatic reset on approval
+            reminder_hours  # Reminder interval in hours
+        )
     
     embed = discord.Embed(
         title="📋 New Task Created",
@@ -705,8 +967,7 @@ async def task_add(
     if recurring:
         recur_info = "🔄 **Auto-Reset Enabled**\n"
         if frequency.value == 'weekly' and days_of_week_str:
-            day_names = ['Mon', 'Tue', 'Wed', 'Thu', 'Fri', 'Sat', 'Sun']
-            days = [day_names[int(d)] for d in days_of_week_str.split(',')]
+            days = [DAY_NAMES[int(d)] for d in days_of_week_str.split(',')]
             recur_info += f"Days: {', '.join(days)}"
         elif frequency.value == 'custom' and interval_hours:
             recur_info += f"Every {interval_hours} hours"
@@ -722,27 +983,27 @@ async def task_add(
         embed.add_field(name="Deadline", value=f"<t:{int(deadline.timestamp())}:R>", inline=False)
     embed.set_footer(text=f"Task ID: {task_id}")
     
-    await interaction.response.send_message(embed=embed)
-    
-    # Post to task channel if configured
+    # Reply, DM the submissive and post to the task channel concurrently
+    deadline_text = f"\n⏰ **Deadline:** <t:{int(deadline.timestamp())}:R>" if deadline else ""
+    sends = [
+        interaction.followup.send(embed=embed),
+        send_dm(submissive, f"📋 **New task assigned by {interaction.user.display_name}!**\n\n**{title}**\n{description}\n\nFrequency: {frequency.value} | Points: {points}{deadline_text}")
+    ]
     if config.TASK_CHANNEL_NAME and interaction.guild:
-        await post_to_channel(interaction.guild, config.TASK_CHANNEL_NAME, embed)
+        sends.append(post_to_channel(interaction.guild, config.TASK_CHANNEL_NAME, embed))
     
-    # Notify submissive via DM
-    try:
-        deadline_text = f"\n⏰ **Deadline:** <t:{int(deadline.timestamp())}:R>" if deadline else ""
-        await submissive.send(f"📋 **New task assigned by {interaction.user.display_name}!**\n\n**{title}**\n{description}\n\nFrequency: {frequency.value} | Points: {points}{deadline_text}")
-    except:
-        pass  # User has DMs disabled
+    # DM failures (e.g. DMs disabled) are ignored
+    await asyncio.gather(*sends, return_exceptions=True)
 
 @bot.tree.command(name="tasks", description="View your tasks or a submissive's tasks")
 @app_commands.describe(submissive="View tasks for this submissive (dominants only)")
+@dedupe
 async def tasks(interaction: discord.Interaction, submissive: discord.Member = None):
     """View tasks."""
-    user = await db.get_user(interaction.user.id)
-    if not user:
+    role, linked = await db.get_user_and_link(interaction.user.id, submissive.id if submissive else None)
+    if not role:
         await interaction.response.send_message(
-            "❌ You need to register first! Use `/register`",
+            NOT_REGISTERED,
             ephemeral=True
         )
         return
@@ -750,15 +1011,14 @@ async def tasks(interaction: discord.Interaction, submissive: discord.Member = N
     # Determine whose tasks to show
     if submissive:
         # Dominant viewing submissive's tasks
-        if user['role'] != 'dominant':
+        if role != 'dominant':
             await interaction.response.send_message(
                 "❌ Only dominants can view others' tasks!",
                 ephemeral=True
             )
             return
         
-        submissives = await db.get_submissives(interaction.user.id)
-        if not any(s['user_id'] == submissive.id for s in submissives):
+        if not linked:
             await interaction.response.send_message(
                 f"❌ {submissive.mention} is not linked to you!",
                 ephemeral=True
@@ -769,7 +1029,7 @@ async def tasks(interaction: discord.Interaction, submissive: discord.Member = N
         target_name = submissive.display_name
     else:
         # User viewing own tasks
-        if user['role'] == 'dominant':
+        if role == 'dominant':
             await interaction.response.send_message(
                 "❌ Specify a submissive to view their tasks!",
                 ephemeral=True
@@ -778,30 +1038,37 @@ async def tasks(interaction: discord.Interaction, submissive: discord.Member = N
         target_id = interaction.user.id
         target_name = "Your"
     
-    # Get tasks
-    tasks_list = await db.get_tasks(target_id)
-    
-    if not tasks_list:
+    # Check for an empty list before deferring so the reply can stay private
+    if not await db.has_active_tasks(target_id):
         await interaction.response.send_message(
             f"{target_name} tasks list is empty!",
             ephemeral=True
         )
         return
     
-    embed = discord.Embed(
-        title=f"📋 {target_name} Active Tasks",
-        color=discord.Color.blue()
-    )
+    if not await defer_response(interaction):
+        return
+    
+    # Get tasks (list text comes preformatted from the database)
+    async with INTERACTION_SEM:
+        tasks_list = await db.get_task_list(target_id)
+    
+    if not tasks_list:
+        await interaction.followup.send(
+            f"{target_name} tasks list is empty!",
+            ephemeral=True
+        )
+        return
     
+    entries = []
     for task in tasks_list:
-        value = f"{task['description']}\n**Frequency:** {task['frequency'].capitalize()}\n**Points:** {task['point_value']}"
+        value = task['entry']
         
         # Add recurrence info if enabled
-        if task.get('recurrence_enabled'):
+        if task['recurrence_enabled']:
             recur_parts = []
             if task['frequency'] == 'weekly' and task.get('days_of_week'):
-                day_names = ['Mon', 'Tue', 'Wed', 'Thu', 'Fri', 'Sat', 'Sun']
-                days = [day_names[int(d)] for d in task['days_of_week'].split(',')]
+                days = [DAY_NAMES[int(d)] for d in task['days_of_week'].split(',')]
                 recur_parts.append(f"Days: {', '.join(days)}")
             elif task['frequency'] == 'custom' and task.get('recurrence_interval_hours'):
                 recur_parts.append(f"Every {task['recurrence_interval_hours']}h")
@@ -813,27 +1080,29 @@ async def tasks(interaction: discord.Interaction, submissive: discord.Member = N
                 value += f"\n🔄 {' '.join(recur_parts)}"
         
         # Add deadline if exists
-        if task.get('deadline'):
-            deadline_dt = datetime.datetime.fromisoformat(task['deadline'])
-            value += f"\n⏰ Deadline: <t:{int(deadline_dt.timestamp())}:R>"
+        if task['deadline_ts'] is not None:
+            value += f"\n⏰ Deadline: <t:{task['deadline_ts']}:R>"
         
-        embed.add_field(
-            name=f"{task['id']}. {task['title']}",
-            value=value,
-            inline=False
-        )
+        entries.append(value)
     
-    await interaction.response.send_message(embed=embed)
+    embed = discord.Embed(
+        title=f"📋 {target_name} Active Tasks",
+        description=build_list_description(entries),
+        color=discord.Color.blue()
+    )
+    
+    await interaction.followup.send(embed=embed)
 
 @bot.tree.command(name="task_complete", description="Submit a task completion with proof")
 @app_commands.describe(
     task_id="The ID of the task to complete",
     proof="Image proof of task completion (required for submissives)"
 )
+@user_cooldown()
 async def task_complete(interaction: discord.Interaction, task_id: int, proof: discord.Attachment = None):
     """Submit task completion for approval (submissives must provide proof)."""
-    user = await db.get_user(interaction.user.id)
-    if not user or user['role'] != 'submissive':
+    role = await db.get_role(interaction.user.id)
+    if role != 'submissive':
         await interaction.response.send_message(
             "❌ Only submissives can complete tasks!",
             ephemeral=True
@@ -856,15 +1125,29 @@ async def task_complete(interaction: discord.Interaction, task_id: int, proof: d
         )
         return
     
-    # Submit for approval
-    completion_id = await db.submit_task_completion(task_id, interaction.user.id, proof.url)
-    if completion_id is None:
+    # Check the task before deferring so the error can stay private
+    if not await db.is_task_active(task_id):
         await interaction.response.send_message(
             "❌ Task not found or already submitted!",
             ephemeral=True
         )
         return
     
+    async def submit():
+        async with INTERACTION_SEM:
+            return await db.submit_task_completion(task_id, interaction.user.id, proof.url)
+    
+    # Acknowledge the interaction while the submission is written
+    acked, completion = await asyncio.gather(defer_response(interaction), submit())
+    if completion is None:
+        if acked:
+            await interaction.followup.send(
+                "❌ Task not found or already submitted!",
+                ephemeral=True
+            )
+        return
+    completion_id = completion['id']
+    
     embed = discord.Embed(
         title="📤 Task Submitted for Approval",
         description="Your task completion has been submitted to your dominant for review.",
@@ -875,43 +1158,37 @@ async def task_complete(interaction: discord.Interaction, task_id: int, proof: d
     embed.set_image(url=proof.url)
     embed.set_footer(text="You'll be notified when it's approved or rejected")
     
-    await interaction.response.send_message(embed=embed)
-    
-    # Get task title for notification
-    import aiosqlite
-    async with aiosqlite.connect(db.DATABASE_NAME) as database:
-        database.row_factory = aiosqlite.Row
-        async with database.execute(
-            "SELECT title FROM tasks WHERE id = ?",
-            (task_id,)
-        ) as cursor:
-            task_row = await cursor.fetchone()
-            task_title = task_row[0] if task_row else "Unknown"
-    
-    # Notify dominant
-    dominant = await db.get_dominant(interaction.user.id)
-    if dominant:
+    # Notify the task's dominant
+    async def notify_dominant():
+        if not completion['dominant_id']:
+            return
         try:
-            dom_user = await bot.fetch_user(dominant['user_id'])
+            dom_user = await get_or_fetch_user(completion['dominant_id'], interaction.guild)
             notif_embed = discord.Embed(
                 title="📥 Pending Task Approval",
                 description=f"**{interaction.user.display_name}** submitted a task completion.",
                 color=discord.Color.blue()
             )
-            notif_embed.add_field(name="Task", value=f"**{task_title}** (ID: {task_id})", inline=False)
+            notif_embed.add_field(name="Task", value=f"**{completion['title']}** (ID: {task_id})", inline=False)
             notif_embed.add_field(name="Completion ID", value=str(completion_id), inline=True)
             notif_embed.set_image(url=proof.url)
             notif_embed.set_footer(text=f"Use /approve {completion_id} or /reject {completion_id}")
-            await dom_user.send(embed=notif_embed)
-        except:
+            await send_dm(dom_user, embed=notif_embed)
+        except discord.HTTPException:
             pass
+    
+    # The submission is saved either way, so the dominant is notified even if the ack was too late
+    replies = [notify_dominant()]
+    if acked:
+        replies.append(interaction.followup.send(embed=embed))
+    await asyncio.gather(*replies, return_exceptions=True)
 
 @bot.tree.command(name="task_delete", description="Delete a task")
 @app_commands.describe(task_id="The ID of the task to delete")
 async def task_delete(interaction: discord.Interaction, task_id: int):
     """Delete a task (dominant only)."""
-    user = await db.get_user(interaction.user.id)
-    if not user or user['role'] != 'dominant':
+    role = await db.get_role(interaction.user.id)
+    if role != 'dominant':
         await interaction.response.send_message(
             "❌ Only dominants can delete tasks!",
             ephemeral=True
@@ -920,12 +1197,12 @@ async def task_delete(interaction: discord.Interaction, task_id: int):
     
     success = await db.delete_task(task_id, interaction.user.id)
     if success:
-        embed = discord.Embed(
-            title="🗑️ Task Deleted",
-            description=f"Task #{task_id} has been permanently deleted.",
-            color=discord.Color.orange()
+        await send_result(
+            interaction,
+            "🗑️ Task Deleted",
+            f"Task #{task_id} has been permanently deleted.",
+            discord.Color.orange()
         )
-        await interaction.response.send_message(embed=embed)
     else:
         await interaction.response.send_message(
             "❌ Task not found or you don't have permission to delete it!",
@@ -943,8 +1220,8 @@ async def task_reactivate(
     deadline_hours: int = 24
 ):
     """Reactivate an inactive task (dominant only)."""
-    user = await db.get_user(interaction.user.id)
-    if not user or user['role'] != 'dominant':
+    role = await db.get_role(interaction.user.id)
+    if role != 'dominant':
         await interaction.response.send_message(
             "❌ Only dominants can reactivate tasks!",
             ephemeral=True
@@ -952,7 +1229,7 @@ async def task_reactivate(
         return
     
     # Calculate new deadline
-    new_deadline = datetime.datetime.now() + datetime.timedelta(hours=deadline_hours)
+    new_deadline = datetime.datetime.now() + ONE_HOUR * deadline_hours
     
     success = await db.reactivate_task(task_id, interaction.user.id, new_deadline)
     if success:
@@ -979,6 +1256,7 @@ async def task_reactivate(
     deadline_datetime="New specific deadline YYYY-MM-DD HH:MM (optional)",
     reminder_hours="Reminder interval in hours (optional, 0 to disable)"
 )
+@require_role('dominant', "❌ Only dominants can edit tasks!")
 async def task_edit(
     interaction: discord.Interaction,
     task_id: int,
@@ -990,27 +1268,18 @@ async def task_edit(
     reminder_hours: int = None
 ):
     """Edit a task (dominant only)."""
-    user = await db.get_user(interaction.user.id)
-    if not user or user['role'] != 'dominant':
-        await interaction.response.send_message(
-            "❌ Only dominants can edit tasks!",
-            ephemeral=True
-        )
-        return
-    
     # Calculate new deadline if provided
     new_deadline = None
     if deadline_datetime:
-        try:
-            new_deadline = datetime.datetime.strptime(deadline_datetime, "%Y-%m-%d %H:%M")
-        except ValueError:
+        new_deadline = parse_deadline(deadline_datetime)
+        if new_deadline is None:
             await interaction.response.send_message(
                 "❌ Invalid datetime format! Use: YYYY-MM-DD HH:MM (e.g., 2026-02-05 15:30)",
                 ephemeral=True
             )
             return
     elif deadline_hours:
-        new_deadline = datetime.datetime.now() + datetime.timedelta(hours=deadline_hours)
+        new_deadline = datetime.datetime.now() + ONE_HOUR * deadline_hours
     
     success = await db.edit_task(
         task_id, 
@@ -1058,6 +1327,7 @@ async def task_edit(
     description="Reward description",
     cost="Point cost (default: 0)"
 )
+@require_role('dominant', "❌ Only dominants can create rewards!")
 async def reward_create(
     interaction: discord.Interaction,
     title: str,
@@ -1065,14 +1335,6 @@ async def reward_create(
     cost: int = 0
 ):
     """Create a reward (dominant only)."""
-    user = await db.get_user(interaction.user.id)
-    if not user or user['role'] != 'dominant':
-        await interaction.response.send_message(
-            "❌ Only dominants can create rewards!",
-            ephemeral=True
-        )
-        return
-    
     try:
         reward_id = await db.create_reward(interaction.user.id, title, description, cost)
     except Exception as e:
@@ -1100,21 +1362,23 @@ async def reward_create(
     await interaction.response.send_message(embed=embed)
 
 @bot.tree.command(name="rewards", description="View available rewards")
+@dedupe
 async def rewards(interaction: discord.Interaction):
     """View rewards."""
-    user = await db.get_user(interaction.user.id)
-    if not user:
+    user_id = interaction.user.id
+    role = await db.get_role(user_id)
+    if not role:
         await interaction.response.send_message(
-            "❌ You need to register first! Use `/register`",
+            NOT_REGISTERED,
             ephemeral=True
         )
         return
     
     # Get dominant ID(s)
-    if user['role'] == 'dominant':
-        dominant_ids = [interaction.user.id]
+    if role == 'dominant':
+        dominant_ids = [user_id]
     else:
-        dominants = await db.get_dominants(interaction.user.id)
+        dominants = await db.get_dominants(user_id)
         if not dominants:
             await interaction.response.send_message(
                 "❌ You're not linked to a dominant!",
@@ -1124,10 +1388,7 @@ async def rewards(interaction: discord.Interaction):
         dominant_ids = [d['user_id'] for d in dominants]
     
     # Collect rewards from all dominants
-    all_rewards = []
-    for dominant_id in dominant_ids:
-        rewards_list = await db.get_rewards(dominant_id)
-        all_rewards.extend(rewards_list)
+    all_rewards = await db.get_rewards_for_dominants(dominant_ids)
     
     if not all_rewards:
         await interaction.response.send_message(
@@ -1138,17 +1399,13 @@ async def rewards(interaction: discord.Interaction):
     
     embed = discord.Embed(
         title="🎁 Available Rewards",
+        description=build_list_description([
+            f"**{reward['id']}. {reward['title']}**\n{reward['description']}\n**Cost:** {reward['point_cost']} points"
+            for reward in all_rewards
+        ]),
         color=discord.Color.gold()
     )
     
-    for reward in all_rewards:
-        value = f"{reward['description']}\n**Cost:** {reward['point_cost']} points"
-        embed.add_field(
-            name=f"{reward['id']}. {reward['title']}",
-            value=value,
-            inline=False
-        )
-    
     await interaction.response.send_message(embed=embed)
 
 @bot.tree.command(name="reward_assign", description="Assign a reward to a submissive")
@@ -1157,6 +1414,8 @@ async def rewards(interaction: discord.Interaction):
     reward_id="The reward ID",
     reason="Reason for the reward (optional)"
 )
+@user_cooldown()
+@require_role('dominant', "❌ Only dominants can assign rewards!")
 async def reward_assign(
     interaction: discord.Interaction,
     submissive: discord.Member,
@@ -1164,52 +1423,31 @@ async def reward_assign(
     reason: str = None
 ):
     """Assign a reward and deduct points (dominant only)."""
-    user = await db.get_user(interaction.user.id)
-    if not user or user['role'] != 'dominant':
+    # Look up, check the balance, deduct and record the reward in one transaction
+    async with INTERACTION_SEM:
+        purchase = await db.purchase_reward(submissive.id, interaction.user.id, reward_id, reason)
+    reward = purchase['reward']
+    if not reward:
         await interaction.response.send_message(
-            "❌ Only dominants can assign rewards!",
+            "❌ Reward not found!",
             ephemeral=True
         )
         return
     
-    # Get reward details
-    import aiosqlite
-    async with aiosqlite.connect(db.DATABASE_NAME) as database:
-        database.row_factory = aiosqlite.Row
-        async with database.execute(
-            "SELECT * FROM rewards WHERE id = ? AND dominant_id = ?",
-            (reward_id, interaction.user.id)
-        ) as cursor:
-            reward = await cursor.fetchone()
-            if not reward:
-                await interaction.response.send_message(
-                    "❌ Reward not found!",
-                    ephemeral=True
-                )
-                return
-            reward = dict(reward)
-    
-    # Check if submissive can afford it
-    sub_user = await db.get_user(submissive.id)
-    if not sub_user:
+    if purchase['points'] is None:
         await interaction.response.send_message(
             "❌ Submissive not registered!",
             ephemeral=True
         )
         return
     
-    if sub_user['points'] < reward['point_cost']:
+    if not purchase['purchased']:
         await interaction.response.send_message(
-            f"❌ {submissive.mention} doesn't have enough points! (Has: {sub_user['points']}, Needs: {reward['point_cost']})",
+            f"❌ {submissive.mention} doesn't have enough points! (Has: {purchase['points']}, Needs: {reward['point_cost']})",
             ephemeral=True
         )
         return
-    
-    # Deduct points
-    new_total = await db.update_points(submissive.id, -reward['point_cost'])
-    
-    # Assign reward
-    await db.assign_reward(submissive.id, interaction.user.id, reward_id, reason)
+    new_total = purchase['points']
     
     embed = discord.Embed(
         title="🎁 Reward Assigned",
@@ -1222,38 +1460,31 @@ async def reward_assign(
     if reason:
         embed.add_field(name="Reason", value=reason, inline=False)
     
-    await interaction.response.send_message(embed=embed)
-    
     # Notify submissive
-    try:
-        notif = discord.Embed(
-            title="🎉 Reward Received!",
-            description=f"**{interaction.user.display_name}** has given you a reward!",
-            color=discord.Color.gold()
-        )
-        notif.add_field(name="Reward", value=reward['title'], inline=False)
-        notif.add_field(name="Description", value=reward['description'], inline=False)
-        notif.add_field(name="Cost", value=f"-{reward['point_cost']} points", inline=True)
-        notif.add_field(name="New Balance", value=f"{new_total} points", inline=True)
-        if reason:
-            notif.add_field(name="Reason", value=reason, inline=False)
-        await submissive.send(embed=notif)
-    except:
-        pass
+    notif_lines = [
+        f"**{interaction.user.display_name}** has given you a reward!",
+        f"**Reward:** {reward['title']}",
+        f"**Description:** {reward['description']}",
+        f"**Cost:** -{reward['point_cost']} points | **New Balance:** {new_total} points"
+    ]
+    if reason:
+        notif_lines.append(f"**Reason:** {reason}")
+    notif = discord.Embed(
+        title="🎉 Reward Received!",
+        description="\n".join(notif_lines),
+        color=discord.Color.gold()
+    )
+    
+    # DM in the background; DM failures are ignored
+    run_in_background(send_dm(submissive, embed=notif))
+    await interaction.response.send_message(embed=embed)
 
 @bot.tree.command(name="reward_delete", description="Delete a reward")
 @app_commands.describe(reward_name="The reward to delete")
 @app_commands.autocomplete(reward_name=reward_autocomplete)
+@require_role('dominant', "❌ Only dominants can delete rewards!")
 async def reward_delete(interaction: discord.Interaction, reward_name: str):
     """Delete a reward (dominant only)."""
-    user = await db.get_user(interaction.user.id)
-    if not user or user['role'] != 'dominant':
-        await interaction.response.send_message(
-            "❌ Only dominants can delete rewards!",
-            ephemeral=True
-        )
-        return
-    
     # Look up reward by name
     reward = await db.get_reward_by_name(interaction.user.id, reward_name)
     if not reward:
@@ -1265,12 +1496,12 @@ async def reward_delete(interaction: discord.Interaction, reward_name: str):
     
     success = await db.delete_reward(reward['id'], interaction.user.id)
     if success:
-        embed = discord.Embed(
-            title="🗑️ Reward Deleted",
-            description=f"**{reward_name}** has been permanently deleted.",
-            color=discord.Color.orange()
+        await send_result(
+            interaction,
+            "🗑️ Reward Deleted",
+            f"**{reward_name}** has been permanently deleted.",
+            discord.Color.orange()
         )
-        await interaction.response.send_message(embed=embed)
     else:
         await interaction.response.send_message(
             "❌ Failed to delete reward!",
@@ -1285,6 +1516,7 @@ async def reward_delete(interaction: discord.Interaction, reward_name: str):
     new_cost="New point cost (optional)"
 )
 @app_commands.autocomplete(reward_name=reward_autocomplete)
+@require_role('dominant', "❌ Only dominants can edit rewards!")
 async def reward_edit(
     interaction: discord.Interaction,
     reward_name: str,
@@ -1293,14 +1525,6 @@ async def reward_edit(
     new_cost: int = None
 ):
     """Edit a reward (dominant only)."""
-    user = await db.get_user(interaction.user.id)
-    if not user or user['role'] != 'dominant':
-        await interaction.response.send_message(
-            "❌ Only dominants can edit rewards!",
-            ephemeral=True
-        )
-        return
-    
     # Look up reward by name
     reward = await db.get_reward_by_name(interaction.user.id, reward_name)
     if not reward:
@@ -1313,20 +1537,20 @@ async def reward_edit(
     success = await db.edit_reward(reward['id'], interaction.user.id, title=new_title, description=new_description, point_cost=new_cost)
     
     if success:
-        embed = discord.Embed(
-            title="✏️ Reward Updated",
-            description=f"**{reward_name}** has been updated.",
-            color=discord.Color.gold()
-        )
-        
+        lines = [f"**{reward_name}** has been updated."]
         if new_title:
-            embed.add_field(name="New Title", value=new_title, inline=False)
+            lines.append(f"**New Title:** {new_title}")
         if new_description:
-            embed.add_field(name="New Description", value=new_description, inline=False)
+            lines.append(f"**New Description:** {new_description}")
         if new_cost is not None:
-            embed.add_field(name="New Cost", value=f"{new_cost} points", inline=True)
+            lines.append(f"**New Cost:** {new_cost} points")
         
-        await interaction.response.send_message(embed=embed)
+        await send_result(
+            interaction,
+            "✏️ Reward Updated",
+            "\n".join(lines),
+            discord.Color.gold()
+        )
     else:
         await interaction.response.send_message(
             "❌ Failed to update reward!",
@@ -1340,7 +1564,8 @@ async def reward_edit(
 @app_commands.autocomplete(reward_name=reward_claim_autocomplete)
 async def reward_claim(interaction: discord.Interaction, reward_name: str):
     """Claim a reward by spending points (submissive only)."""
-    user = await db.get_user(interaction.user.id)
+    user_id = interaction.user.id
+    user = await db.get_user(user_id)
     if not user or user['role'] != 'submissive':
         await interaction.response.send_message(
             "❌ Only submissives can claim rewards!",
@@ -1349,7 +1574,7 @@ async def reward_claim(interaction: discord.Interaction, reward_name: str):
         return
     
     # Get dominant(s)
-    dominants = await db.get_dominants(interaction.user.id)
+    dominants = await db.get_dominants(user_id)
     if not dominants:
         await interaction.response.send_message(
             "❌ You're not linked to a dominant!",
@@ -1375,19 +1600,22 @@ async def reward_claim(interaction: discord.Interaction, reward_name: str):
         )
         return
     
-    # Check if submissive can afford it
-    if user['points'] < reward['point_cost']:
+    # Check the balance, deduct and record the reward in one transaction
+    purchase = await db.purchase_reward(user_id, reward_dominant_id, reward['id'], "Self-claimed")
+    if not purchase['reward']:
         await interaction.response.send_message(
-            f"❌ Not enough points! You have **{user['points']}** points, but need **{reward['point_cost']}** points.",
+            f"❌ Reward '{reward_name}' not found! Use `/rewards` to see available rewards.",
             ephemeral=True
         )
         return
     
-    # Deduct points
-    new_total = await db.update_points(interaction.user.id, -reward['point_cost'])
-    
-    # Assign reward
-    await db.assign_reward(interaction.user.id, reward_dominant_id, reward['id'], "Self-claimed")
+    if not purchase['purchased']:
+        await interaction.response.send_message(
+            f"❌ Not enough points! You have **{purchase['points']}** points, but need **{reward['point_cost']}** points.",
+            ephemeral=True
+        )
+        return
+    new_total = purchase['points']
     
     embed = discord.Embed(
         title="🎉 Reward Claimed!",
@@ -1403,7 +1631,7 @@ async def reward_claim(interaction: discord.Interaction, reward_name: str):
     
     # Notify dominant
     try:
-        dom_user = await bot.fetch_user(reward_dominant_id)
+        dom_user = await get_or_fetch_user(reward_dominant_id, interaction.guild)
         notif = discord.Embed(
             title="🎁 Reward Claimed",
             description=f"**{interaction.user.display_name}** has claimed a reward!",
@@ -1413,7 +1641,7 @@ async def reward_claim(interaction: discord.Interaction, reward_name: str):
         notif.add_field(name="Cost", value=f"{reward['point_cost']} points", inline=True)
         notif.add_field(name="Submissive's New Balance", value=f"{new_total} points", inline=True)
         await dom_user.send(embed=notif)
-    except:
+    except discord.HTTPException:
         pass
 
 # ============ PUNISHMENT COMMANDS ============
@@ -1423,20 +1651,13 @@ async def reward_claim(interaction: discord.Interaction, reward_name: str):
     title="Punishment title",
     description="Punishment description"
 )
+@require_role('dominant', "❌ Only dominants can create punishments!")
 async def punishment_create(
     interaction: discord.Interaction,
     title: str,
     description: str
 ):
     """Create a punishment (dominant only)."""
-    user = await db.get_user(interaction.user.id)
-    if not user or user['role'] != 'dominant':
-        await interaction.response.send_message(
-            "❌ Only dominants can create punishments!",
-            ephemeral=True
-        )
-        return
-    
     try:
         punishment_id = await db.create_punishment(interaction.user.id, title, description)
     except Exception as e:
@@ -1463,21 +1684,23 @@ async def punishment_create(
     await interaction.response.send_message(embed=embed)
 
 @bot.tree.command(name="punishments", description="View available punishments")
+@dedupe
 async def punishments(interaction: discord.Interaction):
     """View punishments."""
-    user = await db.get_user(interaction.user.id)
-    if not user:
+    user_id = interaction.user.id
+    role = await db.get_role(user_id)
+    if not role:
         await interaction.response.send_message(
-            "❌ You need to register first! Use `/register`",
+            NOT_REGISTERED,
             ephemeral=True
         )
         return
     
     # Get dominant ID(s)
-    if user['role'] == 'dominant':
-        dominant_ids = [interaction.user.id]
+    if role == 'dominant':
+        dominant_ids = [user_id]
     else:
-        dominants = await db.get_dominants(interaction.user.id)
+        dominants = await db.get_dominants(user_id)
         if not dominants:
             await interaction.response.send_message(
                 "❌ You're not linked to a dominant!",
@@ -1487,10 +1710,7 @@ async def punishments(interaction: discord.Interaction):
         dominant_ids = [d['user_id'] for d in dominants]
     
     # Collect punishments from all dominants
-    all_punishments = []
-    for dominant_id in dominant_ids:
-        punishments_list = await db.get_punishments(dominant_id)
-        all_punishments.extend(punishments_list)
+    all_punishments = await db.get_punishments_for_dominants(dominant_ids)
     
     if not all_punishments:
         await interaction.response.send_message(
@@ -1501,31 +1721,21 @@ async def punishments(interaction: discord.Interaction):
     
     embed = discord.Embed(
         title="⚠️ Available Punishments",
+        description=build_list_description([
+            f"**{punishment['id']}. {punishment['title']}**\n{punishment['description']}"
+            for punishment in all_punishments
+        ]),
         color=discord.Color.red()
     )
     
-    for punishment in all_punishments:
-        embed.add_field(
-            name=f"{punishment['id']}. {punishment['title']}",
-            value=punishment['description'],
-            inline=False
-        )
-    
     await interaction.response.send_message(embed=embed)
 
 @bot.tree.command(name="punishment_delete", description="Delete a punishment")
 @app_commands.describe(punishment_name="The punishment to delete")
 @app_commands.autocomplete(punishment_name=punishment_autocomplete)
+@require_role('dominant', "❌ Only dominants can delete punishments!")
 async def punishment_delete(interaction: discord.Interaction, punishment_name: str):
     """Delete a punishment (dominant only)."""
-    user = await db.get_user(interaction.user.id)
-    if not user or user['role'] != 'dominant':
-        await interaction.response.send_message(
-            "❌ Only dominants can delete punishments!",
-            ephemeral=True
-        )
-        return
-    
     # Look up punishment by name
     punishment = await db.get_punishment_by_name(interaction.user.id, punishment_name)
     if not punishment:
@@ -1537,12 +1747,12 @@ async def punishment_delete(interaction: discord.Interaction, punishment_name: s
     
     success = await db.delete_punishment(punishment['id'], interaction.user.id)
     if success:
-        embed = discord.Embed(
-            title="🗑️ Punishment Deleted",
-            description=f"**{punishment_name}** has been permanently deleted.",
-            color=discord.Color.orange()
+        await send_result(
+            interaction,
+            "🗑️ Punishment Deleted",
+            f"**{punishment_name}** has been permanently deleted.",
+            discord.Color.orange()
         )
-        await interaction.response.send_message(embed=embed)
     else:
         await interaction.response.send_message(
             "❌ Failed to delete punishment!",
@@ -1556,6 +1766,7 @@ async def punishment_delete(interaction: discord.Interaction, punishment_name: s
     new_description="New punishment description (optional)"
 )
 @app_commands.autocomplete(punishment_name=punishment_autocomplete)
+@require_role('dominant', "❌ Only dominants can edit punishments!")
 async def punishment_edit(
     interaction: discord.Interaction,
     punishment_name: str,
@@ -1563,14 +1774,6 @@ async def punishment_edit(
     new_description: str = None
 ):
     """Edit a punishment (dominant only)."""
-    user = await db.get_user(interaction.user.id)
-    if not user or user['role'] != 'dominant':
-        await interaction.response.send_message(
-            "❌ Only dominants can edit punishments!",
-            ephemeral=True
-        )
-        return
-    
     # Look up punishment by name
     punishment = await db.get_punishment_by_name(interaction.user.id, punishment_name)
     if not punishment:
@@ -1583,18 +1786,18 @@ async def punishment_edit(
     success = await db.edit_punishment(punishment['id'], interaction.user.id, title=new_title, description=new_description)
     
     if success:
-        embed = discord.Embed(
-            title="✏️ Punishment Updated",
-            description=f"**{punishment_name}** has been updated.",
-            color=discord.Color.red()
-        )
-        
+        lines = [f"**{punishment_name}** has been updated."]
         if new_title:
-            embed.add_field(name="New Title", value=new_title, inline=False)
+            lines.append(f"**New Title:** {new_title}")
         if new_description:
-            embed.add_field(name="New Description", value=new_description, inline=False)
+            lines.append(f"**New Description:** {new_description}")
         
-        await interaction.response.send_message(embed=embed)
+        await send_result(
+            interaction,
+            "✏️ Punishment Updated",
+            "\n".join(lines),
+            discord.Color.red()
+        )
     else:
         await interaction.response.send_message(
             "❌ Failed to update punishment!",
@@ -1613,6 +1816,8 @@ async def punishment_edit(
     reminder_hours="Send reminders every X hours (optional, e.g., 12 for twice daily)"
 )
 @app_commands.autocomplete(punishment_name=punishment_autocomplete)
+@user_cooldown()
+@require_role('dominant', "❌ Only dominants can assign punishments!")
 async def punishment_assign(
     interaction: discord.Interaction,
     submissive: discord.Member,
@@ -1625,14 +1830,6 @@ async def punishment_assign(
     reminder_hours: int = None
 ):
     """Assign a punishment with proof requirement and deadline (dominant only)."""
-    user = await db.get_user(interaction.user.id)
-    if not user or user['role'] != 'dominant':
-        await interaction.response.send_message(
-            "❌ Only dominants can assign punishments!",
-            ephemeral=True
-        )
-        return
-    
     # Look up punishment by name
     punishment = await db.get_punishment_by_name(interaction.user.id, punishment_name)
     if not punishment:
@@ -1646,28 +1843,31 @@ async def punishment_assign(
     
     # Calculate deadline - prioritize specific datetime over hours
     if deadline_datetime:
-        try:
-            deadline = datetime.datetime.strptime(deadline_datetime, "%Y-%m-%d %H:%M")
-        except ValueError:
+        deadline = parse_deadline(deadline_datetime)
+        if deadline is None:
             await interaction.response.send_message(
                 "❌ Invalid datetime format! Use: YYYY-MM-DD HH:MM (e.g., 2026-02-05 15:30)",
                 ephemeral=True
             )
             return
     else:
-        deadline = datetime.datetime.now() + datetime.timedelta(hours=deadline_hours)
+        deadline = datetime.datetime.now() + ONE_HOUR * deadline_hours
+    
+    if not await defer_response(interaction):
+        return
     
     forward_to_id = forward_to.id if forward_to else None
-    assignment_id = await db.assign_punishment(
-        submissive.id, 
-        interaction.user.id, 
-        punishment_id, 
-        reason, 
-        deadline, 
-        point_penalty,
-        forward_to_id,
-        reminder_hours
-    )
+    async with INTERACTION_SEM:
+        assignment_id = await db.assign_punishment(
+            submissive.id, 
+            interaction.user.id, 
+            punishment_id, 
+            reason, 
+            deadline, 
+            point_penalty,
+            forward_to_id,
+            reminder_hours
+        )
     
     embed = discord.Embed(
         title="⚠️ Punishment Assigned",
@@ -1685,47 +1885,38 @@ async def punishment_assign(
     if forward_to:
         embed.add_field(name="📸 Image Forward", value=f"Proof will be sent to {forward_to.mention}", inline=False)
     
-    await interaction.response.send_message(embed=embed)
+    # Notify submissive via DM
+    async def notify_submissive():
+        try:
+            notif_lines = [
+                f"**{interaction.user.display_name}** has assigned you a punishment.",
+                f"**Punishment:** **{punishment['title']}** (ID: {punishment_id})",
+                f"**Description:** {punishment['description']}",
+                f"**Assignment ID:** {assignment_id} | **Deadline:** <t:{int(deadline.timestamp())}:R>",
+                f"**Point Penalty:** -{point_penalty} points (doubles to -{point_penalty * 2} if late!)"
+            ]
+            if reason:
+                notif_lines.append(f"**Reason:** {reason}")
+            if forward_to:
+                notif_lines.append(f"📸 **Image Forward:** ⚠️ Your proof will be sent to {forward_to.display_name}")
+            notif = discord.Embed(
+                title="⚠️ Punishment Assigned",
+                description="\n".join(notif_lines),
+                color=discord.Color.red()
+            )
+            notif.set_footer(text=f"Submit proof with: /punishment_complete {assignment_id} proof:<image>")
+            await send_dm(submissive, embed=notif)
+            print(f"[DM] Sent punishment notification to {submissive.display_name}")
+        except discord.Forbidden:
+            print(f"[DM] User {submissive.display_name} has DMs disabled")
+        except Exception as e:
+            print(f"[DM] Failed to send DM to {submissive.display_name}: {e}")
     
-    # Post to punishment channel if configured
+    # DM and post to the punishment channel in the background, then reply
+    run_in_background(notify_submissive())
     if config.PUNISHMENT_CHANNEL_NAME and interaction.guild:
-        await post_to_channel(interaction.guild, config.PUNISHMENT_CHANNEL_NAME, embed)
-    
-    # Get punishment details for notification
-    import aiosqlite
-    async with aiosqlite.connect(db.DATABASE_NAME) as database:
-        database.row_factory = aiosqlite.Row
-        async with database.execute(
-            "SELECT title, description FROM punishments WHERE id = ?",
-            (punishment_id,)
-        ) as cursor:
-            punishment_row = await cursor.fetchone()
-            punishment_title = punishment_row[0] if punishment_row else "Unknown"
-            punishment_desc = punishment_row[1] if punishment_row else ""
-    
-    # Notify submissive via DM
-    try:
-        notif = discord.Embed(
-            title="⚠️ Punishment Assigned",
-            description=f"**{interaction.user.display_name}** has assigned you a punishment.",
-            color=discord.Color.red()
-        )
-        notif.add_field(name="Punishment", value=f"**{punishment_title}** (ID: {punishment_id})", inline=False)
-        notif.add_field(name="Description", value=punishment_desc, inline=False)
-        notif.add_field(name="Assignment ID", value=str(assignment_id), inline=True)
-        notif.add_field(name="Deadline", value=f"<t:{int(deadline.timestamp())}:R>", inline=True)
-        notif.add_field(name="Point Penalty", value=f"-{point_penalty} points (doubles to -{point_penalty * 2} if late!)", inline=False)
-        if reason:
-            notif.add_field(name="Reason", value=reason, inline=False)
-        if forward_to:
-            notif.add_field(name="📸 Image Forward", value=f"⚠️ Your proof will be sent to {forward_to.display_name}", inline=False)
-        notif.set_footer(text=f"Submit proof with: /punishment_complete {assignment_id} proof:<image>")
-        await submissive.send(embed=notif)
-        print(f"[DM] Sent punishment notification to {submissive.display_name}")
-    except discord.Forbidden:
-        print(f"[DM] User {submissive.display_name} has DMs disabled")
-    except Exception as e:
-        print(f"[DM] Failed to send DM to {submissive.display_name}: {e}")
+        run_in_background(post_to_channel(interaction.guild, config.PUNISHMENT_CHANNEL_NAME, embed))
+    await interaction.followup.send(embed=embed)
 
 @bot.tree.command(name="punishment_complete", description="Submit proof of punishment completion")
 @app_commands.describe(
@@ -1734,8 +1925,8 @@ async def punishment_assign(
 )
 async def punishment_complete(interaction: discord.Interaction, assignment_id: int, proof: discord.Attachment):
     """Submit proof of punishment completion."""
-    user = await db.get_user(interaction.user.id)
-    if not user or user['role'] != 'submissive':
+    role = await db.get_role(interaction.user.id)
+    if role != 'submissive':
         await interaction.response.send_message(
             "❌ Only submissives can complete punishments!",
             ephemeral=True
@@ -1750,25 +1941,17 @@ async def punishment_complete(interaction: discord.Interaction, assignment_id: i
         )
         return
     
-    # Submit proof
-    await db.submit_punishment_proof(assignment_id, proof.url)
-    
-    # Get punishment details
-    import aiosqlite
-    async with aiosqlite.connect(db.DATABASE_NAME) as database:
-        database.row_factory = aiosqlite.Row
-        async with database.execute("""
-            SELECT p.id, p.title, ap.forward_to_user_id
-            FROM assigned_rewards_punishments ap
-            JOIN punishments p ON ap.item_id = p.id
-            WHERE ap.id = ? AND ap.type = 'punishment'
-        """, (assignment_id,)) as cursor:
-            row = await cursor.fetchone()
-            punishment_id = row[0] if row else 0
-            punishment_title = row[1] if row else "Unknown"
-            forward_user_id = row[2] if row else None
-    
-    has_forward = forward_user_id is not None
+    # Submit proof; the update hands back the punishment details
+    details = await db.submit_punishment_proof(assignment_id, proof.url)
+    if not details:
+        await interaction.response.send_message(
+            "❌ Punishment assignment not found or already submitted!",
+            ephemeral=True
+        )
+        return
+    punishment_id = details['punishment_id']
+    punishment_title = details['title']
+    has_forward = details['forward_to_user_id'] is not None
     
     embed = discord.Embed(
         title="📤 Punishment Proof Submitted",
@@ -1782,41 +1965,40 @@ async def punishment_complete(interaction: discord.Interaction, assignment_id: i
     embed.set_image(url=proof.url)
     embed.set_footer(text="You'll be notified when reviewed")
     
-    await interaction.response.send_message(embed=embed)
+    # Reply while looking up the dominant to notify
+    _, dominant = await asyncio.gather(
+        interaction.response.send_message(embed=embed),
+        db.get_dominant(interaction.user.id)
+    )
     
-    # Notify dominant
-    dominant = await db.get_dominant(interaction.user.id)
+    # Notify dominant in the background
     if dominant:
-        try:
-            dom_user = await bot.fetch_user(dominant['user_id'])
-            notif = discord.Embed(
-                title="📥 Punishment Proof Submitted",
-                description=f"**{interaction.user.display_name}** submitted punishment proof.",
-                color=discord.Color.blue()
-            )
-            notif.add_field(name="Punishment", value=f"**{punishment_title}** (ID: {punishment_id})", inline=False)
-            notif.add_field(name="Assignment ID", value=str(assignment_id), inline=True)
-            if has_forward:
-                notif.add_field(name="📸 Forward Pending", value="Will be sent after approval", inline=True)
-            notif.set_image(url=proof.url)
-            notif.set_footer(text=f"Use /punishment_approve assignment:{assignment_id} or /punishment_reject assignment:{assignment_id}")
-            await dom_user.send(embed=notif)
-        except:
-            pass
+        async def notify_dominant():
+            try:
+                dom_user = await get_or_fetch_user(dominant['user_id'], interaction.guild)
+                notif = discord.Embed(
+                    title="📥 Punishment Proof Submitted",
+                    description=f"**{interaction.user.display_name}** submitted punishment proof.",
+                    color=discord.Color.blue()
+                )
+                notif.add_field(name="Punishment", value=f"**{punishment_title}** (ID: {punishment_id})", inline=False)
+                notif.add_field(name="Assignment ID", value=str(assignment_id), inline=True)
+                if has_forward:
+                    notif.add_field(name="📸 Forward Pending", value="Will be sent after approval", inline=True)
+                notif.set_image(url=proof.url)
+                notif.set_footer(text=f"Use /punishment_approve assignment:{assignment_id} or /punishment_reject assignment:{assignment_id}")
+                await send_dm(dom_user, embed=notif)
+            except discord.HTTPException:
+                pass
+        
+        run_in_background(notify_dominant())
 
 @bot.tree.command(name="punishment_approve", description="Approve a punishment completion")
 @app_commands.describe(assignment="The punishment (select from dropdown or enter assignment ID)")
 @app_commands.autocomplete(assignment=pending_punishment_assignment_autocomplete)
+@require_role('dominant', "❌ Only dominants can approve punishments!")
 async def punishment_approve(interaction: discord.Interaction, assignment: str):
     """Approve punishment completion (dominant only)."""
-    user = await db.get_user(interaction.user.id)
-    if not user or user['role'] != 'dominant':
-        await interaction.response.send_message(
-            "❌ Only dominants can approve punishments!",
-            ephemeral=True
-        )
-        return
-    
     # Convert assignment string to int (works for both autocomplete selection and manual ID entry)
     try:
         assignment_id = int(assignment)
@@ -1827,7 +2009,7 @@ async def punishment_approve(interaction: discord.Interaction, assignment: str):
         )
         return
     
-    refund_penalty = await db.approve_punishment_completion(assignment_id, interaction.user.id, True)
+    refund_penalty = await db.approve_punishment_with_refund(assignment_id, interaction.user.id)
     if refund_penalty is None:
         await interaction.response.send_message(
             "❌ Punishment not found or already reviewed!",
@@ -1835,90 +2017,80 @@ async def punishment_approve(interaction: discord.Interaction, assignment: str):
         )
         return
     
-    # Get assignment details including forward user, proof URL, and punishment title
-    import aiosqlite
-    async with aiosqlite.connect(db.DATABASE_NAME) as database:
-        database.row_factory = aiosqlite.Row
-        async with database.execute("""
-            SELECT ap.submissive_id, ap.point_penalty, ap.forward_to_user_id, ap.proof_url, p.id, p.title
-            FROM assigned_rewards_punishments ap
-            JOIN punishments p ON ap.item_id = p.id
-            WHERE ap.id = ? AND ap.type = 'punishment'
-        """, (assignment_id,)
-        ) as cursor:
-            row = await cursor.fetchone()
-            if row:
-                submissive_id = row[0]
-                penalty = row[1]
-                forward_user_id = row[2]
-                proof_url = row[3]
-                punishment_id = row[4]
-                punishment_title = row[5]
-                
-                # Forward image to designated user if specified (ONLY on approval)
-                forwarded = False
-                if forward_user_id and proof_url:
-                    try:
-                        forward_user = await bot.fetch_user(forward_user_id)
-                        sub_user_obj = await bot.fetch_user(submissive_id)
-                        forward_embed = discord.Embed(
-                            title="📸 Punishment Proof Received",
-                            description=f"**{sub_user_obj.display_name}** completed a punishment and it was approved.",
-                            color=discord.Color.purple()
-                        )
-                        forward_embed.add_field(name="Submissive", value=f"{sub_user_obj.display_name}", inline=True)
-                        forward_embed.set_image(url=proof_url)
-                        forward_embed.set_footer(text=f"Assignment ID: {assignment_id}")
-                        await forward_user.send(embed=forward_embed)
-                        forwarded = True
-                    except:
-                        pass
-                
-                # If it was late, refund the penalty
-                if refund_penalty > 0:
-                    new_total = await db.update_points(submissive_id, refund_penalty)
-                    desc = f"Punishment #{assignment_id} approved.\n✨ **Late penalty refunded!**"
-                else:
-                    new_total = await db.get_user(submissive_id)
-                    new_total = new_total['points'] if new_total else 0
-                    desc = f"Punishment #{assignment_id} approved."
-                
-                if forwarded:
-                    desc += "\n📸 **Image forwarded to designated user**"
-                
-                embed = discord.Embed(
-                    title="✅ Punishment Approved",
-                    description=desc,
-                    color=discord.Color.green()
-                )
-                embed.add_field(name="Punishment", value=f"**{punishment_title}** (ID: {punishment_id})", inline=False)
-                if refund_penalty > 0:
-                    embed.add_field(name="Refunded", value=f"+{refund_penalty} points", inline=True)
-                if forwarded:
-                    embed.add_field(name="Forwarded", value="✅ Image sent", inline=True)
-                
-                await interaction.response.send_message(embed=embed)
-                
-                # Notify submissive
-                try:
-                    sub_user = await bot.fetch_user(submissive_id)
-                    notif_desc = f"Your punishment completion was approved!"
-                    if refund_penalty > 0:
-                        notif_desc += f"\n🎉 **Penalty refunded: +{refund_penalty} points!**"
-                    if forwarded:
-                        notif_desc += f"\n📸 **Your proof was forwarded**"
-                    
-                    notif = discord.Embed(
-                        title="✅ Punishment Approved",
-                        description=notif_desc,
-                        color=discord.Color.green()
-                    )
-                    notif.add_field(name="Punishment", value=f"**{punishment_title}** (ID: {punishment_id})", inline=False)
-                    notif.add_field(name="Assignment ID", value=str(assignment_id), inline=True)
-                    notif.add_field(name="Total Points", value=str(new_total), inline=True)
-                    await sub_user.send(embed=notif)
-                except:
-                    pass
+    # Get assignment details including forward user, proof URL, punishment title and current balance
+    details = await db.get_punishment_assignment_details(assignment_id)
+    if not details:
+        return
+    submissive_id = details['submissive_id']
+    forward_user_id = details['forward_to_user_id']
+    proof_url = details['proof_url']
+    punishment_id = details['punishment_id']
+    punishment_title = details['title']
+    
+    # Forward image to designated user if specified (ONLY on approval)
+    forwarded = False
+    if forward_user_id and proof_url:
+        try:
+            forward_user, sub_user_obj = await asyncio.gather(
+                get_or_fetch_user(forward_user_id, interaction.guild),
+                get_or_fetch_user(submissive_id, interaction.guild)
+            )
+            forward_embed = discord.Embed(
+                title="📸 Punishment Proof Received",
+                description=f"**{sub_user_obj.display_name}** completed a punishment and it was approved.",
+                color=discord.Color.purple()
+            )
+            forward_embed.add_field(name="Submissive", value=f"{sub_user_obj.display_name}", inline=True)
+            forward_embed.set_image(url=proof_url)
+            forward_embed.set_footer(text=f"Assignment ID: {assignment_id}")
+            await forward_user.send(embed=forward_embed)
+            forwarded = True
+        except discord.HTTPException:
+            pass
+    
+    # Any late penalty was refunded with the approval, so the balance is already current
+    new_total = details['submissive_points']
+    if refund_penalty > 0:
+        desc = f"Punishment #{assignment_id} approved.\n✨ **Late penalty refunded!**"
+    else:
+        desc = f"Punishment #{assignment_id} approved."
+    
+    if forwarded:
+        desc += "\n📸 **Image forwarded to designated user**"
+    desc += f"\n\n**Punishment:** **{punishment_title}** (ID: {punishment_id})"
+    if refund_penalty > 0:
+        desc += f"\n**Refunded:** +{refund_penalty} points"
+    
+    embed = discord.Embed(
+        title="✅ Punishment Approved",
+        description=desc,
+        color=discord.Color.green()
+    )
+    
+    # Notify submissive in the background
+    async def notify_submissive():
+        try:
+            notif_desc = f"Your punishment completion was approved!"
+            if refund_penalty > 0:
+                notif_desc += f"\n🎉 **Penalty refunded: +{refund_penalty} points!**"
+            if forwarded:
+                notif_desc += f"\n📸 **Your proof was forwarded**"
+            notif_desc += (
+                f"\n\n**Punishment:** **{punishment_title}** (ID: {punishment_id})"
+                f"\n**Assignment ID:** {assignment_id} | **Total Points:** {new_total}"
+            )
+            
+            notif = discord.Embed(
+                title="✅ Punishment Approved",
+                description=notif_desc,
+                color=discord.Color.green()
+            )
+            await dm_user(submissive_id, notif)
+        except discord.HTTPException:
+            pass
+    
+    run_in_background(notify_submissive())
+    await interaction.response.send_message(embed=embed)
 
 @bot.tree.command(name="punishment_reject", description="Reject a punishment completion")
 @app_commands.describe(
@@ -1926,16 +2098,9 @@ async def punishment_approve(interaction: discord.Interaction, assignment: str):
     reason="Reason for rejection"
 )
 @app_commands.autocomplete(assignment=pending_punishment_assignment_autocomplete)
+@require_role('dominant', "❌ Only dominants can reject punishments!")
 async def punishment_reject(interaction: discord.Interaction, assignment: str, reason: str = None):
     """Reject punishment completion (dominant only)."""
-    user = await db.get_user(interaction.user.id)
-    if not user or user['role'] != 'dominant':
-        await interaction.response.send_message(
-            "❌ Only dominants can reject punishments!",
-            ephemeral=True
-        )
-        return
-    
     # Convert assignment string to int (works for both autocomplete selection and manual ID entry)
     try:
         assignment_id = int(assignment)
@@ -1965,37 +2130,27 @@ async def punishment_reject(interaction: discord.Interaction, assignment: str, r
     await interaction.response.send_message(embed=embed)
     
     # Notify submissive
-    import aiosqlite
-    async with aiosqlite.connect(db.DATABASE_NAME) as database:
-        database.row_factory = aiosqlite.Row
-        async with database.execute("""
-            SELECT ap.submissive_id, p.id, p.title
-            FROM assigned_rewards_punishments ap
-            JOIN punishments p ON ap.item_id = p.id
-            WHERE ap.id = ? AND ap.type = 'punishment'
-        """, (assignment_id,)
-        ) as cursor:
-            row = await cursor.fetchone()
-            if row:
-                submissive_id = row[0]
-                punishment_id = row[1]
-                punishment_title = row[2]
-                
-                try:
-                    sub_user = await bot.fetch_user(submissive_id)
-                    notif = discord.Embed(
-                        title="❌ Punishment Rejected",
-                        description="Your punishment proof was rejected. You must resubmit.",
-                        color=discord.Color.red()
-                    )
-                    notif.add_field(name="Punishment", value=f"**{punishment_title}** (ID: {punishment_id})", inline=False)
-                    notif.add_field(name="Assignment ID", value=str(assignment_id), inline=True)
-                    if reason:
-                        notif.add_field(name="Reason", value=reason, inline=False)
-                    notif.set_footer(text=f"Resubmit with: /punishment_complete {assignment_id} proof:<image>")
-                    await sub_user.send(embed=notif)
-                except:
-                    pass
+    details = await db.get_punishment_assignment_details(assignment_id)
+    if not details:
+        return
+    submissive_id = details['submissive_id']
+    punishment_id = details['punishment_id']
+    punishment_title = details['title']
+    
+    try:
+        notif = discord.Embed(
+            title="❌ Punishment Rejected",
+            description="Your punishment proof was rejected. You must resubmit.",
+            color=discord.Color.red()
+        )
+        notif.add_field(name="Punishment", value=f"**{punishment_title}** (ID: {punishment_id})", inline=False)
+        notif.add_field(name="Assignment ID", value=str(assignment_id), inline=True)
+        if reason:
+            notif.add_field(name="Reason", value=reason, inline=False)
+        notif.set_footer(text=f"Resubmit with: /punishment_complete {assignment_id} proof:<image>")
+        await dm_user(submissive_id, notif)
+    except discord.HTTPException:
+        pass
 
 @bot.tree.command(name="punishment_cancel", description="Cancel a punishment and refund points if deducted")
 @app_commands.describe(
@@ -2004,8 +2159,8 @@ async def punishment_reject(interaction: discord.Interaction, assignment: str, r
 )
 async def punishment_cancel(interaction: discord.Interaction, assignment_id: int, reason: str = None):
     """Cancel punishment and refund points if already deducted (dominant only)."""
-    user = await db.get_user(interaction.user.id)
-    if not user or user['role'] != 'dominant':
+    role = await db.get_role(interaction.user.id)
+    if role != 'dominant':
         await interaction.response.send_message(
             "❌ Only dominants can cancel punishments!",
             ephemeral=True
@@ -2034,25 +2189,22 @@ async def punishment_cancel(interaction: discord.Interaction, assignment_id: int
     if reason:
         embed.add_field(name="Reason", value=reason, inline=False)
     
-    await interaction.response.send_message(embed=embed)
-    
     # Notify submissive
-    try:
-        sub_user = await bot.fetch_user(result['submissive_id'])
-        notif_desc = "Your punishment has been cancelled by your dominant.\n✅ **No resubmission needed.**"
-        if result['refund_penalty'] > 0:
-            notif_desc += f"\n💚 **+{result['refund_penalty']} points refunded!**"
-        
-        notif = discord.Embed(
-            title="❌ Punishment Cancelled",
-            description=notif_desc,
-            color=discord.Color.green() if result['refund_penalty'] > 0 else discord.Color.orange()
-        )
-        if reason:
-            notif.add_field(name="Reason", value=reason, inline=False)
-        await sub_user.send(embed=notif)
-    except:
-        pass
+    notif_desc = "Your punishment has been cancelled by your dominant.\n✅ **No resubmission needed.**"
+    if result['refund_penalty'] > 0:
+        notif_desc += f"\n💚 **+{result['refund_penalty']} points refunded!**"
+    
+    notif = discord.Embed(
+        title="❌ Punishment Cancelled",
+        description=notif_desc,
+        color=discord.Color.green() if result['refund_penalty'] > 0 else discord.Color.orange()
+    )
+    if reason:
+        notif.add_field(name="Reason", value=reason, inline=False)
+    
+    # Reply first; the DM goes out in the background
+    await interaction.response.send_message(embed=embed)
+    run_in_background(dm_user(result['submissive_id'], notif))
 
 @bot.tree.command(name="punishment_remind", description="Send a reminder to submissive about active punishment")
 @app_commands.describe(
@@ -2060,8 +2212,8 @@ async def punishment_cancel(interaction: discord.Interaction, assignment_id: int
 )
 async def punishment_remind(interaction: discord.Interaction, assignment_id: int):
     """Send a reminder DM to submissive about their punishment (dominant only)."""
-    user = await db.get_user(interaction.user.id)
-    if not user or user['role'] != 'dominant':
+    role = await db.get_role(interaction.user.id)
+    if role != 'dominant':
         await interaction.response.send_message(
             "❌ Only dominants can send reminders!",
             ephemeral=True
@@ -2069,30 +2221,17 @@ async def punishment_remind(interaction: discord.Interaction, assignment_id: int
         return
     
     # Get punishment assignment details
-    import aiosqlite
-    async with aiosqlite.connect(db.DATABASE_NAME) as database:
-        database.row_factory = aiosqlite.Row
-        async with database.execute("""
-            SELECT ap.*, p.title, p.description
-            FROM assigned_rewards_punishments ap
-            JOIN punishments p ON ap.item_id = p.id
-            WHERE ap.id = ? AND ap.type = 'punishment' AND ap.dominant_id = ? AND ap.completion_status = 'pending'
-        """, (assignment_id, interaction.user.id)) as cursor:
-            row = await cursor.fetchone()
-            if not row:
-                await interaction.response.send_message(
-                    "❌ Punishment assignment not found, already completed, or you don't own it!",
-                    ephemeral=True
-                )
-                return
-            
-            assignment = dict(row)
+    assignment = await db.get_pending_punishment_assignment(assignment_id, interaction.user.id)
+    if not assignment:
+        await interaction.response.send_message(
+            "❌ Punishment assignment not found, already completed, or you don't own it!",
+            ephemeral=True
+        )
+        return
     
     # Send reminder to submissive
     try:
-        sub_user = await bot.fetch_user(assignment['submissive_id'])
-        
-        deadline_ts = int(datetime.datetime.fromisoformat(assignment['deadline']).timestamp()) if assignment['deadline'] else 0
+        deadline_ts = assignment['deadline_ts'] or 0
         
         reminder = discord.Embed(
             title="⏰ Punishment Reminder",
@@ -2107,7 +2246,7 @@ async def punishment_remind(interaction: discord.Interaction, assignment_id: int
             reminder.add_field(name="Reason", value=assignment['reason'], inline=False)
         reminder.set_footer(text=f"Submit proof with: /punishment_complete {assignment_id} proof:<image>")
         
-        await sub_user.send(embed=reminder)
+        await dm_user(assignment['submissive_id'], reminder)
         
         # Confirm to dominant
         await interaction.response.send_message(
@@ -2128,8 +2267,8 @@ async def punishment_remind(interaction: discord.Interaction, assignment_id: int
 @bot.tree.command(name="punishment_pending", description="View pending punishment submissions awaiting review")
 async def punishment_pending(interaction: discord.Interaction):
     """View pending punishment submissions (dominant only)."""
-    user = await db.get_user(interaction.user.id)
-    if not user or user['role'] != 'dominant':
+    role = await db.get_role(interaction.user.id)
+    if role != 'dominant':
         await interaction.response.send_message(
             "❌ Only dominants can view pending punishments!",
             ephemeral=True
@@ -2169,8 +2308,8 @@ async def punishment_pending(interaction: discord.Interaction):
 @bot.tree.command(name="punishments_active", description="View your active punishments")
 async def punishments_active(interaction: discord.Interaction):
     """View active punishments (submissive only)."""
-    user = await db.get_user(interaction.user.id)
-    if not user or user['role'] != 'submissive':
+    role = await db.get_role(interaction.user.id)
+    if role != 'submissive':
         await interaction.response.send_message(
             "❌ Only submissives can view active punishments!",
             ephemeral=True
@@ -2186,14 +2325,19 @@ async def punishments_active(interaction: discord.Interaction):
         )
         return
     
+    total = active_list[0]['total_count']
+    description = f"{total} punishment(s) pending"
+    if total > len(active_list):
+        description += f" (showing the {len(active_list)} due soonest)"
+    
     embed = discord.Embed(
         title="⚠️ Your Active Punishments",
-        description=f"{len(active_list)} punishment(s) pending",
+        description=description,
         color=discord.Color.red()
     )
     
-    for item in active_list[:10]:
-        deadline_ts = int(datetime.datetime.fromisoformat(item['deadline']).timestamp()) if item['deadline'] else 0
+    for item in active_list:
+        deadline_ts = item['deadline_ts'] or 0
         value = f"**{item['title']}**\n{item['description']}\n**Penalty:** -{item['point_penalty']} points (doubles if late!)\n**Deadline:** <t:{deadline_ts}:R>"
         embed.add_field(
             name=f"Assignment ID: {item['id']}",
@@ -2213,8 +2357,8 @@ async def punishments_active(interaction: discord.Interaction):
 )
 async def task_link_punishment(interaction: discord.Interaction, task_id: int, punishment_id: int):
     """Link punishment to task (dominant only)."""
-    user = await db.get_user(interaction.user.id)
-    if not user or user['role'] != 'dominant':
+    role = await db.get_role(interaction.user.id)
+    if role != 'dominant':
         await interaction.response.send_message(
             "❌ Only dominants can link punishments!",
             ephemeral=True
@@ -2223,12 +2367,12 @@ async def task_link_punishment(interaction: discord.Interaction, task_id: int, p
     
     success = await db.link_task_punishment(task_id, punishment_id, interaction.user.id)
     if success:
-        embed = discord.Embed(
-            title="🔗 Punishment Linked to Task",
-            description=f"Punishment #{punishment_id} will be auto-assigned if Task #{task_id} deadline is missed.",
-            color=discord.Color.blue()
+        await send_result(
+            interaction,
+            "🔗 Punishment Linked to Task",
+            f"Punishment #{punishment_id} will be auto-assigned if Task #{task_id} deadline is missed.",
+            discord.Color.blue()
         )
-        await interaction.response.send_message(embed=embed)
     else:
         await interaction.response.send_message(
             "❌ Task or punishment not found, or you don't own them!",
@@ -2248,8 +2392,8 @@ async def threshold_create(
     submissive: discord.Member = None
 ):
     """Create point threshold trigger (dominant only)."""
-    user = await db.get_user(interaction.user.id)
-    if not user or user['role'] != 'dominant':
+    role = await db.get_role(interaction.user.id)
+    if role != 'dominant':
         await interaction.response.send_message(
             "❌ Only dominants can create thresholds!",
             ephemeral=True
@@ -2277,8 +2421,8 @@ async def threshold_create(
 @bot.tree.command(name="thresholds", description="View your point thresholds")
 async def thresholds(interaction: discord.Interaction):
     """View point thresholds (dominant only)."""
-    user = await db.get_user(interaction.user.id)
-    if not user or user['role'] != 'dominant':
+    role = await db.get_role(interaction.user.id)
+    if role != 'dominant':
         await interaction.response.send_message(
             "❌ Only dominants can view thresholds!",
             ephemeral=True
@@ -2315,8 +2459,8 @@ async def thresholds(interaction: discord.Interaction):
 @app_commands.describe(threshold_id="The threshold ID to delete")
 async def threshold_delete(interaction: discord.Interaction, threshold_id: int):
     """Delete point threshold (dominant only)."""
-    user = await db.get_user(interaction.user.id)
-    if not user or user['role'] != 'dominant':
+    role = await db.get_role(interaction.user.id)
+    if role != 'dominant':
         await interaction.response.send_message(
             "❌ Only dominants can delete thresholds!",
             ephemeral=True
@@ -2351,8 +2495,9 @@ async def punishment_assign_random(
     forward_to: discord.Member = None
 ):
     """Assign random punishment (dominant only)."""
-    user = await db.get_user(interaction.user.id)
-    if not user or user['role'] != 'dominant':
+    user_id = interaction.user.id
+    role = await db.get_role(user_id)
+    if role != 'dominant':
         await interaction.response.send_message(
             "❌ Only dominants can assign punishments!",
             ephemeral=True
@@ -2360,7 +2505,7 @@ async def punishment_assign_random(
         return
     
     # Get random punishment
-    punishment = await db.get_random_punishment(interaction.user.id)
+    punishment = await db.get_random_punishment(user_id)
     if not punishment:
         await interaction.response.send_message(
             "❌ No punishments available! Create some first with /punishment_create",
@@ -2370,21 +2515,20 @@ async def punishment_assign_random(
     
     # Calculate deadline - prioritize specific datetime over hours
     if deadline_datetime:
-        try:
-            deadline = datetime.datetime.strptime(deadline_datetime, "%Y-%m-%d %H:%M")
-        except ValueError:
+        deadline = parse_deadline(deadline_datetime)
+        if deadline is None:
             await interaction.response.send_message(
                 "❌ Invalid datetime format! Use: YYYY-MM-DD HH:MM (e.g., 2026-02-05 15:30)",
                 ephemeral=True
             )
             return
     else:
-        deadline = datetime.datetime.now() + datetime.timedelta(hours=deadline_hours)
+        deadline = datetime.datetime.now() + ONE_HOUR * deadline_hours
     
     forward_to_id = forward_to.id if forward_to else None
     assignment_id = await db.assign_punishment(
         submissive.id,
-        interaction.user.id,
+        user_id,
         punishment['id'],
         reason or "Random punishment",
         deadline,
@@ -2406,28 +2550,26 @@ async def punishment_assign_random(
     if forward_to:
         embed.add_field(name="📸 Image Forward", value=f"Proof will be sent to {forward_to.mention}", inline=False)
     
-    await interaction.response.send_message(embed=embed)
-    
     # Notify submissive
-    try:
-        notif = discord.Embed(
-            title="🎲 Random Punishment Assigned",
-            description=f"**{interaction.user.display_name}** rolled the dice and assigned you a punishment!",
-            color=discord.Color.purple()
-        )
-        notif.add_field(name="Punishment", value=punishment['title'], inline=False)
-        notif.add_field(name="Description", value=punishment['description'], inline=False)
-        notif.add_field(name="Assignment ID", value=str(assignment_id), inline=True)
-        notif.add_field(name="Deadline", value=f"<t:{int(deadline.timestamp())}:R>", inline=True)
-        notif.add_field(name="Point Penalty", value=f"-{point_penalty} points (doubles to -{point_penalty * 2} if late!)", inline=False)
-        if reason:
-            notif.add_field(name="Reason", value=reason, inline=False)
-        if forward_to:
-            notif.add_field(name="📸 Image Forward", value=f"⚠️ Your proof will be sent to {forward_to.display_name}", inline=False)
-        notif.set_footer(text=f"Submit proof with: /punishment_complete {assignment_id} proof:<image>")
-        await submissive.send(embed=notif)
-    except:
-        pass
+    notif = discord.Embed(
+        title="🎲 Random Punishment Assigned",
+        description=f"**{interaction.user.display_name}** rolled the dice and assigned you a punishment!",
+        color=discord.Color.purple()
+    )
+    notif.add_field(name="Punishment", value=punishment['title'], inline=False)
+    notif.add_field(name="Description", value=punishment['description'], inline=False)
+    notif.add_field(name="Assignment ID", value=str(assignment_id), inline=True)
+    notif.add_field(name="Deadline", value=f"<t:{int(deadline.timestamp())}:R>", inline=True)
+    notif.add_field(name="Point Penalty", value=f"-{point_penalty} points (doubles to -{point_penalty * 2} if late!)", inline=False)
+    if reason:
+        notif.add_field(name="Reason", value=reason, inline=False)
+    if forward_to:
+        notif.add_field(name="📸 Image Forward", value=f"⚠️ Your proof will be sent to {forward_to.display_name}", inline=False)
+    notif.set_footer(text=f"Submit proof with: /punishment_complete {assignment_id} proof:<image>")
+    
+    # Reply first; the DM goes out in the background
+    await interaction.response.send_message(embed=embed)
+    run_in_background(send_dm(submissive, embed=notif))
 
 # ============ APPROVAL COMMANDS ============
 
@@ -2436,8 +2578,8 @@ async def punishment_assign_random(
 @app_commands.autocomplete(completion=pending_task_completion_autocomplete)
 async def approve(interaction: discord.Interaction, completion: str):
     """Approve a task completion (dominant only)."""
-    user = await db.get_user(interaction.user.id)
-    if not user or user['role'] != 'dominant':
+    role = await db.get_role(interaction.user.id)
+    if role != 'dominant':
         await interaction.response.send_message(
             "❌ Only dominants can approve task completions!",
             ephemeral=True
@@ -2454,97 +2596,72 @@ async def approve(interaction: discord.Interaction, completion: str):
         )
         return
     
-    points = await db.approve_task_completion(completion_id, interaction.user.id, True)
-    if points is None:
+    # Approve and award points (double if it was late to refund the deduction) in one transaction
+    details = await db.approve_and_settle(completion_id, interaction.user.id)
+    if details is None:
         await interaction.response.send_message(
             "❌ Completion not found or already reviewed!",
             ephemeral=True
         )
         return
+    points = details['points']
+    submissive_id = details['submissive_id']
+    task_id = details['task_id']
+    was_late = details['active'] == 0  # Task was deactivated due to missed deadline
+    task_title = details['title']
+    points_to_award = details['points_awarded']
+    new_total = details['new_total']
+    old_points = details['old_points']
     
-    # Get completion details to notify submissive and check if task was late
-    import aiosqlite
-    async with aiosqlite.connect(db.DATABASE_NAME) as database:
-        database.row_factory = aiosqlite.Row
-        async with database.execute("""
-            SELECT tc.submissive_id, tc.task_id, t.deadline, t.active, t.title
-            FROM task_completions tc
-            JOIN tasks t ON tc.task_id = t.id
-            WHERE tc.id = ?
-        """, (completion_id,)) as cursor:
-            row = await cursor.fetchone()
-            if row:
-                submissive_id = row[0]
-                task_id = row[1]
-                deadline = row[2]
-                was_late = row[3] == 0  # Task was deactivated due to missed deadline
-                task_title = row[4]
-                
-                # Award points (double if it was late to refund the deduction)
-                points_to_award = points * 2 if was_late else points
-                
-                # Get current user data to calculate old points
-                user_data = await db.get_user(submissive_id)
-                old_points = user_data['points'] if user_data else 0
-                
-                # Update points
-                new_total = await db.update_points(submissive_id, points_to_award)
-                
-                description = f"Task completion #{completion_id} has been approved."
-                if was_late:
-                    description += "\n⚠️ **Late submission - Points refunded!**"
-                
-                embed = discord.Embed(
-                    title="✅ Task Approved!",
-                    description=description,
-                    color=discord.Color.green()
-                )
-                embed.add_field(name="Task", value=f"**{task_title}** (ID: {task_id})", inline=False)
-                embed.add_field(name="Points Awarded", value=str(points_to_award), inline=True)
-                embed.add_field(name="Completion ID", value=str(completion_id), inline=True)
-                if was_late:
-                    embed.add_field(name="Note", value=f"Refunded {points} deducted points + {points} task points", inline=False)
-                
-                await interaction.response.send_message(embed=embed)
-                
-                # Post to approval channel if configured
-                if config.APPROVAL_CHANNEL_NAME and interaction.guild:
-                    await post_to_channel(interaction.guild, config.APPROVAL_CHANNEL_NAME, embed)
-                
-                # Check for newly affordable rewards
-                affordable_rewards = await db.get_affordable_rewards(submissive_id, new_total)
-                newly_affordable = [r for r in affordable_rewards if r['point_cost'] > old_points]
-                
-                # Notify submissive
-                try:
-                    sub_user = await bot.fetch_user(submissive_id)
-                    notif_desc = f"Your task completion has been approved by {interaction.user.display_name}!"
-                    if was_late:
-                        notif_desc += "\n🎉 **Late penalty refunded!**"
-                    
-                    notif = discord.Embed(
-                        title="🎉 Task Approved!",
-                        description=notif_desc,
-                        color=discord.Color.green()
-                    )
-                    notif.add_field(name="Task", value=f"**{task_title}** (ID: {task_id})", inline=False)
-                    notif.add_field(name="Points Earned", value=str(points_to_award), inline=True)
-                    notif.add_field(name="Total Points", value=str(new_total), inline=True)
-                    
-                    # Add newly affordable rewards notification (show the most expensive newly unlocked)
-                    if newly_affordable:
-                        # Sort by cost descending and show the highest newly unlocked reward
-                        most_valuable = sorted(newly_affordable, key=lambda r: r['point_cost'], reverse=True)[0]
-                        notif.add_field(
-                            name="🎉 New Reward Unlocked!",
-                            value=f"✨ **{most_valuable['title']}**\n{most_valuable['description']}\n💰 **Cost:** {most_valuable['point_cost']} points",
-                            inline=False
-                        )
-                        notif.set_footer(text="You've reached a new reward threshold!")
-                    
-                    await sub_user.send(embed=notif)
-                except:
-                    pass
+    description = f"Task completion #{completion_id} has been approved."
+    if was_late:
+        description += "\n⚠️ **Late submission - Points refunded!**"
+    
+    embed = discord.Embed(
+        title="✅ Task Approved!",
+        description=description,
+        color=discord.Color.green()
+    )
+    embed.add_field(name="Task", value=f"**{task_title}** (ID: {task_id})", inline=False)
+    embed.add_field(name="Points Awarded", value=str(points_to_award), inline=True)
+    embed.add_field(name="Completion ID", value=str(completion_id), inline=True)
+    if was_late:
+        embed.add_field(name="Note", value=f"Refunded {points} deducted points + {points} task points", inline=False)
+    
+    # Post to approval channel if configured
+    if config.APPROVAL_CHANNEL_NAME and interaction.guild:
+        queue_channel_post(interaction.guild, config.APPROVAL_CHANNEL_NAME, embed)
+    
+    # Reply while checking for the most valuable reward the new points unlocked
+    _, most_valuable = await asyncio.gather(
+        interaction.response.send_message(embed=embed),
+        db.get_newly_affordable_reward(submissive_id, old_points, new_total)
+    )
+    
+    # Notify submissive in the background
+    notif_desc = f"Your task completion has been approved by {interaction.user.display_name}!"
+    if was_late:
+        notif_desc += "\n🎉 **Late penalty refunded!**"
+    
+    notif = discord.Embed(
+        title="🎉 Task Approved!",
+        description=notif_desc,
+        color=discord.Color.green()
+    )
+    notif.add_field(name="Task", value=f"**{task_title}** (ID: {task_id})", inline=False)
+    notif.add_field(name="Points Earned", value=str(points_to_award), inline=True)
+    notif.add_field(name="Total Points", value=str(new_total), inline=True)
+    
+    # Add newly affordable rewards notification (show the most expensive newly unlocked)
+    if most_valuable:
+        notif.add_field(
+            name="🎉 New Reward Unlocked!",
+            value=f"✨ **{most_valuable['title']}**\n{most_valuable['description']}\n💰 **Cost:** {most_valuable['point_cost']} points",
+            inline=False
+        )
+        notif.set_footer(text="You've reached a new reward threshold!")
+    
+    run_in_background(dm_user(submissive_id, notif))
 
 @bot.tree.command(name="reject", description="Reject a pending task completion (deadline stays the same)")
 @app_commands.describe(
@@ -2554,8 +2671,8 @@ async def approve(interaction: discord.Interaction, completion: str):
 @app_commands.autocomplete(completion=pending_task_completion_autocomplete)
 async def reject(interaction: discord.Interaction, completion: str, reason: str = None):
     """Reject a task completion - deadline remains the same (dominant only)."""
-    user = await db.get_user(interaction.user.id)
-    if not user or user['role'] != 'dominant':
+    role = await db.get_role(interaction.user.id)
+    if role != 'dominant':
         await interaction.response.send_message(
             "❌ Only dominants can reject task completions!",
             ephemeral=True
@@ -2572,63 +2689,46 @@ async def reject(interaction: discord.Interaction, completion: str, reason: str
         )
         return
     
-    points = await db.approve_task_completion(completion_id, interaction.user.id, False)
-    if points is None:
+    details = await db.approve_task_completion(completion_id, interaction.user.id, False)
+    if details is None:
         await interaction.response.send_message(
             "❌ Completion not found or already reviewed!",
             ephemeral=True
         )
         return
+    submissive_id = details['submissive_id']
+    task_id = details['task_id']
+    task_title = details['title']
     
-    # Get completion details to notify submissive
-    import aiosqlite
-    async with aiosqlite.connect(db.DATABASE_NAME) as database:
-        database.row_factory = aiosqlite.Row
-        async with database.execute("""
-            SELECT tc.submissive_id, tc.task_id, t.title
-            FROM task_completions tc
-            JOIN tasks t ON tc.task_id = t.id
-            WHERE tc.id = ?
-        """, (completion_id,)
-        ) as cursor:
-            row = await cursor.fetchone()
-            if row:
-                submissive_id = row[0]
-                task_id = row[1]
-                task_title = row[2]
-                
-                embed = discord.Embed(
-                    title="❌ Task Rejected",
-                    description=f"Task completion #{completion_id} has been rejected.\n⏰ **Deadline remains the same.**",
-                    color=discord.Color.red()
-                )
-                embed.add_field(name="Task", value=f"**{task_title}** (ID: {task_id})", inline=False)
-                embed.add_field(name="Completion ID", value=str(completion_id), inline=True)
-                if reason:
-                    embed.add_field(name="Reason", value=reason, inline=False)
-                
-                await interaction.response.send_message(embed=embed)
-                
-                # Post to approval channel if configured
-                if config.APPROVAL_CHANNEL_NAME and interaction.guild:
-                    await post_to_channel(interaction.guild, config.APPROVAL_CHANNEL_NAME, embed)
-                
-                # Notify submissive
-                try:
-                    sub_user = await bot.fetch_user(submissive_id)
-                    notif = discord.Embed(
-                        title="❌ Task Rejected",
-                        description=f"Your task completion was rejected by {interaction.user.display_name}.",
-                        color=discord.Color.red()
-                    )
-                    notif.add_field(name="Task", value=f"**{task_title}** (ID: {task_id})", inline=False)
-                    notif.add_field(name="Completion ID", value=str(completion_id), inline=True)
-                    if reason:
-                        notif.add_field(name="Reason", value=reason, inline=False)
-                    notif.set_footer(text="⏰ Deadline remains the same. Submit again!")
-                    await sub_user.send(embed=notif)
-                except:
-                    pass
+    embed = discord.Embed(
+        title="❌ Task Rejected",
+        description=f"Task completion #{completion_id} has been rejected.\n⏰ **Deadline remains the same.**",
+        color=discord.Color.red()
+    )
+    embed.add_field(name="Task", value=f"**{task_title}** (ID: {task_id})", inline=False)
+    embed.add_field(name="Completion ID", value=str(completion_id), inline=True)
+    if reason:
+        embed.add_field(name="Reason", value=reason, inline=False)
+    
+    # Notify submissive
+    notif = discord.Embed(
+        title="❌ Task Rejected",
+        description=f"Your task completion was rejected by {interaction.user.display_name}.",
+        color=discord.Color.red()
+    )
+    notif.add_field(name="Task", value=f"**{task_title}** (ID: {task_id})", inline=False)
+    notif.add_field(name="Completion ID", value=str(completion_id), inline=True)
+    if reason:
+        notif.add_field(name="Reason", value=reason, inline=False)
+    notif.set_footer(text="⏰ Deadline remains the same. Submit again!")
+    
+    # Post to approval channel if configured
+    if config.APPROVAL_CHANNEL_NAME and interaction.guild:
+        queue_channel_post(interaction.guild, config.APPROVAL_CHANNEL_NAME, embed)
+    
+    # Reply first; the DM goes out in the background
+    await interaction.response.send_message(embed=embed)
+    run_in_background(dm_user(submissive_id, notif))
 
 @bot.tree.command(name="reject_cancel", description="Reject task and reset deadline to next occurrence")
 @app_commands.describe(
@@ -2638,8 +2738,8 @@ async def reject(interaction: discord.Interaction, completion: str, reason: str
 @app_commands.autocomplete(completion=pending_task_completion_autocomplete)
 async def reject_cancel(interaction: discord.Interaction, completion: str, reason: str = None):
     """Reject task completion and reset deadline to next occurrence (dominant only)."""
-    user = await db.get_user(interaction.user.id)
-    if not user or user['role'] != 'dominant':
+    role = await db.get_role(interaction.user.id)
+    if role != 'dominant':
         await interaction.response.send_message(
             "❌ Only dominants can reject task completions!",
             ephemeral=True
@@ -2657,63 +2757,46 @@ async def reject_cancel(interaction: discord.Interaction, completion: str, reaso
         return
     
     # Reject and reset deadline
-    points = await db.approve_task_completion(completion_id, interaction.user.id, False, reset_deadline_on_reject=True)
-    if points is None:
+    details = await db.approve_task_completion(completion_id, interaction.user.id, False, reset_deadline_on_reject=True)
+    if details is None:
         await interaction.response.send_message(
             "❌ Completion not found or already reviewed!",
             ephemeral=True
         )
         return
+    submissive_id = details['submissive_id']
+    task_id = details['task_id']
+    task_title = details['title']
     
-    # Get completion details to notify submissive
-    import aiosqlite
-    async with aiosqlite.connect(db.DATABASE_NAME) as database:
-        database.row_factory = aiosqlite.Row
-        async with database.execute("""
-            SELECT tc.submissive_id, tc.task_id, t.title
-            FROM task_completions tc
-            JOIN tasks t ON tc.task_id = t.id
-            WHERE tc.id = ?
-        """, (completion_id,)
-        ) as cursor:
-            row = await cursor.fetchone()
-            if row:
-                submissive_id = row[0]
-                task_id = row[1]
-                task_title = row[2]
-                
-                embed = discord.Embed(
-                    title="❌ Task Rejected & Reset",
-                    description=f"Task completion #{completion_id} rejected.\n🔄 **Deadline reset to next occurrence.**",
-                    color=discord.Color.orange()
-                )
-                embed.add_field(name="Task", value=f"**{task_title}** (ID: {task_id})", inline=False)
-                embed.add_field(name="Completion ID", value=str(completion_id), inline=True)
-                if reason:
-                    embed.add_field(name="Reason", value=reason, inline=False)
-                
-                await interaction.response.send_message(embed=embed)
-                
-                # Post to approval channel if configured
-                if config.APPROVAL_CHANNEL_NAME and interaction.guild:
-                    await post_to_channel(interaction.guild, config.APPROVAL_CHANNEL_NAME, embed)
-                
-                # Notify submissive
-                try:
-                    sub_user = await bot.fetch_user(submissive_id)
-                    notif = discord.Embed(
-                        title="❌ Task Rejected & Reset",
-                        description=f"Your task was rejected by {interaction.user.display_name}.",
-                        color=discord.Color.orange()
-                    )
-                    notif.add_field(name="Task", value=f"**{task_title}** (ID: {task_id})", inline=False)
-                    notif.add_field(name="Completion ID", value=str(completion_id), inline=True)
-                    if reason:
-                        notif.add_field(name="Reason", value=reason, inline=False)
-                    notif.set_footer(text="🔄 Deadline has been reset to next occurrence.")
-                    await sub_user.send(embed=notif)
-                except:
-                    pass
+    embed = discord.Embed(
+        title="❌ Task Rejected & Reset",
+        description=f"Task completion #{completion_id} rejected.\n🔄 **Deadline reset to next occurrence.**",
+        color=discord.Color.orange()
+    )
+    embed.add_field(name="Task", value=f"**{task_title}** (ID: {task_id})", inline=False)
+    embed.add_field(name="Completion ID", value=str(completion_id), inline=True)
+    if reason:
+        embed.add_field(name="Reason", value=reason, inline=False)
+    
+    # Notify submissive
+    notif = discord.Embed(
+        title="❌ Task Rejected & Reset",
+        description=f"Your task was rejected by {interaction.user.display_name}.",
+        color=discord.Color.orange()
+    )
+    notif.add_field(name="Task", value=f"**{task_title}** (ID: {task_id})", inline=False)
+    notif.add_field(name="Completion ID", value=str(completion_id), inline=True)
+    if reason:
+        notif.add_field(name="Reason", value=reason, inline=False)
+    notif.set_footer(text="🔄 Deadline has been reset to next occurrence.")
+    
+    # Post to approval channel if configured
+    if config.APPROVAL_CHANNEL_NAME and interaction.guild:
+        queue_channel_post(interaction.guild, config.APPROVAL_CHANNEL_NAME, embed)
+    
+    # Reply first; the DM goes out in the background
+    await interaction.response.send_message(embed=embed)
+    run_in_background(dm_user(submissive_id, notif))
 
 @bot.tree.command(name="verify", description="Manually verify a task without proof (dominant override)")
 @app_commands.describe(
@@ -2722,8 +2805,8 @@ async def reject_cancel(interaction: discord.Interaction, completion: str, reaso
 )
 async def verify(interaction: discord.Interaction, submissive: discord.Member, task_id: int):
     """Manually verify task completion without proof (dominant only)."""
-    user = await db.get_user(interaction.user.id)
-    if not user or user['role'] != 'dominant':
+    role = await db.get_role(interaction.user.id)
+    if role != 'dominant':
         await interaction.response.send_message(
             "❌ Only dominants can verify tasks!",
             ephemeral=True
@@ -2731,15 +2814,16 @@ async def verify(interaction: discord.Interaction, submissive: discord.Member, t
         return
     
     # Submit and immediately approve
-    completion_id = await db.submit_task_completion(task_id, submissive.id, None)
-    if completion_id is None:
+    completion = await db.submit_task_completion(task_id, submissive.id, None)
+    if completion is None:
         await interaction.response.send_message(
             "❌ Task not found!",
             ephemeral=True
         )
         return
     
-    points = await db.approve_task_completion(completion_id, interaction.user.id, True)
+    details = await db.approve_task_completion(completion['id'], interaction.user.id, True)
+    points = details['points'] if details else None
     if points:
         new_total = await db.update_points(submissive.id, points)
         
@@ -2763,14 +2847,14 @@ async def verify(interaction: discord.Interaction, submissive: discord.Member, t
             notif.add_field(name="Points Earned", value=str(points), inline=True)
             notif.add_field(name="Total Points", value=str(new_total), inline=True)
             await submissive.send(embed=notif)
-        except:
+        except discord.HTTPException:
             pass
 
 @bot.tree.command(name="pending", description="View pending task completions")
 async def pending(interaction: discord.Interaction):
     """View pending task completions (dominant only)."""
-    user = await db.get_user(interaction.user.id)
-    if not user or user['role'] != 'dominant':
+    role = await db.get_role(interaction.user.id)
+    if role != 'dominant':
         await interaction.response.send_message(
             "❌ Only dominants can view pending completions!",
             ephemeral=True
@@ -2786,22 +2870,18 @@ async def pending(interaction: discord.Interaction):
         )
         return
     
+    entries = [f"{len(pending_list)} task(s) awaiting review"]
+    for item in pending_list[:10]:  # Show max 10
+        entry = f"**Completion ID: {item['id']}**\n**Submissive:** {item['submissive_name']}\n**Task:** {item['title']}\n**Submitted:** <t:{item['submitted_ts']}:R>"
+        if item['proof_url']:
+            entry += f"\n[View Proof]({item['proof_url']})"
+        entries.append(entry)
+    
     embed = discord.Embed(
         title="📋 Pending Task Completions",
-        description=f"{len(pending_list)} task(s) awaiting review",
+        description=build_list_description(entries),
         color=discord.Color.orange()
     )
-    
-    for item in pending_list[:10]:  # Show max 10
-        value = f"**Submissive:** {item['submissive_name']}\n**Task:** {item['title']}\n**Submitted:** <t:{int(datetime.datetime.fromisoformat(item['submitted_at']).timestamp())}:R>"
-        if item['proof_url']:
-            value += f"\n[View Proof]({item['proof_url']})"
-        embed.add_field(
-            name=f"Completion ID: {item['id']}",
-            value=value,
-            inline=False
-        )
-    
     embed.set_footer(text="Use /approve <id> or /reject <id> to review")
     await interaction.response.send_message(embed=embed)
 
@@ -2809,12 +2889,20 @@ async def pending(interaction: discord.Interaction):
 
 @bot.tree.command(name="points", description="Check your points or a submissive's points")
 @app_commands.describe(submissive="Check points for this submissive (dominants only)")
+@dedupe
 async def points(interaction: discord.Interaction, submissive: discord.Member = None):
     """Check points."""
-    user = await db.get_user(interaction.user.id)
+    # Look up the caller and the requested submissive together
+    if submissive:
+        user, target = await asyncio.gather(
+            db.get_user(interaction.user.id),
+            db.get_user(submissive.id)
+        )
+    else:
+        user = target = await db.get_user(interaction.user.id)
     if not user:
         await interaction.response.send_message(
-            "❌ You need to register first! Use `/register`",
+            NOT_REGISTERED,
             ephemeral=True
         )
         return
@@ -2827,10 +2915,8 @@ async def points(interaction: discord.Interaction, submissive: discord.Member =
                 ephemeral=True
             )
             return
-        target = await db.get_user(submissive.id)
         target_name = submissive.display_name
     else:
-        target = user
         target_name = "You"
     
     if not target:
@@ -2850,7 +2936,7 @@ async def points(interaction: discord.Interaction, submissive: discord.Member =
     if target_name == "You" and user['role'] == 'submissive':
         affordable_rewards = await db.get_affordable_rewards(interaction.user.id, target['points'])
         if affordable_rewards:
-            rewards_text = "\n".join([f"✨ **{r['title']}** - {r['point_cost']} points" for r in affordable_rewards[:5]])
+            rewards_text = "\n".join([f"✨ **{r['title']}** - {r['point_cost']} points" for r in affordable_rewards])
             embed.add_field(name="🎁 Rewards You Can Afford", value=rewards_text, inline=False)
         else:
             embed.add_field(name="🎁 Rewards", value="Keep earning points to unlock rewards!", inline=False)
@@ -2865,8 +2951,8 @@ async def points(interaction: discord.Interaction, submissive: discord.Member =
 )
 async def points_give(interaction: discord.Interaction, submissive: discord.Member, amount: int, reason: str = None):
     """Manually give or take points (dominant only)."""
-    user = await db.get_user(interaction.user.id)
-    if not user or user['role'] != 'dominant':
+    role, linked = await db.get_user_and_link(interaction.user.id, submissive.id)
+    if role != 'dominant':
         await interaction.response.send_message(
             "❌ Only dominants can give/take points!",
             ephemeral=True
@@ -2874,8 +2960,7 @@ async def points_give(interaction: discord.Interaction, submissive: discord.Memb
         return
     
     # Verify relationship
-    submissives = await db.get_submissives(interaction.user.id)
-    if not any(s['user_id'] == submissive.id for s in submissives):
+    if not linked:
         await interaction.response.send_message(
             f"❌ {submissive.mention} is not linked to you!",
             ephemeral=True
@@ -2911,27 +2996,62 @@ async def points_give(interaction: discord.Interaction, submissive: discord.Memb
         )
         notif.add_field(name="New Total", value=str(new_total), inline=True)
         await submissive.send(embed=notif)
-    except:
+    except discord.HTTPException:
         pass
 
+# Stats chart rendering (one shared figure, drawn off the event loop)
+# matplotlib is only imported the first time a chart is drawn to keep startup fast and memory low
+_stats_chart = None
+_stats_render_lock = threading.Lock()
+_stats_png_cache = TTLCache(maxsize=256, ttl=300)
+
+def _get_stats_chart() -> tuple:
+    """Create the shared (figure, canvas, axes) on first use; call with _stats_render_lock held."""
+    global _stats_chart
+    if _stats_chart is None:
+        from matplotlib.figure import Figure
+        from matplotlib.backends.backend_agg import FigureCanvasAgg
+        figure = Figure(figsize=(10, 5))
+        _stats_chart = (figure, FigureCanvasAgg(figure), figure.add_subplot(111))
+    return _stats_chart
+
+def _render_stats_png(dates: list, counts: list, target_name: str) -> bytes:
+    """Render the task completion bar chart to PNG bytes."""
+    with _stats_render_lock:
+        figure, canvas, axes = _get_stats_chart()
+        axes.clear()
+        axes.bar(dates, counts, color='#5865F2')
+        axes.set_xlabel('Date')
+        axes.set_ylabel('Tasks Completed')
+        axes.set_title(f'{target_name} Task Completion')
+        axes.tick_params(axis='x', labelrotation=45)
+        figure.tight_layout()
+        
+        # Fast PNG encode: no metadata chunk, minimal zlib compression
+        buf = io.BytesIO()
+        canvas.print_png(buf, metadata={}, pil_kwargs={'optimize': False, 'compress_level': 1})
+        return buf.getvalue()
+
 @bot.tree.command(name="stats", description="View task completion statistics")
 @app_commands.describe(
     submissive="View stats for this submissive (dominants only)",
     days="Number of days to show (default: 7)"
 )
+@user_cooldown()
+@dedupe
 async def stats(interaction: discord.Interaction, submissive: discord.Member = None, days: int = 7):
     """View statistics."""
-    user = await db.get_user(interaction.user.id)
-    if not user:
+    role = await db.get_role(interaction.user.id)
+    if not role:
         await interaction.response.send_message(
-            "❌ You need to register first! Use `/register`",
+            NOT_REGISTERED,
             ephemeral=True
         )
         return
     
     # Determine whose stats to show
     if submissive:
-        if user['role'] != 'dominant':
+        if role != 'dominant':
             await interaction.response.send_message(
                 "❌ Only dominants can view others' stats!",
                 ephemeral=True
@@ -2940,7 +3060,7 @@ async def stats(interaction: discord.Interaction, submissive: discord.Member = N
         target_id = submissive.id
         target_name = submissive.display_name
     else:
-        if user['role'] == 'dominant':
+        if role == 'dominant':
             await interaction.response.send_message(
                 "❌ Specify a submissive to view their stats!",
                 ephemeral=True
@@ -2949,7 +3069,26 @@ async def stats(interaction: discord.Interaction, submissive: discord.Member = N
         target_id = interaction.user.id
         target_name = "Your"
     
-    stats_data = await db.get_task_stats(target_id, days)
+    if not await defer_response(interaction):
+        return
+    
+    png_bytes = None
+    async with INTERACTION_SEM:
+        stats_data = await db.get_task_stats(target_id, days)
+        
+        # Create graph if there's data
+        if stats_data['daily_stats']:
+            dates = [s['date'] for s in stats_data['daily_stats']]
+            counts = [s['count'] for s in stats_data['daily_stats']]
+            
+            # Reuse a recent render if nothing was completed since
+            cache_key = (target_id, days, target_name, stats_data['last_completed_at'])
+            png_bytes = _stats_png_cache.get(cache_key)
+            if png_bytes is None:
+                png_bytes = await asyncio.get_running_loop().run_in_executor(
+                    None, _render_stats_png, dates, counts, target_name
+                )
+                _stats_png_cache.set(cache_key, png_bytes)
     
     embed = discord.Embed(
         title=f"📊 {target_name} Stats (Last {days} Days)",
@@ -2958,51 +3097,65 @@ async def stats(interaction: discord.Interaction, submissive: discord.Member = N
     embed.add_field(name="Total Completions", value=str(stats_data['total_completions']), inline=True)
     embed.add_field(name="Total Points Earned", value=str(stats_data['total_points']), inline=True)
     
-    # Create graph if there's data
-    if stats_data['daily_stats']:
-        dates = [s['date'] for s in stats_data['daily_stats']]
-        counts = [s['count'] for s in stats_data['daily_stats']]
-        
-        plt.figure(figsize=(10, 5))
-        plt.bar(dates, counts, color='#5865F2')
-        plt.xlabel('Date')
-        plt.ylabel('Tasks Completed')
-        plt.title(f'{target_name} Task Completion')
-        plt.xticks(rotation=45)
-        plt.tight_layout()
-        
-        # Save to buffer
-        buf = io.BytesIO()
-        plt.savefig(buf, format='png')
-        buf.seek(0)
-        plt.close()
-        
-        file = discord.File(buf, filename='stats.png')
+    if png_bytes is not None:
+        file = discord.File(io.BytesIO(png_bytes), filename='stats.png')
         embed.set_image(url='attachment://stats.png')
-        await interaction.response.send_message(embed=embed, file=file)
+        await interaction.followup.send(embed=embed, file=file)
     else:
-        await interaction.response.send_message(embed=embed)
+        await interaction.followup.send(embed=embed)
 
 # ============ UTILITY COMMANDS ============
 
+# Map common abbreviations to IANA timezone names
+TZ_ABBREVIATIONS = {
+    # US Timezones
+    'EST': 'America/New_York',
+    'EDT': 'America/New_York',
+    'ET': 'America/New_York',
+    'CST': 'America/Chicago',
+    'CDT': 'America/Chicago',
+    'CT': 'America/Chicago',
+    'MST': 'America/Denver',
+    'MDT': 'America/Denver',
+    'MT': 'America/Denver',
+    'PST': 'America/Los_Angeles',
+    'PDT': 'America/Los_Angeles',
+    'PT': 'America/Los_Angeles',
+    # Europe
+    'GMT': 'Europe/London',
+    'BST': 'Europe/London',
+    'CET': 'Europe/Paris',
+    'CEST': 'Europe/Paris',
+    # Asia
+    'JST': 'Asia/Tokyo',
+    'KST': 'Asia/Seoul',
+    'CST_CHINA': 'Asia/Shanghai',
+    # Australia
+    'AEST': 'Australia/Sydney',
+    'AEDT': 'Australia/Sydney',
+    # Universal
+    'UTC': 'UTC',
+}
+
 @bot.tree.command(name="timezone", description="Set your timezone for deadline calculations")
 @app_commands.describe(
     timezone="Timezone (e.g., EST, CST, PST, GMT, UTC)"
 )
 async def timezone(interaction: discord.Interaction, timezone: str = None):
     """Set or view user's timezone."""
-    user = await db.get_user(interaction.user.id)
-    if not user:
+    user_id = interaction.user.id
+    role = await db.get_role(user_id)
+    if not role:
         await interaction.response.send_message(
-            "❌ You need to register first! Use `/register`",
+            NOT_REGISTERED,
             ephemeral=True
         )
         return
     
     if timezone is None:
         # Show current timezone
-        current_tz = await db.get_user_timezone(interaction.user.id)
-        tz = pytz.timezone(current_tz)
+        current_tz = await db.get_user_timezone(user_id)
+        tz = db.get_timezone(current_tz)
         now = datetime.datetime.now(tz)
         
         embed = discord.Embed(
@@ -3014,48 +3167,17 @@ async def timezone(interaction: discord.Interaction, timezone: str = None):
         embed.set_footer(text="Change with: /timezone timezone:<your_timezone>\nExamples: EST, CST, PST, GMT, UTC")
         await interaction.response.send_message(embed=embed, ephemeral=True)
     else:
-        # Map common abbreviations to IANA timezone names
-        tz_map = {
-            # US Timezones
-            'EST': 'America/New_York',
-            'EDT': 'America/New_York',
-            'ET': 'America/New_York',
-            'CST': 'America/Chicago',
-            'CDT': 'America/Chicago',
-            'CT': 'America/Chicago',
-            'MST': 'America/Denver',
-            'MDT': 'America/Denver',
-            'MT': 'America/Denver',
-            'PST': 'America/Los_Angeles',
-            'PDT': 'America/Los_Angeles',
-            'PT': 'America/Los_Angeles',
-            # Europe
-            'GMT': 'Europe/London',
-            'BST': 'Europe/London',
-            'CET': 'Europe/Paris',
-            'CEST': 'Europe/Paris',
-            # Asia
-            'JST': 'Asia/Tokyo',
-            'KST': 'Asia/Seoul',
-            'CST_CHINA': 'Asia/Shanghai',
-            # Australia
-            'AEST': 'Australia/Sydney',
-            'AEDT': 'Australia/Sydney',
-            # Universal
-            'UTC': 'UTC',
-        }
-        
         # Convert to uppercase for case-insensitive matching
         tz_upper = timezone.upper()
-        tz_to_use = tz_map.get(tz_upper, timezone)
+        tz_to_use = TZ_ABBREVIATIONS.get(tz_upper, timezone)
         
         # Set new timezone
-        success = await db.set_user_timezone(interaction.user.id, tz_to_use)
+        success = await db.set_user_timezone(user_id, tz_to_use)
         if success:
-            tz = pytz.timezone(tz_to_use)
+            tz = db.get_timezone(tz_to_use)
             now = datetime.datetime.now(tz)
             
-            display_name = timezone if tz_upper in tz_map else tz_to_use
+            display_name = timezone if tz_upper in TZ_ABBREVIATIONS else tz_to_use
             
             embed = discord.Embed(
                 title="✅ Timezone Updated",
@@ -3072,9 +3194,8 @@ async def timezone(interaction: discord.Interaction, timezone: str = None):
                 ephemeral=True
             )
 
-@bot.tree.command(name="help", description="Show all available commands")
-async def help_command(interaction: discord.Interaction):
-    """Show help."""
+def build_help_embed() -> discord.Embed:
+    """Build the static /help embed."""
     embed = discord.Embed(
         title="🤖 Obedience Bot Commands",
         description="A BDSM-themed habit tracker bot",
@@ -3123,8 +3244,23 @@ async def help_command(interaction: discord.Interaction):
         inline=False
     )
     
-    await interaction.response.send_message(embed=embed)
+    return embed
+
+# Built once at import, the help text never changes
+HELP_EMBED = build_help_embed()
+
+@bot.tree.command(name="help", description="Show all available commands")
+async def help_command(interaction: discord.Interaction):
+    """Show help."""
+    await interaction.response.send_message(embed=HELP_EMBED)
 
 # Run the bot
 if __name__ == "__main__":
+    # Prefer uvloop's faster event loop when it is installed (not available on Windows)
+    try:
+        import uvloop
+        asyncio.set_event_loop_policy(uvloop.EventLoopPolicy())
+        print("Using uvloop event loop")
+    except ImportError:
+        pass
     bot.run(TOKEN)
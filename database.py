@@ -1,8 +1,16 @@
 import aiosqlite
+import asyncio
 import datetime
+import functools
 import pytz
 import os
-from typing import Optional, List, Dict, Any
+import sqlite3
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import asynccontextmanager
+from zoneinfo import ZoneInfo
+from typing import Optional, List, Dict, Any, AsyncIterator
+from cache import TTLCache
 
 # Use persistent storage path if available (for Render.com deployment)
 # Otherwise use local directory for development
@@ -11,9 +19,129 @@ DATABASE_NAME = os.path.join(DATA_DIR, "obedience.db")
 
 print(f"Using database path: {DATABASE_NAME}")
 
+# Single long-lived connection shared by every query (opened on first use)
+# sqlite3 keeps compiled statements per connection; size the cache to hold every query below
+STATEMENT_CACHE_SIZE = 256
+# WAL lets reads run alongside a write; NORMAL sync skips the fsync on every commit (still safe in WAL mode)
+CONNECTION_PRAGMAS = """
+    PRAGMA journal_mode=WAL;
+    PRAGMA synchronous=NORMAL;
+    PRAGMA temp_store=MEMORY;
+    PRAGMA mmap_size=268435456;
+    PRAGMA cache_size=-20000;
+"""
+_connection: Optional[aiosqlite.Connection] = None
+_connection_lock = asyncio.Lock()
+
+async def get_connection() -> aiosqlite.Connection:
+    """Return the shared database connection, opening it if needed."""
+    global _connection
+    if _connection is None:
+        async with _connection_lock:
+            if _connection is None:
+                connection = await aiosqlite.connect(DATABASE_NAME, cached_statements=STATEMENT_CACHE_SIZE)
+                connection.row_factory = aiosqlite.Row
+                await connection.executescript(CONNECTION_PRAGMAS)
+                _connection = connection
+    return _connection
+
+async def close_db():
+    """Close the shared database connection and the read pool (both reopened on next use)."""
+    global _connection, _read_pool
+    if _read_pool is not None:
+        _read_pool.shutdown(wait=True)
+        _read_pool = None
+        for connection in _read_connections:
+            connection.close()
+        _read_connections.clear()
+    if _connection is not None:
+        # Refresh query planner statistics for the tables used this session
+        await _connection.execute("PRAGMA optimize")
+        await _connection.close()
+        _connection = None
+
+@asynccontextmanager
+async def acquire():
+    """Borrow the shared connection for read-only queries; writes go through transaction()."""
+    yield await get_connection()
+
+# Read-only queries for list commands run on a small thread pool, one sqlite3 connection per
+# thread, so they don't queue behind writes on the shared connection (WAL allows concurrent readers)
+READ_POOL_SIZE = 4
+_read_pool: Optional[ThreadPoolExecutor] = None
+_read_local = threading.local()
+_read_connections: List[sqlite3.Connection] = []
+
+def _read_connection() -> sqlite3.Connection:
+    """Return this pool thread's read-only connection, opening it if needed."""
+    connection = getattr(_read_local, 'connection', None)
+    if connection is None:
+        connection = sqlite3.connect(DATABASE_NAME, cached_statements=STATEMENT_CACHE_SIZE, check_same_thread=False)
+        connection.row_factory = sqlite3.Row
+        connection.execute("PRAGMA query_only=ON")
+        _read_local.connection = connection
+        _read_connections.append(connection)
+    return connection
+
+def _run_read(sql: str, params: tuple) -> List[Dict[str, Any]]:
+    return [dict(row) for row in _read_connection().execute(sql, params).fetchall()]
+
+async def read(sql: str, params: tuple = ()) -> List[Dict[str, Any]]:
+    """Run a read-only query on the read pool and return its rows as dicts."""
+    global _read_pool
+    if _read_pool is None:
+        _read_pool = ThreadPoolExecutor(max_workers=READ_POOL_SIZE, thread_name_prefix="db-read")
+    return await asyncio.get_running_loop().run_in_executor(_read_pool, _run_read, sql, params)
+
+# Every write on the shared connection holds this lock, so one writer's commit or rollback
+# never covers another writer's uncommitted statements
+_write_lock = asyncio.Lock()
+
+@asynccontextmanager
+async def transaction():
+    """Borrow the shared connection for a block of writes committed together."""
+    async with _write_lock:
+        db = await get_connection()
+        try:
+            yield db
+        except BaseException:
+            await db.rollback()
+            raise
+        else:
+            await db.commit()
+
+# In-process caches for rarely changing lookups (invalidated on writes)
+_user_cache = TTLCache(maxsize=10_000, ttl=300)
+# Roles only change on registration, so they outlive the point-sensitive user rows
+_role_cache = TTLCache(maxsize=10_000, ttl=300)
+_rewards_cache = TTLCache(maxsize=1_000, ttl=300)
+_punishments_cache = TTLCache(maxsize=1_000, ttl=300)
+_submissive_ids_cache = TTLCache(maxsize=2_000, ttl=300)
+
+async def _get_cached_items_for_dominants(table: str, cache: TTLCache, dominant_ids: List[int]) -> List[Dict[str, Any]]:
+    """Get rewards/punishments rows for several dominants, querying only the uncached ones in one IN (...)."""
+    missing = [dominant_id for dominant_id in dominant_ids if cache.get(dominant_id) is None]
+    fetched = {dominant_id: [] for dominant_id in missing}
+    if missing:
+        placeholders = ', '.join('?' * len(missing))
+        async with acquire() as db:
+            async with db.execute(
+                f"SELECT * FROM {table} WHERE dominant_id IN ({placeholders}) ORDER BY dominant_id, id", missing
+            ) as cursor:
+                rows = await cursor.fetchall()
+        for row in rows:
+            fetched[row['dominant_id']].append(dict(row))
+        for dominant_id, items in fetched.items():
+            cache.set(dominant_id, items)
+    
+    items = []
+    for dominant_id in dominant_ids:
+        items.extend(fetched[dominant_id] if dominant_id in fetched else cache.get(dominant_id, []))
+    return items
+
 async def init_db():
     """Initialize the database with required tables."""
-    async with aiosqlite.connect(DATABASE_NAME) as db:
+    async with transaction() as db:
         # Users table - stores Discord user info and roles
         await db.execute("""
             CREATE TABLE IF NOT EXISTS users (
@@ -29,41 +157,35 @@ async def init_db():
         # Add timezone column if it doesn't exist (migration)
         try:
             await db.execute("ALTER TABLE users ADD COLUMN timezone TEXT DEFAULT 'UTC'")
-            await db.commit()
-        except:
+        except aiosqlite.OperationalError:
             pass  # Column already exists
         
         # Add deadline_time column to tasks if it doesn't exist (migration)
         try:
             await db.execute("ALTER TABLE tasks ADD COLUMN deadline_time TEXT")
-            await db.commit()
-        except:
+        except aiosqlite.OperationalError:
             pass  # Column already exists
         
         # Add reminder columns to tasks if they don't exist (migration)
         try:
             await db.execute("ALTER TABLE tasks ADD COLUMN reminder_interval_hours INTEGER")
-            await db.commit()
-        except:
+        except aiosqlite.OperationalError:
             pass  # Column already exists
         
         try:
             await db.execute("ALTER TABLE tasks ADD COLUMN last_reminder_sent TIMESTAMP")
-            await db.commit()
-        except:
+        except aiosqlite.OperationalError:
             pass  # Column already exists
         
         # Add reminder columns to assigned_rewards_punishments if they don't exist (migration)
         try:
             await db.execute("ALTER TABLE assigned_rewards_punishments ADD COLUMN reminder_interval_hours INTEGER")
-            await db.commit()
-        except:
+        except aiosqlite.OperationalError:
             pass  # Column already exists
         
         try:
             await db.execute("ALTER TABLE assigned_rewards_punishments ADD COLUMN last_reminder_sent TIMESTAMP")
-            await db.commit()
-        except:
+        except aiosqlite.OperationalError:
             pass  # Column already exists
         
         # Relationships table - maps dominants to submissives
@@ -195,89 +317,137 @@ async def init_db():
             )
         """)
         
-        await db.commit()
+        # Indexes for a dominant's review lists and a submissive's active punishments
+        await db.execute("""
+            CREATE INDEX IF NOT EXISTS idx_arp_dom_status_type
+            ON assigned_rewards_punishments(dominant_id, completion_status, type)
+        """)
+        await db.execute("""
+            CREATE INDEX IF NOT EXISTS idx_arp_sub_status_type
+            ON assigned_rewards_punishments(submissive_id, completion_status, type)
+        """)
+        
+        # Index for affordable-reward lookups, which filter and sort by cost
+        await db.execute("""
+            CREATE INDEX IF NOT EXISTS idx_rewards_dom_cost
+            ON rewards(dominant_id, point_cost)
+        """)
+        
 
 # User operations
 async def register_user(user_id: int, username: str, role: str) -> bool:
     """Register a new user."""
     try:
-        async with aiosqlite.connect(DATABASE_NAME) as db:
+        async with transaction() as db:
             await db.execute(
                 "INSERT INTO users (user_id, username, role) VALUES (?, ?, ?)",
                 (user_id, username, role)
             )
-            await db.commit()
+        _user_cache.pop(user_id)
+        _role_cache.pop(user_id)
         return True
     except aiosqlite.IntegrityError:
         return False
 
 async def get_user(user_id: int) -> Optional[Dict[str, Any]]:
     """Get user information."""
-    async with aiosqlite.connect(DATABASE_NAME) as db:
-        db.row_factory = aiosqlite.Row
+    cached = _user_cache.get(user_id)
+    if cached is not None:
+        return dict(cached)
+    
+    async with acquire() as db:
         async with db.execute("SELECT * FROM users WHERE user_id = ?", (user_id,)) as cursor:
             row = await cursor.fetchone()
-            return dict(row) if row else None
+    if not row:
+        return None
+    user = dict(row)
+    _user_cache.set(user_id, user)
+    return dict(user)
+
+async def get_role(user_id: int) -> Optional[str]:
+    """Get only a user's role (None if not registered)."""
+    role = _role_cache.get(user_id)
+    if role is not None:
+        return role
+    cached = _user_cache.get(user_id)
+    if cached is not None:
+        return cached['role']
+    
+    async with acquire() as db:
+        async with db.execute("SELECT role FROM users WHERE user_id = ?", (user_id,)) as cursor:
+            row = await cursor.fetchone()
+    if not row:
+        return None
+    _role_cache.set(user_id, row[0])
+    return row[0]
 
 async def update_points(user_id: int, points_delta: int) -> int:
     """Update user points and return new total."""
-    async with aiosqlite.connect(DATABASE_NAME) as db:
-        await db.execute(
-            "UPDATE users SET points = points + ? WHERE user_id = ?",
+    async with transaction() as db:
+        # RETURNING reads the new total in the same statement as the update
+        async with db.execute(
+            "UPDATE users SET points = points + ? WHERE user_id = ? RETURNING points",
             (points_delta, user_id)
-        )
-        await db.commit()
-        
-        async with db.execute("SELECT points FROM users WHERE user_id = ?", (user_id,)) as cursor:
+        ) as cursor:
             row = await cursor.fetchone()
-            return row[0] if row else 0
+    _user_cache.pop(user_id)
+    return row[0] if row else 0
 
 async def set_user_timezone(user_id: int, timezone: str) -> bool:
     """Set user's timezone preference."""
     # Validate timezone
     try:
-        pytz.timezone(timezone)
+        get_timezone(timezone)
     except pytz.UnknownTimeZoneError:
         return False
     
-    async with aiosqlite.connect(DATABASE_NAME) as db:
+    async with transaction() as db:
         await db.execute(
             "UPDATE users SET timezone = ? WHERE user_id = ?",
             (timezone, user_id)
         )
-        await db.commit()
+    _user_cache.pop(user_id)
     return True
 
 async def get_user_timezone(user_id: int) -> str:
     """Get user's timezone preference, defaults to UTC."""
-    async with aiosqlite.connect(DATABASE_NAME) as db:
+    async with acquire() as db:
         async with db.execute("SELECT timezone FROM users WHERE user_id = ?", (user_id,)) as cursor:
             row = await cursor.fetchone()
             return row[0] if row and row[0] else 'UTC'
 
+@functools.lru_cache(maxsize=512)
+def get_timezone(timezone_str: str) -> datetime.tzinfo:
+    """Get a pytz timezone by name (memoized; unknown names still raise)."""
+    return pytz.timezone(timezone_str)
+
+@functools.lru_cache(maxsize=512)
+def get_zoneinfo(timezone_str: str) -> ZoneInfo:
+    """Get a stdlib zoneinfo timezone, resolving the name through pytz so stored names match."""
+    return ZoneInfo(get_timezone(timezone_str).zone)
+
 def get_user_time_now(timezone_str: str = 'UTC') -> datetime.datetime:
     """Get current time in user's timezone."""
-    tz = pytz.timezone(timezone_str)
+    tz = get_timezone(timezone_str)
     return datetime.datetime.now(tz)
 
 # Relationship operations
 async def create_relationship(dominant_id: int, submissive_id: int) -> bool:
     """Create a dominant-submissive relationship."""
     try:
-        async with aiosqlite.connect(DATABASE_NAME) as db:
+        async with transaction() as db:
             await db.execute(
                 "INSERT INTO relationships (dominant_id, submissive_id) VALUES (?, ?)",
                 (dominant_id, submissive_id)
             )
-            await db.commit()
+        _submissive_ids_cache.pop(dominant_id)
         return True
     except aiosqlite.IntegrityError:
         return False
 
 async def get_submissives(dominant_id: int) -> List[Dict[str, Any]]:
     """Get all submissives for a dominant."""
-    async with aiosqlite.connect(DATABASE_NAME) as db:
-        db.row_factory = aiosqlite.Row
+    async with acquire() as db:
         async with db.execute("""
             SELECT u.* FROM users u
             JOIN relationships r ON u.user_id = r.submissive_id
@@ -286,10 +456,41 @@ async def get_submissives(dominant_id: int) -> List[Dict[str, Any]]:
             rows = await cursor.fetchall()
             return [dict(row) for row in rows]
 
+async def get_submissive_ids(dominant_id: int) -> frozenset:
+    """Get the IDs of all submissives linked to a dominant."""
+    submissive_ids = _submissive_ids_cache.get(dominant_id)
+    if submissive_ids is not None:
+        return submissive_ids
+    
+    async with acquire() as db:
+        async with db.execute(
+            "SELECT submissive_id FROM relationships WHERE dominant_id = ?", (dominant_id,)
+        ) as cursor:
+            rows = await cursor.fetchall()
+    submissive_ids = frozenset(row[0] for row in rows)
+    _submissive_ids_cache.set(dominant_id, submissive_ids)
+    return submissive_ids
+
+async def is_linked(dominant_id: int, submissive_id: int) -> bool:
+    """Check whether a submissive is linked to a dominant."""
+    return submissive_id in await get_submissive_ids(dominant_id)
+
+async def get_user_and_link(user_id: int, submissive_id: int = None) -> tuple:
+    """Get a user's role and whether the submissive is linked to them in one query."""
+    async with acquire() as db:
+        async with db.execute("""
+            SELECT u.role, EXISTS(
+                SELECT 1 FROM relationships r
+                WHERE r.dominant_id = u.user_id AND r.submissive_id = ?
+            ) FROM users u
+            WHERE u.user_id = ?
+        """, (submissive_id, user_id)) as cursor:
+            row = await cursor.fetchone()
+            return (row[0], bool(row[1])) if row else (None, False)
+
 async def get_dominant(submissive_id: int) -> Optional[Dict[str, Any]]:
     """Get the dominant for a submissive (returns first if multiple exist)."""
-    async with aiosqlite.connect(DATABASE_NAME) as db:
-        db.row_factory = aiosqlite.Row
+    async with acquire() as db:
         async with db.execute("""
             SELECT u.* FROM users u
             JOIN relationships r ON u.user_id = r.dominant_id
@@ -300,8 +501,7 @@ async def get_dominant(submissive_id: int) -> Optional[Dict[str, Any]]:
 
 async def get_dominants(submissive_id: int) -> List[Dict[str, Any]]:
     """Get all dominants for a submissive."""
-    async with aiosqlite.connect(DATABASE_NAME) as db:
-        db.row_factory = aiosqlite.Row
+    async with acquire() as db:
         async with db.execute("""
             SELECT u.* FROM users u
             JOIN relationships r ON u.user_id = r.dominant_id
@@ -326,13 +526,21 @@ async def get_next_available_id(db, table: str) -> int:
     return max_id + 1
 
 # Task operations
+INSERT_TASK_SQL = """
+    INSERT INTO tasks (
+        id, submissive_id, dominant_id, title, description, frequency, point_value, deadline, deadline_time,
+        recurrence_enabled, recurrence_interval_hours, days_of_week, time_of_day, next_occurrence, auto_punishment_id, reminder_interval_hours
+    )
+    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+"""
+
 async def create_task(submissive_id: int, dominant_id: int, title: str, 
                      description: str, frequency: str, point_value: int, deadline: datetime.datetime = None,
                      recurrence_enabled: bool = False, recurrence_interval_hours: int = None,
                      days_of_week: str = None, time_of_day: str = None, auto_punishment_id: int = None,
                      deadline_time: str = None, reminder_interval_hours: int = None) -> int:
     """Create a new task with optional recurring schedule, auto-punishment, and reminders."""
-    async with aiosqlite.connect(DATABASE_NAME) as db:
+    async with transaction() as db:
         # Calculate next occurrence if recurring
         next_occurrence = None
         if recurrence_enabled and (days_of_week or recurrence_interval_hours):
@@ -341,15 +549,10 @@ async def create_task(submissive_id: int, dominant_id: int, title: str,
         # Get next available ID
         next_id = await get_next_available_id(db, 'tasks')
         
-        await db.execute("""
-            INSERT INTO tasks (
-                id, submissive_id, dominant_id, title, description, frequency, point_value, deadline, deadline_time,
-                recurrence_enabled, recurrence_interval_hours, days_of_week, time_of_day, next_occurrence, auto_punishment_id, reminder_interval_hours
-            )
-            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-        """, (next_id, submissive_id, dominant_id, title, description, frequency, point_value, deadline, deadline_time,
-              recurrence_enabled, recurrence_interval_hours, days_of_week, time_of_day, next_occurrence, auto_punishment_id, reminder_interval_hours))
-        await db.commit()
+        await db.execute(INSERT_TASK_SQL, (
+            next_id, submissive_id, dominant_id, title, description, frequency, point_value, deadline, deadline_time,
+            recurrence_enabled, recurrence_interval_hours, days_of_week, time_of_day, next_occurrence, auto_punishment_id, reminder_interval_hours
+        ))
         return next_id
 
 def calculate_next_occurrence(days_of_week: str = None, time_of_day: str = None, 
@@ -381,8 +584,7 @@ def calculate_next_occurrence(days_of_week: str = None, time_of_day: str = None,
 
 async def get_tasks(submissive_id: int, active_only: bool = True) -> List[Dict[str, Any]]:
     """Get all tasks for a submissive."""
-    async with aiosqlite.connect(DATABASE_NAME) as db:
-        db.row_factory = aiosqlite.Row
+    async with acquire() as db:
         query = "SELECT * FROM tasks WHERE submissive_id = ?"
         if active_only:
             query += " AND active = 1"
@@ -390,11 +592,42 @@ async def get_tasks(submissive_id: int, active_only: bool = True) -> List[Dict[s
             rows = await cursor.fetchall()
             return [dict(row) for row in rows]
 
-async def submit_task_completion(task_id: int, submissive_id: int, proof_url: str = None) -> Optional[int]:
-    """Submit a task completion for approval and return completion ID."""
-    async with aiosqlite.connect(DATABASE_NAME) as db:
+async def get_task_list(submissive_id: int) -> List[Dict[str, Any]]:
+    """Get a submissive's active tasks with their list text preformatted for /tasks."""
+    async with acquire() as db:
+        async with db.execute("""
+            SELECT id, frequency, recurrence_enabled, recurrence_interval_hours, days_of_week, time_of_day,
+                printf('**%d. %s**' || char(10) || '%s' || char(10) || '**Frequency:** %s · **Points:** %d',
+                       id, title, description, upper(substr(frequency, 1, 1)) || substr(frequency, 2), point_value) AS entry,
+                CAST(strftime('%s', deadline) AS INTEGER) AS deadline_ts
+            FROM tasks
+            WHERE submissive_id = ? AND active = 1
+            ORDER BY id
+        """, (submissive_id,)) as cursor:
+            rows = await cursor.fetchall()
+            return [dict(row) for row in rows]
+
+async def has_active_tasks(submissive_id: int) -> bool:
+    """Check whether a submissive has any active tasks."""
+    async with acquire() as db:
+        async with db.execute(
+            "SELECT 1 FROM tasks WHERE submissive_id = ? AND active = 1 LIMIT 1", (submissive_id,)
+        ) as cursor:
+            return await cursor.fetchone() is not None
+
+async def is_task_active(task_id: int) -> bool:
+    """Check whether a task exists and is active."""
+    async with acquire() as db:
+        async with db.execute("SELECT 1 FROM tasks WHERE id = ? AND active = 1", (task_id,)) as cursor:
+            return await cursor.fetchone() is not None
+
+async def submit_task_completion(task_id: int, submissive_id: int, proof_url: str = None) -> Optional[Dict[str, Any]]:
+    """Submit a task completion for approval and return its ID with the task's dominant and title."""
+    async with transaction() as db:
         # Get task info
-        async with db.execute("SELECT point_value FROM tasks WHERE id = ? AND active = 1", (task_id,)) as cursor:
+        async with db.execute(
+            "SELECT point_value, dominant_id, title FROM tasks WHERE id = ? AND active = 1", (task_id,)
+        ) as cursor:
             row = await cursor.fetchone()
             if not row:
                 return None
@@ -406,89 +639,126 @@ async def submit_task_completion(task_id: int, submissive_id: int, proof_url: st
             VALUES (?, ?, ?, ?, 'pending')
         """, (task_id, submissive_id, proof_url, points))
         
-        await db.commit()
-        return cursor.lastrowid
+        return {'id': cursor.lastrowid, 'dominant_id': row[1], 'title': row[2]}
+
+async def _review_task_completion(db: aiosqlite.Connection, completion_id: int, reviewer_id: int, approved: bool,
+                                  reset_deadline_on_reject: bool) -> Optional[Dict[str, Any]]:
+    """Review a task completion on the given connection without committing."""
+    # Get completion info and associated task with all necessary fields
+    async with db.execute("""
+        SELECT tc.submissive_id, tc.points_earned, tc.approval_status, tc.task_id,
+               t.deadline_time, t.submissive_id as task_submissive_id, t.frequency, t.deadline,
+               t.title, t.active, u.timezone
+        FROM task_completions tc
+        JOIN tasks t ON tc.task_id = t.id
+        LEFT JOIN users u ON u.user_id = t.submissive_id
+        WHERE tc.id = ?
+    """, (completion_id,)) as cursor:
+        row = await cursor.fetchone()
+        if not row or row[2] != 'pending':
+            return None
+        (submissive_id, points, _, task_id, deadline_time, task_submissive_id, frequency, old_deadline,
+         title, active, sub_timezone) = row
+    
+    status = 'approved' if approved else 'rejected'
+    
+    # Update completion
+    await db.execute("""
+        UPDATE task_completions 
+        SET approval_status = ?, reviewed_by = ?, reviewed_at = CURRENT_TIMESTAMP, completed_at = CURRENT_TIMESTAMP
+        WHERE id = ?
+    """, (status, reviewer_id, completion_id))
+    
+    # Determine if task should be reset based on frequency
+    # Reset if: (approved OR reset_deadline_on_reject) AND frequency is not one-time (has deadline)
+    should_reset = (approved or reset_deadline_on_reject) and old_deadline is not None and frequency in ('daily', 'weekly', 'custom')
+    
+    if should_reset:
+        # Submissive's timezone comes from the join above
+        user_tz = get_timezone(sub_timezone or 'UTC')
+        
+        new_deadline = None
+        
+        # Calculate next deadline based on what's available
+        if deadline_time:
+            # Use deadline_time if available (preferred for daily tasks)
+            try:
+                time_parts = deadline_time.split(':')
+                hour = int(time_parts[0])
+                minute = int(time_parts[1])
+                
+                # Get current time in user's timezone
+                now = datetime.datetime.now(user_tz)
+                new_deadline = now.replace(hour=hour, minute=minute, second=0, microsecond=0)
+                
+                # If time has already passed today, set for tomorrow
+                if new_deadline <= now:
+                    new_deadline = new_deadline + datetime.timedelta(days=1)
+            except (ValueError, IndexError):
+                pass
+        
+        # Fallback: use frequency to calculate next deadline
+        if new_deadline is None:
+            now = datetime.datetime.now(user_tz)
+            if frequency == 'daily':
+                new_deadline = now + datetime.timedelta(days=1)
+            elif frequency == 'weekly':
+                new_deadline = now + datetime.timedelta(weeks=1)
+            elif frequency == 'custom':
+                # Default to 24 hours for custom if no other info
+                new_deadline = now + datetime.timedelta(hours=24)
+        
+        # Reset deadline and reactivate task
+        if new_deadline:
+            await db.execute("""
+                UPDATE tasks 
+                SET deadline = ?, active = 1
+                WHERE id = ?
+            """, (new_deadline, task_id))
+            active = 1
+    
+    return {
+        'points': points if approved else 0,
+        'submissive_id': submissive_id,
+        'task_id': task_id,
+        'title': title,
+        'active': active
+    }
 
 async def approve_task_completion(completion_id: int, reviewer_id: int, approved: bool, 
-                                  reset_deadline_on_reject: bool = False) -> Optional[int]:
-    """Approve or reject a task completion. Returns points if approved."""
-    async with aiosqlite.connect(DATABASE_NAME) as db:
-        # Get completion info and associated task with all necessary fields
-        async with db.execute("""
-            SELECT tc.submissive_id, tc.points_earned, tc.approval_status, tc.task_id,
-                   t.deadline_time, t.submissive_id as task_submissive_id, t.frequency, t.deadline
-            FROM task_completions tc
-            JOIN tasks t ON tc.task_id = t.id
-            WHERE tc.id = ?
-        """, (completion_id,)) as cursor:
+                                  reset_deadline_on_reject: bool = False) -> Optional[Dict[str, Any]]:
+    """Approve or reject a task completion.
+    
+    Returns the points earned (0 if rejected) with the submissive and task details
+    needed for notifications, or None if the completion isn't pending.
+    """
+    async with transaction() as db:
+        return await _review_task_completion(db, completion_id, reviewer_id, approved, reset_deadline_on_reject)
+
+async def approve_and_settle(completion_id: int, reviewer_id: int) -> Optional[Dict[str, Any]]:
+    """Approve a task completion and award its points in one transaction.
+    
+    Late completions (task deactivated at its deadline) earn double to refund the deduction.
+    Returns approve_task_completion's details plus points_awarded, old_points and new_total.
+    """
+    async with transaction() as db:
+        result = await _review_task_completion(db, completion_id, reviewer_id, True, False)
+        if result is None:
+            return None
+        points_awarded = result['points'] * 2 if result['active'] == 0 else result['points']
+        async with db.execute(
+            "UPDATE users SET points = points + ? WHERE user_id = ? RETURNING points",
+            (points_awarded, result['submissive_id'])
+        ) as cursor:
             row = await cursor.fetchone()
-            if not row or row[2] != 'pending':
-                return None
-            submissive_id, points, _, task_id, deadline_time, task_submissive_id, frequency, old_deadline = row
-        
-        status = 'approved' if approved else 'rejected'
-        
-        # Update completion
-        await db.execute("""
-            UPDATE task_completions 
-            SET approval_status = ?, reviewed_by = ?, reviewed_at = CURRENT_TIMESTAMP, completed_at = CURRENT_TIMESTAMP
-            WHERE id = ?
-        """, (status, reviewer_id, completion_id))
-        
-        # Determine if task should be reset based on frequency
-        # Reset if: (approved OR reset_deadline_on_reject) AND frequency is not one-time (has deadline)
-        should_reset = (approved or reset_deadline_on_reject) and old_deadline is not None and frequency in ('daily', 'weekly', 'custom')
-        
-        if should_reset:
-            # Get submissive's timezone
-            sub_timezone = await get_user_timezone(task_submissive_id)
-            user_tz = pytz.timezone(sub_timezone)
-            
-            new_deadline = None
-            
-            # Calculate next deadline based on what's available
-            if deadline_time:
-                # Use deadline_time if available (preferred for daily tasks)
-                try:
-                    time_parts = deadline_time.split(':')
-                    hour = int(time_parts[0])
-                    minute = int(time_parts[1])
-                    
-                    # Get current time in user's timezone
-                    now = datetime.datetime.now(user_tz)
-                    new_deadline = now.replace(hour=hour, minute=minute, second=0, microsecond=0)
-                    
-                    # If time has already passed today, set for tomorrow
-                    if new_deadline <= now:
-                        new_deadline = new_deadline + datetime.timedelta(days=1)
-                except (ValueError, IndexError):
-                    pass
-            
-            # Fallback: use frequency to calculate next deadline
-            if new_deadline is None:
-                now = datetime.datetime.now(user_tz)
-                if frequency == 'daily':
-                    new_deadline = now + datetime.timedelta(days=1)
-                elif frequency == 'weekly':
-                    new_deadline = now + datetime.timedelta(weeks=1)
-                elif frequency == 'custom':
-                    # Default to 24 hours for custom if no other info
-                    new_deadline = now + datetime.timedelta(hours=24)
-            
-            # Reset deadline and reactivate task
-            if new_deadline:
-                await db.execute("""
-                    UPDATE tasks 
-                    SET deadline = ?, active = 1
-                    WHERE id = ?
-                """, (new_deadline, task_id))
-        
-        await db.commit()
-        return points if approved else 0
+    _user_cache.pop(result['submissive_id'])
+    new_total = row[0] if row else 0
+    result.update(points_awarded=points_awarded, old_points=new_total - points_awarded, new_total=new_total)
+    return result
 
 async def assign_punishment_for_rejected_task(task_id: int, submissive_id: int, dominant_id: int) -> Optional[int]:
     """Assign punishment when task is rejected. Uses auto_punishment_id if set, otherwise random."""
-    async with aiosqlite.connect(DATABASE_NAME) as db:
+    async with acquire() as db:
         # Get task's auto_punishment_id
         async with db.execute(
             "SELECT auto_punishment_id FROM tasks WHERE id = ?",
@@ -520,7 +790,7 @@ async def assign_punishment_for_rejected_task(task_id: int, submissive_id: int,
         
         # Get submissive's timezone for deadline calculation
         sub_timezone = await get_user_timezone(submissive_id)
-        user_tz = pytz.timezone(sub_timezone)
+        user_tz = get_timezone(sub_timezone)
         
         # Set punishment deadline to 24 hours from now in user's timezone
         deadline = datetime.datetime.now(user_tz) + datetime.timedelta(hours=24)
@@ -539,10 +809,10 @@ async def assign_punishment_for_rejected_task(task_id: int, submissive_id: int,
 
 async def get_pending_completions(dominant_id: int) -> List[Dict[str, Any]]:
     """Get all pending task completions for a dominant's submissives."""
-    async with aiosqlite.connect(DATABASE_NAME) as db:
-        db.row_factory = aiosqlite.Row
+    async with acquire() as db:
         async with db.execute("""
-            SELECT tc.*, t.title, t.dominant_id, u.username as submissive_name
+            SELECT tc.*, t.title, t.dominant_id, u.username as submissive_name,
+                   CAST(strftime('%s', tc.submitted_at) AS INTEGER) AS submitted_ts
             FROM task_completions tc
             JOIN tasks t ON tc.task_id = t.id
             JOIN users u ON tc.submissive_id = u.user_id
@@ -552,37 +822,47 @@ async def get_pending_completions(dominant_id: int) -> List[Dict[str, Any]]:
             rows = await cursor.fetchall()
             return [dict(row) for row in rows]
 
-async def get_expired_tasks() -> List[Dict[str, Any]]:
-    """Get all tasks that have passed their deadline without completion."""
-    async with aiosqlite.connect(DATABASE_NAME) as db:
-        db.row_factory = aiosqlite.Row
-        async with db.execute("""
-            SELECT t.* FROM tasks t
-            WHERE t.active = 1 
-            AND t.deadline IS NOT NULL 
-            AND t.deadline < CURRENT_TIMESTAMP
-            AND NOT EXISTS (
-                SELECT 1 FROM task_completions tc 
-                WHERE tc.task_id = t.id 
-                AND tc.approval_status = 'approved'
-                AND tc.completed_at >= t.created_at
-            )
-        """) as cursor:
-            rows = await cursor.fetchall()
-            return [dict(row) for row in rows]
-
-async def deactivate_expired_task(task_id: int):
-    """Mark a task as inactive after deadline expires."""
-    async with aiosqlite.connect(DATABASE_NAME) as db:
-        await db.execute("UPDATE tasks SET active = 0 WHERE id = ?", (task_id,))
-        await db.commit()
+async def iter_expired_tasks(batch_size: int = 100) -> AsyncIterator[List[Dict[str, Any]]]:
+    """Yield tasks that have passed their deadline without completion, in batches ordered by ID."""
+    last_id = 0
+    while True:
+        async with acquire() as db:
+            async with db.execute("""
+                SELECT t.* FROM tasks t
+                WHERE t.active = 1 
+                AND t.deadline IS NOT NULL 
+                AND t.deadline < CURRENT_TIMESTAMP
+                AND NOT EXISTS (
+                    SELECT 1 FROM task_completions tc 
+                    WHERE tc.task_id = t.id 
+                    AND tc.approval_status = 'approved'
+                    AND tc.completed_at >= t.created_at
+                )
+                AND t.id > ?
+                ORDER BY t.id
+                LIMIT ?
+            """, (last_id, batch_size)) as cursor:
+                rows = [dict(row) for row in await cursor.fetchall()]
+        if rows:
+            yield rows
+        if len(rows) < batch_size:
+            return
+        last_id = rows[-1]['id']
+
+async def deactivate_expired_tasks(task_ids: List[int]):
+    """Mark tasks as inactive after their deadlines expire."""
+    if not task_ids:
+        return
+    async with transaction() as db:
+        placeholders = ', '.join('?' * len(task_ids))
+        await db.execute(f"UPDATE tasks SET active = 0 WHERE id IN ({placeholders})", task_ids)
 
 async def get_tasks_to_reset() -> List[Dict[str, Any]]:
     """Get recurring tasks that need to be reset."""
-    async with aiosqlite.connect(DATABASE_NAME) as db:
-        db.row_factory = aiosqlite.Row
+    async with acquire() as db:
         async with db.execute("""
-            SELECT t.* FROM tasks t
+            SELECT t.*, CAST(strftime('%s', t.next_occurrence) AS INTEGER) AS next_occurrence_ts
+            FROM tasks t
             WHERE t.recurrence_enabled = 1
             AND t.active = 1
             AND t.next_occurrence IS NOT NULL
@@ -594,7 +874,7 @@ async def get_tasks_to_reset() -> List[Dict[str, Any]]:
 async def reset_recurring_task(task_id: int, days_of_week: str = None, time_of_day: str = None, 
                               interval_hours: int = None):
     """Reset a recurring task and calculate next occurrence."""
-    async with aiosqlite.connect(DATABASE_NAME) as db:
+    async with transaction() as db:
         next_occurrence = calculate_next_occurrence(days_of_week, time_of_day, interval_hours)
         
         # Clear any pending completions for this task
@@ -610,11 +890,10 @@ async def reset_recurring_task(task_id: int, days_of_week: str = None, time_of_d
             WHERE id = ?
         """, (next_occurrence, task_id))
         
-        await db.commit()
 
 async def delete_task(task_id: int, dominant_id: int) -> bool:
     """Delete a task (dominant only)."""
-    async with aiosqlite.connect(DATABASE_NAME) as db:
+    async with transaction() as db:
         # Verify dominant owns this task
         async with db.execute("SELECT id FROM tasks WHERE id = ? AND dominant_id = ?", (task_id, dominant_id)) as cursor:
             if not await cursor.fetchone():
@@ -625,12 +904,11 @@ async def delete_task(task_id: int, dominant_id: int) -> bool:
         
         # Delete task
         await db.execute("DELETE FROM tasks WHERE id = ?", (task_id,))
-        await db.commit()
         return True
 
 async def reactivate_task(task_id: int, dominant_id: int, deadline: datetime.datetime) -> bool:
     """Reactivate an inactive task with a new deadline (dominant only)."""
-    async with aiosqlite.connect(DATABASE_NAME) as db:
+    async with transaction() as db:
         # Verify dominant owns this task
         async with db.execute("SELECT id FROM tasks WHERE id = ? AND dominant_id = ?", (task_id, dominant_id)) as cursor:
             if not await cursor.fetchone():
@@ -641,13 +919,12 @@ async def reactivate_task(task_id: int, dominant_id: int, deadline: datetime.dat
             "UPDATE tasks SET active = 1, deadline = ? WHERE id = ?",
             (deadline, task_id)
         )
-        await db.commit()
         return True
 
 async def edit_task(task_id: int, dominant_id: int, title: str = None, description: str = None, 
                    point_value: int = None, deadline: datetime.datetime = None, reminder_interval_hours: int = None) -> bool:
     """Edit a task (dominant only). Only updates provided fields."""
-    async with aiosqlite.connect(DATABASE_NAME) as db:
+    async with transaction() as db:
         # Verify dominant owns this task
         async with db.execute("SELECT id FROM tasks WHERE id = ? AND dominant_id = ?", (task_id, dominant_id)) as cursor:
             if not await cursor.fetchone():
@@ -680,22 +957,22 @@ async def edit_task(task_id: int, dominant_id: int, title: str = None, descripti
         query = f"UPDATE tasks SET {', '.join(updates)} WHERE id = ?"
         
         await db.execute(query, params)
-        await db.commit()
         return True
 
 async def get_task_stats(submissive_id: int, days: int = 7) -> Dict[str, Any]:
     """Get task completion statistics."""
-    async with aiosqlite.connect(DATABASE_NAME) as db:
+    async with acquire() as db:
         since_date = datetime.datetime.now() - datetime.timedelta(days=days)
         
         # Total completions
         async with db.execute("""
-            SELECT COUNT(*), SUM(points_earned) FROM task_completions
+            SELECT COUNT(*), SUM(points_earned), MAX(completed_at) FROM task_completions
             WHERE submissive_id = ? AND completed_at >= ?
         """, (submissive_id, since_date)) as cursor:
             row = await cursor.fetchone()
             total_completions = row[0] or 0
             total_points = row[1] or 0
+            last_completed_at = row[2]
         
         # Completions by day
         async with db.execute("""
@@ -710,13 +987,14 @@ async def get_task_stats(submissive_id: int, days: int = 7) -> Dict[str, Any]:
         return {
             'total_completions': total_completions,
             'total_points': total_points,
+            'last_completed_at': last_completed_at,
             'daily_stats': [{'date': row[0], 'count': row[1]} for row in daily_stats]
         }
 
 # Reward operations
 async def create_reward(dominant_id: int, title: str, description: str, point_cost: int) -> int:
     """Create a new reward."""
-    async with aiosqlite.connect(DATABASE_NAME) as db:
+    async with transaction() as db:
         # Get next available ID
         next_id = await get_next_available_id(db, 'rewards')
         
@@ -724,20 +1002,29 @@ async def create_reward(dominant_id: int, title: str, description: str, point_co
             INSERT INTO rewards (id, dominant_id, title, description, point_cost)
             VALUES (?, ?, ?, ?, ?)
         """, (next_id, dominant_id, title, description, point_cost))
-        await db.commit()
+        _rewards_cache.pop(dominant_id)
         return next_id
 
 async def get_rewards(dominant_id: int) -> List[Dict[str, Any]]:
     """Get all rewards for a dominant."""
-    async with aiosqlite.connect(DATABASE_NAME) as db:
-        db.row_factory = aiosqlite.Row
+    cached = _rewards_cache.get(dominant_id)
+    if cached is not None:
+        return list(cached)
+    
+    async with acquire() as db:
         async with db.execute("SELECT * FROM rewards WHERE dominant_id = ?", (dominant_id,)) as cursor:
             rows = await cursor.fetchall()
-            return [dict(row) for row in rows]
+    rewards = [dict(row) for row in rows]
+    _rewards_cache.set(dominant_id, rewards)
+    return list(rewards)
+
+async def get_rewards_for_dominants(dominant_ids: List[int]) -> List[Dict[str, Any]]:
+    """Get all rewards for several dominants, in dominant order."""
+    return await _get_cached_items_for_dominants('rewards', _rewards_cache, dominant_ids)
 
 async def delete_reward(reward_id: int, dominant_id: int) -> bool:
     """Delete a reward (dominant only)."""
-    async with aiosqlite.connect(DATABASE_NAME) as db:
+    async with transaction() as db:
         # Verify dominant owns this reward
         async with db.execute("SELECT id FROM rewards WHERE id = ? AND dominant_id = ?", (reward_id, dominant_id)) as cursor:
             if not await cursor.fetchone():
@@ -748,13 +1035,13 @@ async def delete_reward(reward_id: int, dominant_id: int) -> bool:
         
         # Delete reward
         await db.execute("DELETE FROM rewards WHERE id = ?", (reward_id,))
-        await db.commit()
+        _rewards_cache.pop(dominant_id)
         return True
 
 async def edit_reward(reward_id: int, dominant_id: int, title: str = None, 
                      description: str = None, point_cost: int = None) -> bool:
     """Edit a reward (dominant only). Only updates provided fields."""
-    async with aiosqlite.connect(DATABASE_NAME) as db:
+    async with transaction() as db:
         # Verify dominant owns this reward
         async with db.execute("SELECT id FROM rewards WHERE id = ? AND dominant_id = ?", (reward_id, dominant_id)) as cursor:
             if not await cursor.fetchone():
@@ -781,45 +1068,85 @@ async def edit_reward(reward_id: int, dominant_id: int, title: str = None,
         query = f"UPDATE rewards SET {', '.join(updates)} WHERE id = ?"
         
         await db.execute(query, params)
-        await db.commit()
+        _rewards_cache.pop(dominant_id)
         return True
 
-async def get_affordable_rewards(submissive_id: int, current_points: int) -> List[Dict[str, Any]]:
-    """Get rewards the submissive can now afford but couldn't before."""
-    async with aiosqlite.connect(DATABASE_NAME) as db:
-        db.row_factory = aiosqlite.Row
-        # Get dominant for this submissive
+async def get_affordable_rewards(submissive_id: int, current_points: int, limit: int = 5) -> List[Dict[str, Any]]:
+    """Get the cheapest rewards from the submissive's dominant that they can afford."""
+    async with acquire() as db:
         async with db.execute("""
-            SELECT dominant_id FROM relationships WHERE submissive_id = ?
-        """, (submissive_id,)) as cursor:
-            row = await cursor.fetchone()
-            if not row:
-                return []
-            dominant_id = row[0]
-        
-        # Get rewards they can afford
-        async with db.execute("""
-            SELECT * FROM rewards 
-            WHERE dominant_id = ? AND point_cost > 0 AND point_cost <= ?
+            SELECT id, title, point_cost FROM rewards
+            WHERE dominant_id = (SELECT dominant_id FROM relationships WHERE submissive_id = ?)
+              AND point_cost > 0 AND point_cost <= ?
             ORDER BY point_cost ASC
-        """, (dominant_id, current_points)) as cursor:
+            LIMIT ?
+        """, (submissive_id, current_points, limit)) as cursor:
             rows = await cursor.fetchall()
             return [dict(row) for row in rows]
 
+async def get_newly_affordable_reward(submissive_id: int, old_points: int, new_points: int) -> Optional[Dict[str, Any]]:
+    """Get the most expensive reward that became affordable when points went from old_points to new_points."""
+    async with acquire() as db:
+        async with db.execute("""
+            SELECT title, description, point_cost FROM rewards
+            WHERE dominant_id = (SELECT dominant_id FROM relationships WHERE submissive_id = ?)
+              AND point_cost > 0 AND point_cost > ? AND point_cost <= ?
+            ORDER BY point_cost DESC
+            LIMIT 1
+        """, (submissive_id, old_points, new_points)) as cursor:
+            row = await cursor.fetchone()
+            return dict(row) if row else None
+
 async def assign_reward(submissive_id: int, dominant_id: int, reward_id: int, reason: str = None) -> bool:
     """Assign a reward to a submissive."""
-    async with aiosqlite.connect(DATABASE_NAME) as db:
+    async with transaction() as db:
         await db.execute("""
             INSERT INTO assigned_rewards_punishments (submissive_id, dominant_id, type, item_id, reason)
             VALUES (?, ?, 'reward', ?, ?)
         """, (submissive_id, dominant_id, reward_id, reason))
-        await db.commit()
         return True
 
+async def purchase_reward(submissive_id: int, dominant_id: int, reward_id: int, reason: str = None) -> Dict[str, Any]:
+    """Deduct a reward's cost from a submissive and record the assignment in one transaction.
+    
+    Returns {'reward', 'points', 'purchased'}: reward is None if the dominant has no such reward,
+    points is None if the submissive isn't registered, otherwise it is the new balance when
+    purchased or the unchanged balance when they can't afford it.
+    """
+    async with transaction() as db:
+        async with db.execute("""
+            SELECT r.*, (SELECT points FROM users WHERE user_id = ?) AS submissive_points
+            FROM rewards r
+            WHERE r.id = ? AND r.dominant_id = ?
+        """, (submissive_id, reward_id, dominant_id)) as cursor:
+            row = await cursor.fetchone()
+        if not row:
+            return {'reward': None, 'points': None, 'purchased': False}
+        reward = dict(row)
+        points = reward.pop('submissive_points')
+        if points is None or points < reward['point_cost']:
+            return {'reward': reward, 'points': points, 'purchased': False}
+        
+        # The balance check is repeated in the UPDATE so a concurrent deduction can't overdraw
+        async with db.execute(
+            "UPDATE users SET points = points - ? WHERE user_id = ? AND points >= ? RETURNING points",
+            (reward['point_cost'], submissive_id, reward['point_cost'])
+        ) as cursor:
+            row = await cursor.fetchone()
+        if not row:
+            return {'reward': reward, 'points': points, 'purchased': False}
+        
+        await db.execute("""
+            INSERT INTO assigned_rewards_punishments (submissive_id, dominant_id, type, item_id, reason)
+            VALUES (?, ?, 'reward', ?, ?)
+        """, (submissive_id, dominant_id, reward_id, reason))
+    _user_cache.pop(submissive_id)
+    return {'reward': reward, 'points': row[0], 'purchased': True}
+
 # Punishment operations
 async def create_punishment(dominant_id: int, title: str, description: str) -> int:
     """Create a new punishment."""
-    async with aiosqlite.connect(DATABASE_NAME) as db:
+    async with transaction() as db:
         # Get next available ID
         next_id = await get_next_available_id(db, 'punishments')
         
@@ -827,12 +1154,12 @@ async def create_punishment(dominant_id: int, title: str, description: str) -> i
             INSERT INTO punishments (id, dominant_id, title, description)
             VALUES (?, ?, ?, ?)
         """, (next_id, dominant_id, title, description))
-        await db.commit()
+        _punishments_cache.pop(dominant_id)
         return next_id
 
 async def delete_punishment(punishment_id: int, dominant_id: int) -> bool:
     """Delete a punishment (dominant only)."""
-    async with aiosqlite.connect(DATABASE_NAME) as db:
+    async with transaction() as db:
         # Verify dominant owns this punishment
         async with db.execute("SELECT id FROM punishments WHERE id = ? AND dominant_id = ?", (punishment_id, dominant_id)) as cursor:
             if not await cursor.fetchone():
@@ -843,13 +1170,13 @@ async def delete_punishment(punishment_id: int, dominant_id: int) -> bool:
         
         # Delete punishment
         await db.execute("DELETE FROM punishments WHERE id = ?", (punishment_id,))
-        await db.commit()
+        _punishments_cache.pop(dominant_id)
         return True
 
 async def edit_punishment(punishment_id: int, dominant_id: int, title: str = None, 
                          description: str = None) -> bool:
     """Edit a punishment (dominant only). Only updates provided fields."""
-    async with aiosqlite.connect(DATABASE_NAME) as db:
+    async with transaction() as db:
         # Verify dominant owns this punishment
         async with db.execute("SELECT id FROM punishments WHERE id = ? AND dominant_id = ?", (punishment_id, dominant_id)) as cursor:
             if not await cursor.fetchone():
@@ -873,55 +1200,55 @@ async def edit_punishment(punishment_id: int, dominant_id: int, title: str = Non
         query = f"UPDATE punishments SET {', '.join(updates)} WHERE id = ?"
         
         await db.execute(query, params)
-        await db.commit()
+        _punishments_cache.pop(dominant_id)
         return True
 
 async def get_punishments(dominant_id: int) -> List[Dict[str, Any]]:
     """Get all punishments for a dominant."""
-    async with aiosqlite.connect(DATABASE_NAME) as db:
-        db.row_factory = aiosqlite.Row
+    cached = _punishments_cache.get(dominant_id)
+    if cached is not None:
+        return list(cached)
+    
+    async with acquire() as db:
         async with db.execute("SELECT * FROM punishments WHERE dominant_id = ?", (dominant_id,)) as cursor:
             rows = await cursor.fetchall()
-            return [dict(row) for row in rows]
+    punishments = [dict(row) for row in rows]
+    _punishments_cache.set(dominant_id, punishments)
+    return list(punishments)
+
+async def get_punishments_for_dominants(dominant_ids: List[int]) -> List[Dict[str, Any]]:
+    """Get all punishments for several dominants, in dominant order."""
+    return await _get_cached_items_for_dominants('punishments', _punishments_cache, dominant_ids)
 
 async def assign_punishment(submissive_id: int, dominant_id: int, punishment_id: int, 
                           reason: str = None, deadline: datetime.datetime = None, point_penalty: int = 10,
                           forward_to_user_id: int = None, reminder_interval_hours: int = None) -> int:
     """Assign a punishment to a submissive with deadline, point penalty, and optional reminders."""
-    async with aiosqlite.connect(DATABASE_NAME) as db:
+    async with transaction() as db:
         cursor = await db.execute("""
             INSERT INTO assigned_rewards_punishments 
             (submissive_id, dominant_id, type, item_id, reason, deadline, point_penalty, forward_to_user_id, completion_status, reminder_interval_hours)
             VALUES (?, ?, 'punishment', ?, ?, ?, ?, ?, 'pending', ?)
         """, (submissive_id, dominant_id, punishment_id, reason, deadline, point_penalty, forward_to_user_id, reminder_interval_hours))
-        await db.commit()
         return cursor.lastrowid
 
-async def get_punishment_forward_user(assignment_id: int) -> Optional[int]:
-    """Get the forward_to_user_id for a punishment assignment."""
-    async with aiosqlite.connect(DATABASE_NAME) as db:
-        async with db.execute(
-            "SELECT forward_to_user_id FROM assigned_rewards_punishments WHERE id = ? AND type = 'punishment'",
-            (assignment_id,)
-        ) as cursor:
-            row = await cursor.fetchone()
-            return row[0] if row and row[0] else None
-
-async def submit_punishment_proof(assignment_id: int, proof_url: str) -> bool:
-    """Submit proof of punishment completion."""
-    async with aiosqlite.connect(DATABASE_NAME) as db:
+async def submit_punishment_proof(assignment_id: int, proof_url: str) -> Optional[Dict[str, Any]]:
+    """Submit proof of punishment completion. Returns the punishment and forward user, or None."""
+    async with transaction() as db:
         # Allow submission for both 'pending' and 'expired' punishments
-        await db.execute("""
+        async with db.execute("""
             UPDATE assigned_rewards_punishments 
             SET proof_url = ?, completion_status = 'submitted', submitted_at = CURRENT_TIMESTAMP
             WHERE id = ? AND type = 'punishment' AND completion_status IN ('pending', 'expired')
-        """, (proof_url, assignment_id))
-        await db.commit()
-        return True
+            RETURNING forward_to_user_id, item_id AS punishment_id,
+                      (SELECT title FROM punishments WHERE id = item_id) AS title
+        """, (proof_url, assignment_id)) as cursor:
+            row = await cursor.fetchone()
+        return dict(row) if row else None
 
 async def approve_punishment_completion(assignment_id: int, reviewer_id: int, approved: bool) -> Optional[int]:
     """Approve or reject punishment proof. Returns penalty if approved (to refund if late)."""
-    async with aiosqlite.connect(DATABASE_NAME) as db:
+    async with transaction() as db:
         # Get assignment info
         async with db.execute("""
             SELECT submissive_id, point_penalty, completion_status 
@@ -942,13 +1269,66 @@ async def approve_punishment_completion(assignment_id: int, reviewer_id: int, ap
             WHERE id = ?
         """, (new_status, reviewer_id, assignment_id))
         
-        await db.commit()
         return penalty if approved and status == 'expired' else 0
 
+async def approve_punishment_with_refund(assignment_id: int, reviewer_id: int) -> Optional[int]:
+    """Approve punishment proof and refund a late penalty in one transaction. Returns the refund."""
+    async with transaction() as db:
+        async with db.execute("""
+            SELECT submissive_id, point_penalty, completion_status 
+            FROM assigned_rewards_punishments 
+            WHERE id = ? AND type = 'punishment'
+        """, (assignment_id,)) as cursor:
+            row = await cursor.fetchone()
+        if not row or row[2] not in ('submitted', 'expired'):
+            return None
+        submissive_id, penalty, status = row
+        
+        await db.execute("""
+            UPDATE assigned_rewards_punishments 
+            SET completion_status = 'approved', reviewed_by = ?, reviewed_at = CURRENT_TIMESTAMP
+            WHERE id = ?
+        """, (reviewer_id, assignment_id))
+        
+        # Late submissions were already charged the doubled penalty, so give it back
+        refund = penalty if status == 'expired' else 0
+        if refund:
+            await db.execute(
+                "UPDATE users SET points = points + ? WHERE user_id = ?",
+                (refund, submissive_id)
+            )
+    if refund:
+        _user_cache.pop(submissive_id)
+    return refund
+
+async def get_punishment_assignment_details(assignment_id: int) -> Optional[Dict[str, Any]]:
+    """Get a punishment assignment with its punishment and the submissive's current points."""
+    async with acquire() as db:
+        async with db.execute("""
+            SELECT ap.submissive_id, ap.point_penalty, ap.forward_to_user_id, ap.proof_url,
+                   p.id AS punishment_id, p.title, u.points AS submissive_points
+            FROM assigned_rewards_punishments ap
+            JOIN punishments p ON ap.item_id = p.id
+            JOIN users u ON u.user_id = ap.submissive_id
+            WHERE ap.id = ? AND ap.type = 'punishment'
+        """, (assignment_id,)) as cursor:
+            row = await cursor.fetchone()
+            return dict(row) if row else None
+
+async def get_pending_punishment_assignment(assignment_id: int, dominant_id: int) -> Optional[Dict[str, Any]]:
+    """Get a dominant's punishment assignment that is still awaiting proof."""
+    rows = await read("""
+        SELECT ap.*, p.title, p.description,
+               CAST(strftime('%s', ap.deadline) AS INTEGER) AS deadline_ts
+        FROM assigned_rewards_punishments ap
+        JOIN punishments p ON ap.item_id = p.id
+        WHERE ap.id = ? AND ap.type = 'punishment' AND ap.dominant_id = ? AND ap.completion_status = 'pending'
+    """, (assignment_id, dominant_id))
+    return rows[0] if rows else None
+
 async def get_pending_punishments(dominant_id: int) -> List[Dict[str, Any]]:
     """Get pending punishment proofs for review."""
-    async with aiosqlite.connect(DATABASE_NAME) as db:
-        db.row_factory = aiosqlite.Row
+    async with acquire() as db:
         async with db.execute("""
             SELECT ap.*, p.title, p.description, u.username as submissive_name
             FROM assigned_rewards_punishments ap
@@ -963,7 +1343,7 @@ async def get_pending_punishments(dominant_id: int) -> List[Dict[str, Any]]:
 
 async def cancel_punishment(assignment_id: int, reviewer_id: int) -> Optional[Dict[str, Any]]:
     """Cancel a punishment and refund penalty points if already deducted. Returns dict with submissive_id and refunded penalty."""
-    async with aiosqlite.connect(DATABASE_NAME) as db:
+    async with transaction() as db:
         # Get assignment info
         async with db.execute("""
             SELECT submissive_id, point_penalty, completion_status 
@@ -982,7 +1362,6 @@ async def cancel_punishment(assignment_id: int, reviewer_id: int) -> Optional[Di
             WHERE id = ?
         """, (reviewer_id, assignment_id))
         
-        await db.commit()
         
         # Return info for point refund - refund if it was expired (points already deducted)
         refund_amount = penalty if status == 'expired' else 0
@@ -991,25 +1370,26 @@ async def cancel_punishment(assignment_id: int, reviewer_id: int) -> Optional[Di
             'refund_penalty': refund_amount
         }
 
-async def get_active_punishments(submissive_id: int) -> List[Dict[str, Any]]:
-    """Get active punishments for a submissive."""
-    async with aiosqlite.connect(DATABASE_NAME) as db:
-        db.row_factory = aiosqlite.Row
-        async with db.execute("""
-            SELECT ap.*, p.title, p.description
-            FROM assigned_rewards_punishments ap
-            JOIN punishments p ON ap.item_id = p.id
-            WHERE ap.submissive_id = ? AND ap.type = 'punishment' 
-            AND ap.completion_status = 'pending'
-            ORDER BY ap.deadline ASC
-        """, (submissive_id,)) as cursor:
-            rows = await cursor.fetchall()
-            return [dict(row) for row in rows]
+async def get_active_punishments(submissive_id: int, limit: int = 10, offset: int = 0) -> List[Dict[str, Any]]:
+    """Get a page of active punishments for a submissive, soonest deadline first.
+    
+    Each row carries total_count, the number of active punishments across all pages.
+    """
+    return await read("""
+        SELECT ap.*, p.title, p.description,
+               CAST(strftime('%s', ap.deadline) AS INTEGER) AS deadline_ts,
+               COUNT(*) OVER () AS total_count
+        FROM assigned_rewards_punishments ap
+        JOIN punishments p ON ap.item_id = p.id
+        WHERE ap.submissive_id = ? AND ap.type = 'punishment' 
+        AND ap.completion_status = 'pending'
+        ORDER BY ap.deadline ASC
+        LIMIT ? OFFSET ?
+    """, (submissive_id, limit, offset))
 
 async def get_expired_punishments() -> List[Dict[str, Any]]:
     """Get punishments that passed deadline without proof."""
-    async with aiosqlite.connect(DATABASE_NAME) as db:
-        db.row_factory = aiosqlite.Row
+    async with acquire() as db:
         async with db.execute("""
             SELECT * FROM assigned_rewards_punishments
             WHERE type = 'punishment'
@@ -1020,27 +1400,34 @@ async def get_expired_punishments() -> List[Dict[str, Any]]:
             rows = await cursor.fetchall()
             return [dict(row) for row in rows]
 
-async def expire_punishment(assignment_id: int, double_penalty: bool = True):
-    """Mark punishment as expired and optionally double the penalty."""
-    async with aiosqlite.connect(DATABASE_NAME) as db:
-        if double_penalty:
-            await db.execute("""
-                UPDATE assigned_rewards_punishments 
-                SET completion_status = 'expired', point_penalty = point_penalty * 2
-                WHERE id = ?
-            """, (assignment_id,))
-        else:
-            await db.execute("""
-                UPDATE assigned_rewards_punishments 
-                SET completion_status = 'expired'
-                WHERE id = ?
-            """, (assignment_id,))
-        await db.commit()
+async def expire_punishment(assignment_id: int) -> Optional[Dict[str, Any]]:
+    """Expire a missed punishment, double its penalty and deduct it in one transaction.
+    
+    Returns the doubled penalty and the submissive's new total, or None if the
+    punishment is no longer pending (nothing is deducted twice).
+    """
+    async with transaction() as db:
+        async with db.execute("""
+            UPDATE assigned_rewards_punishments 
+            SET completion_status = 'expired', point_penalty = point_penalty * 2
+            WHERE id = ? AND completion_status = 'pending'
+            RETURNING submissive_id, point_penalty
+        """, (assignment_id,)) as cursor:
+            row = await cursor.fetchone()
+        if not row:
+            return None
+        submissive_id, penalty = row
+        async with db.execute(
+            "UPDATE users SET points = points - ? WHERE user_id = ? RETURNING points",
+            (penalty, submissive_id)
+        ) as cursor:
+            points_row = await cursor.fetchone()
+    _user_cache.pop(submissive_id)
+    return {'penalty': penalty, 'new_total': points_row[0] if points_row else 0}
 
 async def get_assigned_items(submissive_id: int, item_type: str = None) -> List[Dict[str, Any]]:
     """Get assigned rewards or punishments for a submissive."""
-    async with aiosqlite.connect(DATABASE_NAME) as db:
-        db.row_factory = aiosqlite.Row
+    async with acquire() as db:
         query = "SELECT * FROM assigned_rewards_punishments WHERE submissive_id = ?"
         params = [submissive_id]
         
@@ -1057,7 +1444,7 @@ async def get_assigned_items(submissive_id: int, item_type: str = None) -> List[
 # Task punishment linking
 async def link_task_punishment(task_id: int, punishment_id: int, dominant_id: int) -> bool:
     """Link a punishment to a task (auto-assigns if task deadline missed)."""
-    async with aiosqlite.connect(DATABASE_NAME) as db:
+    async with transaction() as db:
         # Verify dominant owns both task and punishment
         async with db.execute("SELECT id FROM tasks WHERE id = ? AND dominant_id = ?", (task_id, dominant_id)) as cursor:
             if not await cursor.fetchone():
@@ -1069,12 +1456,11 @@ async def link_task_punishment(task_id: int, punishment_id: int, dominant_id: in
         
         # Link punishment to task
         await db.execute("UPDATE tasks SET auto_punishment_id = ? WHERE id = ?", (punishment_id, task_id))
-        await db.commit()
         return True
 
 async def get_task_punishment(task_id: int) -> Optional[int]:
     """Get the linked punishment ID for a task."""
-    async with aiosqlite.connect(DATABASE_NAME) as db:
+    async with acquire() as db:
         async with db.execute("SELECT auto_punishment_id FROM tasks WHERE id = ?", (task_id,)) as cursor:
             row = await cursor.fetchone()
             return row[0] if row and row[0] else None
@@ -1082,70 +1468,69 @@ async def get_task_punishment(task_id: int) -> Optional[int]:
 # Point threshold triggers
 async def create_point_threshold(dominant_id: int, threshold_points: int, punishment_id: int, submissive_id: int = None) -> int:
     """Create a point threshold trigger."""
-    async with aiosqlite.connect(DATABASE_NAME) as db:
+    async with transaction() as db:
         cursor = await db.execute("""
             INSERT INTO point_thresholds (dominant_id, submissive_id, threshold_points, punishment_id)
             VALUES (?, ?, ?, ?)
         """, (dominant_id, submissive_id, threshold_points, punishment_id))
-        await db.commit()
         return cursor.lastrowid
 
-async def check_point_thresholds(submissive_id: int, current_points: int) -> List[Dict[str, Any]]:
-    """Check if submissive triggered any point thresholds."""
-    async with aiosqlite.connect(DATABASE_NAME) as db:
-        db.row_factory = aiosqlite.Row
+async def trigger_point_thresholds(submissive_id: int, current_points: int,
+                                   deadline: datetime.datetime, point_penalty: int = 10) -> List[Dict[str, Any]]:
+    """Assign the punishment for every threshold the submissive has dropped below.
+    
+    Thresholds fire at most once per 24 hours. The conditional UPDATE claims them and
+    stamps last_triggered_at in the same statement, so no separate check can race it.
+    Returns the thresholds that fired.
+    """
+    async with transaction() as db:
         async with db.execute("""
-            SELECT pt.*, p.title, p.description
-            FROM point_thresholds pt
-            JOIN punishments p ON pt.punishment_id = p.id
-            WHERE pt.active = 1
-            AND (pt.submissive_id = ? OR pt.submissive_id IS NULL)
-            AND pt.threshold_points > ?
-            AND (pt.last_triggered_at IS NULL OR pt.last_triggered_at < datetime('now', '-1 day'))
+            UPDATE point_thresholds SET last_triggered_at = CURRENT_TIMESTAMP
+            WHERE active = 1
+            AND (submissive_id = ? OR submissive_id IS NULL)
+            AND threshold_points > ?
+            AND (last_triggered_at IS NULL OR last_triggered_at < datetime('now', '-1 day'))
+            AND punishment_id IN (SELECT id FROM punishments)
+            RETURNING id, dominant_id, punishment_id, threshold_points
         """, (submissive_id, current_points)) as cursor:
-            rows = await cursor.fetchall()
-            return [dict(row) for row in rows]
-
-async def mark_threshold_triggered(threshold_id: int):
-    """Mark a threshold as triggered."""
-    async with aiosqlite.connect(DATABASE_NAME) as db:
-        await db.execute(
-            "UPDATE point_thresholds SET last_triggered_at = CURRENT_TIMESTAMP WHERE id = ?",
-            (threshold_id,)
-        )
-        await db.commit()
+            thresholds = [dict(row) for row in await cursor.fetchall()]
+        if thresholds:
+            await db.executemany("""
+                INSERT INTO assigned_rewards_punishments 
+                (submissive_id, dominant_id, type, item_id, reason, deadline, point_penalty, completion_status)
+                VALUES (?, ?, 'punishment', ?, ?, ?, ?, 'pending')
+            """, [
+                (submissive_id, t['dominant_id'], t['punishment_id'],
+                 f"Auto-assigned for dropping below {t['threshold_points']} points", deadline, point_penalty)
+                for t in thresholds
+            ])
+    return thresholds
 
 async def get_point_thresholds(dominant_id: int) -> List[Dict[str, Any]]:
     """Get all point thresholds for a dominant."""
-    async with aiosqlite.connect(DATABASE_NAME) as db:
-        db.row_factory = aiosqlite.Row
-        async with db.execute("""
-            SELECT pt.*, p.title as punishment_title, u.username as submissive_name
-            FROM point_thresholds pt
-            JOIN punishments p ON pt.punishment_id = p.id
-            LEFT JOIN users u ON pt.submissive_id = u.user_id
-            WHERE pt.dominant_id = ? AND pt.active = 1
-            ORDER BY pt.threshold_points DESC
-        """, (dominant_id,)) as cursor:
-            rows = await cursor.fetchall()
-            return [dict(row) for row in rows]
+    return await read("""
+        SELECT pt.*, p.title as punishment_title, u.username as submissive_name
+        FROM point_thresholds pt
+        JOIN punishments p ON pt.punishment_id = p.id
+        LEFT JOIN users u ON pt.submissive_id = u.user_id
+        WHERE pt.dominant_id = ? AND pt.active = 1
+        ORDER BY pt.threshold_points DESC
+    """, (dominant_id,))
 
 async def delete_point_threshold(threshold_id: int, dominant_id: int) -> bool:
     """Delete a point threshold."""
-    async with aiosqlite.connect(DATABASE_NAME) as db:
+    async with transaction() as db:
         async with db.execute("SELECT id FROM point_thresholds WHERE id = ? AND dominant_id = ?", (threshold_id, dominant_id)) as cursor:
             if not await cursor.fetchone():
                 return False
         
         await db.execute("DELETE FROM point_thresholds WHERE id = ?", (threshold_id,))
-        await db.commit()
         return True
 
 # Random punishment assignment
 async def get_random_punishment(dominant_id: int) -> Optional[Dict[str, Any]]:
     """Get a random punishment from available punishments."""
-    async with aiosqlite.connect(DATABASE_NAME) as db:
-        db.row_factory = aiosqlite.Row
+    async with acquire() as db:
         async with db.execute("""
             SELECT * FROM punishments 
             WHERE dominant_id = ? 
@@ -1158,8 +1543,7 @@ async def get_random_punishment(dominant_id: int) -> Optional[Dict[str, Any]]:
 # Autocomplete helper functions
 async def get_punishment_by_name(dominant_id: int, title: str) -> Optional[Dict[str, Any]]:
     """Get a punishment by its title."""
-    async with aiosqlite.connect(DATABASE_NAME) as db:
-        db.row_factory = aiosqlite.Row
+    async with acquire() as db:
         async with db.execute(
             "SELECT * FROM punishments WHERE dominant_id = ? AND title = ?",
             (dominant_id, title)
@@ -1169,8 +1553,7 @@ async def get_punishment_by_name(dominant_id: int, title: str) -> Optional[Dict[
 
 async def get_reward_by_name(dominant_id: int, title: str) -> Optional[Dict[str, Any]]:
     """Get a reward by its title."""
-    async with aiosqlite.connect(DATABASE_NAME) as db:
-        db.row_factory = aiosqlite.Row
+    async with acquire() as db:
         async with db.execute(
             "SELECT * FROM rewards WHERE dominant_id = ? AND title = ?",
             (dominant_id, title)
@@ -1180,8 +1563,7 @@ async def get_reward_by_name(dominant_id: int, title: str) -> Optional[Dict[str,
 
 async def get_task_by_name(dominant_id: int, submissive_id: int, title: str) -> Optional[Dict[str, Any]]:
     """Get an active task by its title for a specific submissive."""
-    async with aiosqlite.connect(DATABASE_NAME) as db:
-        db.row_factory = aiosqlite.Row
+    async with acquire() as db:
         async with db.execute(
             "SELECT * FROM tasks WHERE dominant_id = ? AND submissive_id = ? AND title = ? AND active = 1",
             (dominant_id, submissive_id, title)
@@ -1191,8 +1573,7 @@ async def get_task_by_name(dominant_id: int, submissive_id: int, title: str) ->
 
 async def get_pending_task_completions_for_autocomplete(dominant_id: int) -> List[Dict[str, Any]]:
     """Get pending task completions with task info for autocomplete."""
-    async with aiosqlite.connect(DATABASE_NAME) as db:
-        db.row_factory = aiosqlite.Row
+    async with acquire() as db:
         async with db.execute("""
             SELECT tc.id, tc.task_id, t.title, u.username as submissive_name
             FROM task_completions tc
@@ -1206,8 +1587,7 @@ async def get_pending_task_completions_for_autocomplete(dominant_id: int) -> Lis
 
 async def get_pending_punishment_assignments_for_autocomplete(dominant_id: int) -> List[Dict[str, Any]]:
     """Get pending/submitted punishment assignments with punishment info for autocomplete."""
-    async with aiosqlite.connect(DATABASE_NAME) as db:
-        db.row_factory = aiosqlite.Row
+    async with acquire() as db:
         print(f"[DB] Querying punishment assignments for dominant_id={dominant_id}")
         async with db.execute("""
             SELECT ap.id, ap.item_id, p.title, u.username as submissive_name, ap.completion_status
@@ -1226,8 +1606,7 @@ async def get_pending_punishment_assignments_for_autocomplete(dominant_id: int)
 # Reminder operations
 async def get_tasks_needing_reminders() -> List[Dict[str, Any]]:
     """Get active tasks with reminders that need to be sent."""
-    async with aiosqlite.connect(DATABASE_NAME) as db:
-        db.row_factory = aiosqlite.Row
+    async with acquire() as db:
         async with db.execute("""
             SELECT t.*, u.user_id as submissive_user_id
             FROM tasks t
@@ -1246,8 +1625,7 @@ async def get_tasks_needing_reminders() -> List[Dict[str, Any]]:
 
 async def get_punishments_needing_reminders() -> List[Dict[str, Any]]:
     """Get active punishment assignments with reminders that need to be sent."""
-    async with aiosqlite.connect(DATABASE_NAME) as db:
-        db.row_factory = aiosqlite.Row
+    async with acquire() as db:
         async with db.execute("""
             SELECT ap.*, p.title, p.description
             FROM assigned_rewards_punishments ap
@@ -1267,18 +1645,16 @@ async def get_punishments_needing_reminders() -> List[Dict[str, Any]]:
 
 async def update_task_reminder_sent(task_id: int):
     """Update the last reminder sent timestamp for a task."""
-    async with aiosqlite.connect(DATABASE_NAME) as db:
+    async with transaction() as db:
         await db.execute(
             "UPDATE tasks SET last_reminder_sent = CURRENT_TIMESTAMP WHERE id = ?",
             (task_id,)
         )
-        await db.commit()
 
 async def update_punishment_reminder_sent(assignment_id: int):
     """Update the last reminder sent timestamp for a punishment assignment."""
-    async with aiosqlite.connect(DATABASE_NAME) as db:
+    async with transaction() as db:
         await db.execute(
             "UPDATE assigned_rewards_punishments SET last_reminder_sent = CURRENT_TIMESTAMP WHERE id = ?",
             (assignment_id,)
         )
-        await db.commit()